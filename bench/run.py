@@ -0,0 +1,299 @@
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import matplotlib
+
+matplotlib.use('Agg')
+# Peringatan mplfinance untuk data besar hanya mengotori output benchmark
+warnings.filterwarnings('ignore', module='mplfinance')
+
+import numpy as np
+import pandas as pd
+
+from bench.synthetic import (
+    MemorySource, synthetic_fundamental_payloads, synthetic_ohlcv, synthetic_statement_payloads, synthetic_universe,
+)
+from core.batch import analyze_many, analyze_panel
+from core.fundamental import summarize
+from core.levels import find_levels
+from core.technical import NODES, StockAnalyzer
+from report.printer import format_fundamental, print_analysis
+
+QUICK = dict(sizes=[250, 2500, 25_000], tickers=[1, 10, 100])
+FULL = dict(sizes=[250, 2500, 25_000, 250_000, 1_000_000], tickers=[1, 10, 100, 1000])
+
+
+def measure(run, setup=None, repeat=3, trace=True):
+    """Waktu (detik, terbaik dan median dari `repeat`) dan puncak alokasi (MB, tracemalloc).
+
+    setup() dijalankan di luar pengukuran dan hasilnya diberikan ke run().
+    Pengukuran memori dijalankan terpisah agar overhead tracemalloc tidak
+    masuk ke waktu.
+    """
+    times = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        gc.collect()
+        start = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - start)
+
+    peak = float('nan')
+    if trace:
+        state = setup() if setup else None
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run(state)
+            peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+    return {'seconds': min(times), 'median': statistics.median(times), 'peak_mb': peak}
+
+
+def _repeat_for(bars):
+    return 5 if bars <= 2500 else 3 if bars <= 25_000 else 1
+
+
+def bench_analyzer(bars, stages):
+    """Node graf (calculate_*/analyze_*), analyze_all, signal_history dan find_levels untuk satu ukuran"""
+    df = synthetic_ohlcv(bars)
+    repeat = _repeat_for(bars)
+    rows = []
+
+    if _wanted('node', stages):
+        for name, (method, deps) in NODES.items():
+            def setup(deps=deps):
+                analyzer = StockAnalyzer('SYN', df=df.copy())
+                analyzer.analyze(*deps)
+                return analyzer
+            stats = measure(lambda analyzer, method=method: getattr(analyzer, method)(), setup, repeat)
+            rows.append({'stage': f'node:{name}', 'bars': bars, 'tickers': 1, **stats})
+
+    if _wanted('analyze_all', stages):
+        stats = measure(lambda analyzer: analyzer.analyze_all(), lambda: StockAnalyzer('SYN', df=df.copy()), repeat)
+        rows.append({'stage': 'analyze_all', 'bars': bars, 'tickers': 1, **stats})
+
+    if _wanted('signal_history', stages):
+        stats = measure(lambda analyzer: analyzer.signal_history(), lambda: StockAnalyzer('SYN', df=df.copy()), repeat)
+        rows.append({'stage': 'signal_history', 'bars': bars, 'tickers': 1, **stats})
+
+    if _wanted('find_levels', stages):
+        stats = measure(lambda _: find_levels(df), repeat=repeat)
+        rows.append({'stage': 'find_levels', 'bars': bars, 'tickers': 1, **stats})
+
+    return rows
+
+
+def bench_report(stages):
+    """print_analysis dan ringkasan/format fundamental (tidak bergantung ukuran data)"""
+    rows = []
+    result, _ = StockAnalyzer('SYN', df=synthetic_ohlcv(250)).analyze_all()
+    payloads = synthetic_fundamental_payloads()
+    result['Fundamental'] = summarize(payloads)
+
+    if _wanted('print_analysis', stages):
+        def run(_):
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(100):
+                    print_analysis(result)
+        stats = measure(run, repeat=5)
+        rows.append({'stage': 'print_analysis x100', 'bars': 250, 'tickers': 1, **stats})
+
+    if _wanted('fundamental', stages):
+        def run(_):
+            for _ in range(100):
+                summary = summarize(payloads)
+                [format_fundamental(key, value) for key, value in summary.items()]
+        stats = measure(run, repeat=5)
+        rows.append({'stage': 'fundamental summary+format x100', 'bars': 0, 'tickers': 1, **stats})
+
+    return rows
+
+
+def bench_charts(bars, stages, chart_limit):
+    """plot_technical_chart (hingga chart_limit bar) dan render_chart headless"""
+    import matplotlib.pyplot as plt
+
+    from visual.plotter import plot_technical_chart
+    from visual.render import render_chart
+
+    rows = []
+    _, df = StockAnalyzer('SYN', df=synthetic_ohlcv(bars)).analyze_all()
+    repeat = 3 if bars <= 25_000 else 1
+
+    if _wanted('plot_technical_chart', stages) and bars <= chart_limit:
+        def run(_):
+            plot_technical_chart(df, 'SYN', title="Synthetic")
+            plt.close('all')
+        stats = measure(run, repeat=repeat)
+        rows.append({'stage': 'plot_technical_chart', 'bars': bars, 'tickers': 1, **stats})
+
+    if _wanted('render_chart', stages):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'chart.png')
+            stats = measure(lambda _: render_chart(df, path, ticker='SYN'), repeat=repeat)
+        rows.append({'stage': 'render_chart', 'bars': bars, 'tickers': 1, **stats})
+
+    return rows
+
+
+def bench_universe(tickers, bars, stages, workers):
+    """analyze_many, screener, sweep, rasio fundamental, korelasi dan analyze_panel untuk `tickers` ticker"""
+    from core.panel import PanelStore
+
+    rows = []
+    frames = synthetic_universe(tickers, bars)
+    repeat = 1 if tickers >= 100 else 3
+    label = f'workers={workers or "auto"}'
+    # Memori hanya terukur di proses utama, jadi tracemalloc hanya untuk mode in-process
+    if _wanted('analyze_many', stages):
+        source = MemorySource(frames)
+        stats = measure(lambda _: analyze_many(list(frames), source=source, max_workers=workers),
+                        repeat=repeat, trace=workers == 1)
+        rows.append({'stage': f'analyze_many[{label}]', 'bars': bars, 'tickers': tickers, **stats})
+
+    if _wanted('screener', stages):
+        from core.screener import Screener
+
+        stats = measure(lambda _: Screener.from_frames(frames).screen("rsi < 60", sort='atr_pct'), repeat=repeat)
+        rows.append({'stage': 'screener', 'bars': bars, 'tickers': tickers, **stats})
+
+    if _wanted('sweep', stages):
+        from core.sweep import sweep
+
+        grid = {'ma_fast': [10, 15, 20, 25, 30], 'rsi': [9, 14, 21], 'macd_fast': [8, 12]}
+        stats = measure(lambda _: sweep(frames, grid, max_workers=workers), repeat=repeat, trace=workers == 1)
+        rows.append({'stage': f'sweep x30[{label}]', 'bars': bars, 'tickers': tickers, **stats})
+
+    if _wanted('fundamental_ratios', stages):
+        from core.panel import closes
+        from core.statements import ratios, statement_table, valuation
+
+        payloads = {ticker: synthetic_statement_payloads(seed=i) for i, ticker in enumerate(frames)}
+        close = closes(frames)
+        stats = measure(lambda _: valuation(ratios(statement_table(payloads)), close), repeat=repeat)
+        rows.append({'stage': 'fundamental_ratios', 'bars': bars, 'tickers': tickers, **stats})
+
+    if _wanted('correlation', stages):
+        from core.portfolio import mean_correlation, returns, rolling_beta, rolling_matrices
+
+        daily = returns(frames)
+        window = min(252, bars - 1)
+        stats = measure(lambda _: [mean_correlation(m) for _, m in rolling_matrices(daily, window, step=21)],
+                        repeat=repeat)
+        rows.append({'stage': 'correlation_matrix', 'bars': bars, 'tickers': tickers, **stats})
+        stats = measure(lambda _: rolling_beta(daily, window=window), repeat=repeat)
+        rows.append({'stage': 'correlation_beta', 'bars': bars, 'tickers': tickers, **stats})
+
+    if _wanted('analyze_panel', stages):
+        with tempfile.TemporaryDirectory() as tmp:
+            PanelStore.create(tmp, frames)
+            stats = measure(lambda _: analyze_panel(tmp, max_workers=workers), repeat=repeat, trace=workers == 1)
+        rows.append({'stage': f'analyze_panel[{label}]', 'bars': bars, 'tickers': tickers, **stats})
+    return rows
+
+
+def _wanted(stage, stages):
+    return not stages or any(stage.startswith(s) or s.startswith(stage) for s in stages)
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def _key(row):
+    return (row['stage'], row['bars'], row['tickers'])
+
+
+def compare(rows, baseline_path, threshold):
+    """Mencetak rasio waktu terhadap baseline; mengembalikan jumlah regresi"""
+    with open(baseline_path) as f:
+        baseline = {_key(row): row for row in json.load(f)['results']}
+    regressions = 0
+    print(f"\n Compared with {baseline_path} (regression if slower than x{1 + threshold:.2f})")
+    for row in rows:
+        old = baseline.get(_key(row))
+        if not old:
+            continue
+        ratio = row['seconds'] / old['seconds'] if old['seconds'] else float('inf')
+        flag = "REGRESSION" if ratio > 1 + threshold else ""
+        regressions += bool(flag)
+        print(f" {row['stage']:<36} {row['bars']:>9} {row['tickers']:>6}  x{ratio:6.2f}  {flag}")
+    return regressions
+
+
+def print_row(row):
+    print(f" {row['stage']:<36} {row['bars']:>9} {row['tickers']:>6} "
+          f"{row['seconds'] * 1000:11.2f} ms {row['peak_mb']:9.1f} MB", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.run", description="Benchmark jalur panas analin")
+    parser.add_argument("--quick", action="store_true", help="ukuran kecil (250-25k bar, 1-100 ticker)")
+    parser.add_argument("--sizes", help="daftar jumlah bar, mis. 250,10000,1000000")
+    parser.add_argument("--tickers", help="daftar jumlah ticker untuk analyze_many, mis. 1,100,1000")
+    parser.add_argument("--universe-bars", type=int, default=250, help="bar per ticker untuk analyze_many")
+    parser.add_argument("--workers", type=int, default=1, help="max_workers analyze_many (0 = semua CPU)")
+    parser.add_argument("--stages", help="filter stage berdasarkan prefiks, mis. analyze_all,node,render")
+    parser.add_argument("--chart-limit", type=int, default=25_000, help="batas bar untuk plot_technical_chart")
+    parser.add_argument("--save", metavar="PATH", help="simpan hasil (JSON) untuk perbandingan")
+    parser.add_argument("--compare", metavar="PATH", help="bandingkan dengan hasil tersimpan")
+    parser.add_argument("--threshold", type=float, default=0.2, help="toleransi regresi (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    preset = QUICK if args.quick else FULL
+    sizes = [int(s) for s in args.sizes.split(',')] if args.sizes else preset['sizes']
+    tickers = [int(t) for t in args.tickers.split(',')] if args.tickers else preset['tickers']
+    stages = args.stages.split(',') if args.stages else []
+    workers = args.workers or None
+
+    print(f" {'stage':<36} {'bars':>9} {'tickers':>6} {'time':>14} {'peak':>12}")
+    rows = []
+    for bars in sizes:
+        for row in bench_analyzer(bars, stages) + bench_charts(bars, stages, args.chart_limit):
+            print_row(row)
+            rows.append(row)
+    for row in bench_report(stages):
+        print_row(row)
+        rows.append(row)
+    for count in tickers:
+        for row in bench_universe(count, args.universe_bars, stages, workers):
+            print_row(row)
+            rows.append(row)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'environment': environment(), 'results': rows}, f, indent=2)
+    if args.compare:
+        return 1 if compare(rows, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from core.data import DataSource
+
+
+def synthetic_ohlcv(bars, seed=0, start='2000-01-03', freq='B', price=1000.0, volatility=0.02):
+    """OHLCV sintetis (random walk geometris) dengan indeks waktu berzona Asia/Jakarta"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=bars, freq=freq, tz='Asia/Jakarta')
+    close = price * np.exp(np.cumsum(rng.normal(0, volatility, bars)))
+    opens = close * np.exp(rng.normal(0, volatility / 4, bars))
+    high = np.maximum(opens, close) * np.exp(np.abs(rng.normal(0, volatility / 2, bars)))
+    low = np.minimum(opens, close) * np.exp(-np.abs(rng.normal(0, volatility / 2, bars)))
+    volume = rng.integers(100_000, 10_000_000, bars).astype(np.float64)
+    return pd.DataFrame({'Open': opens, 'High': high, 'Low': low, 'Close': close, 'Volume': volume}, index=index)
+
+
+def synthetic_universe(tickers, bars, seed=0):
+    """Mapping ticker -> OHLCV sintetis untuk `tickers` ticker (SYN0000, SYN0001, ...)"""
+    return {f"SYN{i:04d}": synthetic_ohlcv(bars, seed=seed + i) for i in range(tickers)}
+
+
+def synthetic_fundamental_payloads(seed=0):
+    """Payload mentah seperti FundamentalFetcher untuk benchmark ringkasan fundamental"""
+    rng = np.random.default_rng(seed)
+    info = {
+        'longName': "Synthetic Tbk", 'symbol': "SYN.JK", 'sector': "Energy", 'industry': "Coal",
+        'averageAnalystRating': "2.0 - Buy", 'marketCap': 3.1e13, 'currentPrice': 27500.0,
+        'bookValue': 21000.5, 'priceToBook': 1.31, 'trailingPE': 5.2, 'forwardPE': 6.1,
+        'trailingEps': 5300.0, 'dividendYield': 12.5, 'dividendRate': 3400.0, 'payoutRatio': 0.75,
+        'returnOnEquity': 0.24, 'returnOnAssets': 0.17, 'debtToEquity': 1.5, 'currentRatio': 3.2,
+        'quickRatio': 2.8, 'grossMargins': 0.3, 'operatingMargins': 0.22, 'profitMargins': 0.19,
+        'totalRevenue': 3.6e13, 'netIncomeToCommon': 6.8e12, 'freeCashflow': 5.5e12, 'beta': 0.9,
+        'fiftyTwoWeekHigh': 29000.0, 'fiftyTwoWeekLow': 22000.0, 'operatingCashflow': 7.9e12,
+        'sharesOutstanding': 1.13e9,
+    }
+    columns = pd.date_range('2021-12-31', periods=4, freq='YE')
+    financials = pd.DataFrame(rng.normal(5e12, 1e12, (3, 4)), index=['Net Income', 'Total Revenue', 'EBIT'], columns=columns)
+    balance_sheet = pd.DataFrame(rng.normal(4e13, 1e12, (2, 4)), index=['Total Assets', 'Total Debt'], columns=columns)
+    return {'info': info, 'financials': financials, 'balance_sheet': balance_sheet}
+
+
+def synthetic_statement_payloads(quarters=8, years=4, seed=0):
+    """Payload laporan tahunan/kuartalan seperti FundamentalFetcher(fields=STATEMENTS), kolom terbaru di kiri"""
+    rng = np.random.default_rng(seed)
+    payloads = {}
+    for prefix, periods, freq, scale in (('', years, 'YE', 4.0), ('quarterly_', quarters, 'QE', 1.0)):
+        columns = pd.date_range(end='2024-12-31', periods=periods, freq=freq)[::-1]
+        revenue = scale * rng.normal(1e12, 1e11, periods)
+        net_income = revenue * rng.normal(0.15, 0.05, periods)
+        payloads[prefix + 'financials'] = pd.DataFrame(
+            [revenue, revenue * 0.4, revenue * 0.25, net_income],
+            index=['Total Revenue', 'Gross Profit', 'Operating Income', 'Net Income'], columns=columns)
+        assets = rng.normal(2e13, 1e12, periods)
+        payloads[prefix + 'balance_sheet'] = pd.DataFrame(
+            [assets, assets * 0.45, assets * 0.2, assets * 0.3, assets * 0.15, np.full(periods, 1.2e9)],
+            index=['Total Assets', 'Stockholders Equity', 'Total Debt', 'Current Assets', 'Current Liabilities',
+                   'Ordinary Shares Number'], columns=columns)
+        payloads[prefix + 'cashflow'] = pd.DataFrame(
+            [net_income * 1.2, net_income * 0.8], index=['Operating Cash Flow', 'Free Cash Flow'], columns=columns)
+    return payloads
+
+
+class MemorySource(DataSource):
+    """Sumber data dari mapping ticker -> DataFrame di memori (tanpa jaringan).
+
+    fetch mengembalikan salinan seperti sumber sungguhan, sehingga kolom
+    indikator dari pengulangan sebelumnya tidak ikut terbawa.
+    """
+
+    def __init__(self, frames):
+        self.frames = frames
+
+    def fetch(self, ticker, period='ytd', interval='1d', start=None):
+        return self.frames[ticker].copy()
+
+
+class SyntheticSource(DataSource):
+    """Sumber data sintetis per ticker (deterministik dari nama ticker), pengganti Yahoo untuk uji lokal"""
+
+    def __init__(self, bars=500):
+        self.bars = bars
+
+    def fetch(self, ticker, period='ytd', interval='1d', start=None):
+        return synthetic_ohlcv(self.bars, seed=zlib.crc32(ticker.encode()))
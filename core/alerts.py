@@ -0,0 +1,305 @@
+import asyncio
+import json
+import os
+import sys
+
+import pandas as pd
+
+from core import metrics, signals
+from core.expressions import validate
+from core.stream import StreamingAnalyzer
+
+FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+# Nama kolom waktu yang dikenali pada file replay
+TIME_COLUMNS = ('Date', 'Datetime', 'time', 'timestamp')
+
+# Kolom snapshot() yang dapat dipakai aturan
+SNAPSHOT = (
+    'ticker', 'price', 'change_pct', 'trend', 'ma_status', 'macd_signal', 'rsi_signal', 'stochastic_signal',
+    'volume_signal', 'vwap_signal', 'volatility', 'trend_confirmed', 'rsi', 'ma20', 'ma50', 'ma200', 'macd',
+    'macd_hist', 'stoch_k', 'stoch_d', 'atr', 'atr_pct', 'support', 'resistance', 'bars',
+)
+
+# Fungsi bawaan yang boleh dipakai di ekspresi aturan
+BUILTINS = {'abs': abs, 'min': min, 'max': max, 'round': round}
+
+
+def _stamp(value):
+    """Timestamp pembanding: waktu berzona dikonversi ke UTC tanpa zona"""
+    value = pd.Timestamp(value)
+    return value.tz_convert('UTC').tz_localize(None) if value.tzinfo is not None else value
+
+
+def snapshot(analyzer):
+    """Nilai bar terakhir StreamingAnalyzer dengan nama kolom yang sama seperti tabel Screener"""
+    last = analyzer.last
+    close = last['Close']
+    previous = analyzer.tail[-2][2] if len(analyzer.tail) > 1 else float('nan')
+    trend = signals.trend_signal(close, last['MA20'], last['MA50'], last['MA200'])
+    macd = signals.macd_signal(last['MACD'], last['MACD_signal'])
+    rsi = signals.rsi_signal(last['RSI'], last['RSI_MA'])
+    return {
+        'ticker': analyzer.ticker,
+        'price': close,
+        'change_pct': (close / previous - 1) * 100 if previous else float('nan'),
+        'trend': trend,
+        'ma_status': signals.ma_status_signal(close, last['MA20'], last['MA50'], last['MA200']),
+        'macd_signal': macd,
+        'rsi_signal': rsi,
+        'stochastic_signal': signals.stochastic_signal(last['Stoch_%K'], last['Stoch_%D']),
+        'volume_signal': signals.volume_signal(last['OBV'], last['OBV_MA']),
+        'vwap_signal': signals.vwap_signal(close, last['VWAP']),
+        'volatility': signals.volatility_label(last['ATR'], close),
+        'trend_confirmed': signals.trend_confirmed(trend, macd, rsi),
+        'rsi': last['RSI'],
+        'ma20': last['MA20'],
+        'ma50': last['MA50'],
+        'ma200': last['MA200'],
+        'macd': last['MACD'],
+        'macd_hist': last['MACD_hist'],
+        'stoch_k': last['Stoch_%K'],
+        'stoch_d': last['Stoch_%D'],
+        'atr': last['ATR'],
+        'atr_pct': last['ATR'] / close * 100 if close else float('nan'),
+        'support': analyzer.close_20[0].value,
+        'resistance': analyzer.close_20[1].value,
+        'bars': analyzer.bars,
+    }
+
+
+def _predicate(expression):
+    if callable(expression):
+        return expression
+    code = compile(validate(expression, SNAPSHOT, BUILTINS), '<rule>', 'eval')
+    scope = {'__builtins__': BUILTINS}
+    return lambda values: eval(code, scope, values)
+
+
+class Rule:
+    """Aturan alert deklaratif.
+
+    when dan where berupa ekspresi atas kolom snapshot() (nama kolom sama
+    seperti Screener; hanya perbandingan, operator aritmetika/logika dan
+    pemanggilan abs/min/max/round), mis. when="'Bullish' in macd_signal",
+    where="trend == 'Uptrend'", atau fungsi values -> bool. Alert dipicu
+    saat `when` berubah dari salah ke benar sementara `where` benar, dan
+    paling cepat `cooldown` bar setelah alert sebelumnya untuk ticker yang
+    sama. message boleh berisi placeholder, mis. "{ticker} RSI {rsi:.1f}".
+    """
+
+    def __init__(self, name, when, where=None, cooldown=0, message=''):
+        self.name = name
+        self.when = when
+        self.where = where
+        self.cooldown = cooldown
+        self.message = message
+        self._when = _predicate(when)
+        self._where = _predicate(where) if where is not None else None
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['name'], data['when'], data.get('where'), data.get('cooldown', 0), data.get('message', ''))
+
+    def __repr__(self):
+        return f"Rule({self.name!r}, when={self.when!r}, where={self.where!r}, cooldown={self.cooldown})"
+
+
+def load_rules(path):
+    """Daftar Rule dari file JSON berisi list {name, when, where, cooldown, message}"""
+    with open(path) as f:
+        return [Rule.from_dict(item) for item in json.load(f)]
+
+
+class PrintSink:
+    """Satu baris teks per alert"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def emit(self, alert):
+        text = alert['message'] or f"{alert['trend']}, {alert['macd_signal']}, RSI {alert['rsi']:.2f}"
+        print(f" [{alert['time']}] {alert['ticker']} {alert['rule']}: {text}", file=self.stream, flush=True)
+
+    def close(self):
+        pass
+
+
+class CallbackSink:
+    """Meneruskan alert ke fungsi callback(alert)"""
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def emit(self, alert):
+        self.callback(alert)
+
+    def close(self):
+        pass
+
+
+class WatchlistEngine:
+    """Mesin watchlist berbasis event.
+
+    Tiap ticker memegang StreamingAnalyzer sendiri; hanya ticker yang
+    menerima bar baru yang diperbarui (O(1) per bar) dan dievaluasi
+    aturannya, sehingga ticker yang diam tidak memakan biaya. Bar dengan
+    waktu yang tidak lebih baru dari bar terakhir ticker tersebut
+    diabaikan. Selama ticker belum punya `min_bars` bar, state aturan
+    diperbarui tanpa memicu alert. Sink memakai antarmuka emit/close yang
+    sama dengan sink core.metrics (mis. metrics.JsonLinesSink).
+    """
+
+    def __init__(self, rules, sinks=(), windows=None, min_bars=50):
+        self.rules = list(rules)
+        self.sinks = list(sinks)
+        self.windows = windows
+        self.min_bars = min_bars
+        self.analyzers = {}
+        self.last_time = {}
+        # ticker -> [aktif, bar saat alert terakhir] per aturan
+        self.state = {}
+        self.stats = {'bars': 0, 'stale': 0, 'alerts': 0, 'rule_errors': 0}
+
+    def warm(self, frames):
+        """Menghangatkan state dari riwayat bar (mapping ticker -> DataFrame) tanpa memicu alert"""
+        for ticker, df in frames.items():
+            if df is None or df.empty:
+                continue
+            analyzer = StreamingAnalyzer.from_frame(ticker, df, self.windows)
+            self.analyzers[ticker] = analyzer
+            self.last_time[ticker] = _stamp(df.index[-1])
+            self._evaluate(ticker, analyzer, df.index[-1], fire=False)
+
+    def on_bar(self, ticker, time, bar):
+        """Memproses satu bar baru (mapping High/Low/Close/Volume); mengembalikan alert yang dipicu"""
+        stamp = _stamp(time)
+        last = self.last_time.get(ticker)
+        if last is not None and stamp <= last:
+            self.stats['stale'] += 1
+            return []
+        analyzer = self.analyzers.get(ticker)
+        if analyzer is None:
+            analyzer = self.analyzers[ticker] = StreamingAnalyzer(ticker, self.windows)
+        analyzer.update(bar, evaluate=False)
+        self.last_time[ticker] = stamp
+        self.stats['bars'] += 1
+        return self._evaluate(ticker, analyzer, time, fire=analyzer.bars >= self.min_bars)
+
+    def _check(self, predicate, values):
+        try:
+            return bool(predicate(values))
+        except Exception:
+            self.stats['rule_errors'] += 1
+            metrics.count('alert_rule_errors')
+            return False
+
+    def _evaluate(self, ticker, analyzer, time, fire=True):
+        values = snapshot(analyzer)
+        states = self.state.get(ticker)
+        if states is None:
+            states = self.state[ticker] = [[False, None] for _ in self.rules]
+        alerts = []
+        for rule, state in zip(self.rules, states):
+            active = self._check(rule._when, values)
+            if (active and not state[0] and fire
+                    and (state[1] is None or analyzer.bars - state[1] >= rule.cooldown)
+                    and (rule._where is None or self._check(rule._where, values))):
+                state[1] = analyzer.bars
+                message = rule.message.format(**values) if rule.message else ''
+                alerts.append({'type': 'alert', 'rule': rule.name, 'time': time, 'message': message, **values})
+            state[0] = active
+
+        for alert in alerts:
+            self.stats['alerts'] += 1
+            metrics.count('alerts', rule=alert['rule'])
+            for sink in self.sinks:
+                sink.emit(alert)
+        return alerts
+
+    async def run(self, feed):
+        """Memproses feed (async iterable (ticker, time, bar)) sampai habis"""
+        async for ticker, time, bar in feed:
+            self.on_bar(ticker, time, bar)
+        return self.stats
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def read_bars(path):
+    """Tabel bar rekaman (ticker, waktu, OHLCV) dari CSV/JSON/Parquet, diurutkan menurut waktu"""
+    fmt = os.path.splitext(path)[1].lstrip('.').lower()
+    if fmt == 'csv':
+        table = pd.read_csv(path)
+    elif fmt == 'json':
+        table = pd.read_json(path, orient='records', convert_dates=False)
+    elif fmt == 'parquet':
+        table = pd.read_parquet(path)
+    else:
+        raise ValueError(f"Unsupported replay format: {fmt!r} (expected csv, json or parquet)")
+    column = next((c for c in TIME_COLUMNS if c in table), None)
+    if column is None or 'ticker' not in table:
+        raise ValueError(f"Replay file needs a 'ticker' column and one of {', '.join(TIME_COLUMNS)}")
+    table = table.rename(columns={column: 'Date'})
+    table['Date'] = pd.to_datetime(table['Date'])
+    return table.sort_values('Date', kind='stable', ignore_index=True)
+
+
+def write_replay(frames, path):
+    """Menulis mapping ticker -> DataFrame OHLCV sebagai file rekaman untuk ReplayFeed"""
+    from report.export import write_frame
+
+    table = pd.concat(
+        [df[list(FIELDS)].rename_axis('Date').reset_index().assign(ticker=ticker) for ticker, df in frames.items()],
+        ignore_index=True,
+    )
+    return write_frame(table.sort_values('Date', kind='stable', ignore_index=True), path)
+
+
+class ReplayFeed:
+    """Feed bar dari file rekaman (lihat read_bars), berurutan menurut waktu.
+
+    delay (detik) disisipkan setiap kali waktu bar berganti untuk meniru
+    feed live; delay=0 tetap memberi giliran ke task lain di event loop.
+    """
+
+    def __init__(self, path, delay=0.0):
+        self.path = path
+        self.delay = delay
+
+    async def _bars(self):
+        table = read_bars(self.path)
+        current = None
+        for ticker, time, *values in table[['ticker', 'Date', *FIELDS]].itertuples(index=False):
+            if time != current:
+                current = time
+                await asyncio.sleep(self.delay)
+            yield ticker, time, dict(zip(FIELDS, values))
+
+    def __aiter__(self):
+        return self._bars()
+
+
+class QueueFeed:
+    """Feed dari asyncio.Queue untuk producer lain (mis. websocket); close() mengakhiri feed"""
+
+    def __init__(self, maxsize=0):
+        self.queue = asyncio.Queue(maxsize)
+
+    async def put(self, ticker, time, bar):
+        await self.queue.put((ticker, time, bar))
+
+    def close(self):
+        self.queue.put_nowait(None)
+
+    async def _bars(self):
+        while True:
+            item = await self.queue.get()
+            if item is None:
+                return
+            yield item
+
+    def __aiter__(self):
+        return self._bars()
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+
+from core.batch import run_chunks
+from core.technical import StockAnalyzer
+
+
+def confirmed_uptrend(history):
+    """Entry bawaan: Uptrend yang dikonfirmasi MACD dan RSI (seperti Trend Confirmation)"""
+    return (history['Trend'] == "Uptrend").to_numpy() & history['Trend Confirmation'].to_numpy()
+
+
+def macd_bearish(history):
+    """Exit bawaan: MACD berada di bawah garis sinyal"""
+    return (history['MACD Signal'] == "Bearish (MACD < Signal)").to_numpy()
+
+
+def backtest(df, entry=confirmed_uptrend, exit=macd_bearish, use_levels=True, max_hold=None, cost=0.0, ticker=''):
+    """Mensimulasikan trade long dari sinyal per bar StockAnalyzer.
+
+    Sinyal entry pada close bar t dieksekusi di open bar t+1, memakai
+    Target 1 dan Stop Loss dari bar t (logika calculate_risk_reward).
+    Stop dan target diperiksa intrabar (stop lebih dulu jika keduanya
+    tersentuh); sinyal exit dieksekusi di open bar berikutnya. Entry
+    dilewati bila open bar t+1 sudah di atas target atau di bawah stop
+    (gap). cost adalah biaya per sisi dalam pecahan harga.
+    """
+    history = StockAnalyzer(ticker, df=df).signal_history()
+    opens = df['Open'].to_numpy(dtype=np.float64)
+    high = df['High'].to_numpy(dtype=np.float64)
+    low = df['Low'].to_numpy(dtype=np.float64)
+    close = df['Close'].to_numpy(dtype=np.float64)
+    n = len(close)
+
+    enter = np.asarray(entry(history), dtype=bool)
+    leave = np.zeros(n, dtype=bool) if exit is None else np.asarray(exit(history), dtype=bool)
+    targets = history['Target 1'].to_numpy() if use_levels else np.full(n, np.inf)
+    stops = history['Stop Loss'].to_numpy() if use_levels else np.full(n, -np.inf)
+
+    trades = []
+    strategy = np.zeros(n)
+    next_free = 0
+    for signal in np.flatnonzero(enter[:-1]):
+        if signal < next_free:
+            continue
+        start = signal + 1
+        entry_price = opens[start]
+        target = targets[signal] if targets[signal] == targets[signal] else np.inf
+        stop = stops[signal] if stops[signal] == stops[signal] else -np.inf
+        # Open sudah melewati target/stop: level dari bar sinyal tidak berlaku lagi
+        if not stop < entry_price < target:
+            continue
+        end = n - 1 if max_hold is None else min(n - 1, start + max_hold - 1)
+
+        hit_stop = low[start:end + 1] <= stop
+        hit_target = high[start:end + 1] >= target
+        events = hit_stop | hit_target | leave[start:end + 1]
+
+        if events.any():
+            j = int(np.argmax(events))
+            bar = start + j
+            if hit_stop[j]:
+                exit_bar, exit_price, reason = bar, min(opens[bar], stop), 'stop'
+            elif hit_target[j]:
+                exit_bar, exit_price, reason = bar, max(opens[bar], target), 'target'
+            elif bar + 1 < n:
+                exit_bar, exit_price, reason = bar + 1, opens[bar + 1], 'signal'
+            else:
+                exit_bar, exit_price, reason = bar, close[bar], 'signal'
+        else:
+            exit_bar, exit_price = end, close[end]
+            reason = 'end' if end == n - 1 else 'time'
+
+        # Return per bar selama posisi terbuka, untuk kurva ekuitas
+        if exit_bar == start:
+            strategy[start] = exit_price / entry_price - 1
+        else:
+            strategy[start] = close[start] / entry_price - 1
+            strategy[start + 1:exit_bar] = close[start + 1:exit_bar] / close[start:exit_bar - 1] - 1
+            strategy[exit_bar] = exit_price / close[exit_bar - 1] - 1
+        strategy[start] = (1 + strategy[start]) / (1 + cost) - 1
+        strategy[exit_bar] = (1 + strategy[exit_bar]) * (1 - cost) - 1
+
+        trades.append((
+            signal, start, entry_price, exit_bar, exit_price, target, stop, reason,
+            exit_price * (1 - cost) / (entry_price * (1 + cost)) - 1, exit_bar - start + 1,
+        ))
+        next_free = exit_bar
+
+    trades = pd.DataFrame(trades, columns=[
+        'Signal Date', 'Entry Date', 'Entry Price', 'Exit Date', 'Exit Price',
+        'Target', 'Stop', 'Exit Reason', 'Return', 'Bars',
+    ])
+    for column in ('Signal Date', 'Entry Date', 'Exit Date'):
+        trades[column] = df.index[trades[column].to_numpy(dtype=np.int64)]
+    equity = pd.Series(np.cumprod(1 + strategy), index=df.index, name='Equity')
+
+    return {
+        'trades': trades,
+        'equity': equity,
+        'stats': _stats(trades, equity),
+    }
+
+
+def _stats(trades, equity):
+    drawdown = equity / equity.cummax() - 1
+    returns = trades['Return']
+    return {
+        'Trades': len(trades),
+        'Win Rate': float((returns > 0).mean()) if len(trades) else float('nan'),
+        'Average Return': float(returns.mean()) if len(trades) else float('nan'),
+        'Total Return': float(equity.iloc[-1] - 1) if len(equity) else float('nan'),
+        'Max Drawdown': float(drawdown.min()) if len(equity) else float('nan'),
+        'Exposure': float(trades['Bars'].sum() / len(equity)) if len(equity) else float('nan'),
+    }
+
+
+def _failed(chunk, e):
+    return [(ticker, {'error': f"{type(e).__name__}: {e}"}) for ticker, _ in chunk]
+
+
+def _backtest_chunk(items, kwargs):
+    out = []
+    for ticker, df in items:
+        try:
+            out.append((ticker, backtest(df, ticker=ticker, **kwargs)))
+        except Exception as e:
+            out.append((ticker, {'error': f"{type(e).__name__}: {e}"}))
+    return out
+
+
+def backtest_many(frames, max_workers=None, chunksize=16, **kwargs):
+    """Menjalankan backtest untuk banyak ticker di process pool.
+
+    frames adalah mapping ticker -> DataFrame OHLCV. Aturan entry/exit harus
+    fungsi level modul agar bisa dikirim ke worker. Error per ticker
+    dikembalikan sebagai {'error': ...}.
+    """
+    items = list(frames.items())
+    chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+    results = {}
+    for chunk_result in run_chunks(_backtest_chunk, chunks, (kwargs,), max_workers, _failed):
+        results.update(chunk_result)
+    return results
+
+
+def summarize(results):
+    """Tabel statistik per ticker dari hasil backtest_many"""
+    rows = {ticker: r['stats'] for ticker, r in results.items() if 'stats' in r}
+    return pd.DataFrame.from_dict(rows, orient='index')
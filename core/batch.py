@@ -0,0 +1,146 @@
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+
+from core import metrics
+from core.data import YahooSource
+from core.panel import PanelSource
+from core.technical import StockAnalyzer
+
+# Panel yang sudah dibuka di proses ini (worker membuka sekali per path)
+_panels = {}
+
+
+def run_chunks(fn, chunks, args=(), max_workers=None, failed=None, initializer=None):
+    """Menjalankan fn(chunk, *args) untuk tiap chunk; mengembalikan hasil per chunk sesuai urutan.
+
+    max_workers=1 berjalan di proses yang sama; selain itu di process pool,
+    dan chunk dari iterable (mis. generator yang mengikuti fetch) dikirim ke
+    worker begitu tersedia. Chunk yang gagal, termasuk karena worker mati
+    (mis. kehabisan memori), diganti failed(chunk, error) sehingga chunk
+    lain tetap selesai; failed=None meneruskan error.
+    """
+    def collect(chunk, result):
+        try:
+            return result()
+        except Exception as e:
+            if failed is None:
+                raise
+            return failed(chunk, e)
+
+    if max_workers == 1:
+        return [collect(chunk, lambda: fn(chunk, *args)) for chunk in chunks]
+
+    def merged(future):
+        # Agregat metrik worker (span/counter) ikut dikirim bersama hasil chunk
+        result, collected = future.result()
+        metrics.merge(collected)
+        return result
+
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(), initializer=initializer) as pool:
+        futures = [(chunk, pool.submit(metrics.traced, fn, chunk, *args)) for chunk in chunks]
+        return [collect(chunk, lambda: merged(future)) for chunk, future in futures]
+
+
+def _error_result(ticker, error):
+    return {'Ticker': ticker, 'error': f"{type(error).__name__}: {error}"}
+
+
+def _analyze_chunk(items, with_frames, options=None):
+    """Menganalisis satu chunk (ticker, df) di dalam worker"""
+    out = []
+    with metrics.span('analyze_chunk', size=len(items)):
+        for ticker, df in items:
+            try:
+                result, frame = StockAnalyzer(ticker, df=df, **(options or {})).analyze_all()
+                out.append((ticker, (result, frame) if with_frames else result))
+            except Exception as e:
+                metrics.count('analyze_errors')
+                result = _error_result(ticker, e)
+                out.append((ticker, (result, None) if with_frames else result))
+    return out
+
+
+def analyze_many(tickers, period='ytd', interval='1d', source=None, max_workers=None,
+                 fetch_workers=8, chunksize=16, with_frames=False, options=None):
+    """Menganalisis banyak ticker: fetch paralel lalu analisis di process pool.
+
+    Chunk dikirim ke worker begitu data untuk chunk tersebut selesai diambil,
+    sehingga fetch dan komputasi berjalan bersamaan. Error per ticker tidak
+    menghentikan batch, melainkan dikembalikan sebagai {'Ticker', 'error'}
+    seperti yang sudah diperiksa main.py. max_workers=1 menjalankan analisis
+    di proses yang sama. options diteruskan ke StockAnalyzer (mis. dtype,
+    chunk_size).
+    """
+    source = source or YahooSource()
+    tickers = list(dict.fromkeys(tickers))
+    results = {}
+
+    def error(ticker, e):
+        results[ticker] = (_error_result(ticker, e), None) if with_frames else _error_result(ticker, e)
+
+    fetched = source.fetch_many(tickers, period=period, interval=interval, max_workers=fetch_workers)
+
+    def chunks():
+        # Chunk dikirim begitu datanya selesai diambil; error fetch dicatat langsung
+        chunk = []
+        for ticker, df in fetched:
+            if isinstance(df, Exception):
+                error(ticker, df)
+                continue
+            chunk.append((ticker, df))
+            if len(chunk) >= chunksize:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def failed(chunk, e):
+        for ticker, _ in chunk:
+            error(ticker, e)
+        return []
+
+    for chunk_result in run_chunks(_analyze_chunk, chunks(), (with_frames, options), max_workers, failed):
+        results.update(chunk_result)
+    return {t: results[t] for t in tickers if t in results}
+
+
+def _panel_source(root):
+    if root not in _panels:
+        _panels[root] = PanelSource(root)
+    return _panels[root]
+
+
+def _analyze_panel_chunk(tickers, root, period, with_frames, options=None):
+    """Membaca ticker langsung dari panel (memory-mapped) lalu menganalisisnya"""
+    source = _panel_source(root)
+    items, errors = [], []
+    for ticker in tickers:
+        try:
+            items.append((ticker, source.fetch(ticker, period=period, interval=source.store.interval)))
+        except Exception as e:
+            result = _error_result(ticker, e)
+            errors.append((ticker, (result, None) if with_frames else result))
+    return errors + _analyze_chunk(items, with_frames, options)
+
+
+def analyze_panel(root, tickers=None, period='max', max_workers=None, chunksize=16, with_frames=False, options=None):
+    """Menganalisis ticker dari PanelStore di `root` (default: semua ticker).
+
+    Worker membuka panel sendiri secara memory-mapped, sehingga yang dikirim
+    ke worker hanya nama ticker; data bar tidak diserialisasi maupun
+    disalin per proses. Period dihitung relatif terhadap bar terakhir.
+    """
+    root = os.path.abspath(root)
+    tickers = list(dict.fromkeys(tickers or _panel_source(root).store.tickers))
+    chunks = [tickers[i:i + chunksize] for i in range(0, len(tickers), chunksize)]
+    results = {}
+
+    def failed(chunk, e):
+        return [(ticker, (_error_result(ticker, e), None) if with_frames else _error_result(ticker, e))
+                for ticker in chunk]
+
+    for chunk_result in run_chunks(_analyze_panel_chunk, chunks, (root, period, with_frames, options),
+                                   max_workers, failed):
+        results.update(chunk_result)
+    return {t: results[t] for t in tickers}
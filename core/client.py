@@ -0,0 +1,128 @@
+import random
+import threading
+import time
+
+from concurrent.futures import Future
+from urllib.parse import urlsplit
+
+from curl_cffi import requests
+
+from core import metrics
+
+# Status yang layak dicoba ulang (throttle dan gangguan sementara server)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Pembatas laju token bucket yang aman untuk banyak thread.
+
+    Token dipesan di bawah lock (boleh negatif) lalu pemanggil tidur di luar
+    lock, sehingga antrean dilayani berurutan tanpa busy-wait.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= tokens
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+
+class Session(requests.Session):
+    """Session curl_cffi bersama dengan rate limit, retry dan deduplikasi.
+
+    Koneksi dipakai ulang per thread (curl handle thread-local). GET yang
+    identik (URL dan params sama) yang sedang berjalan bersamaan berbagi
+    satu response. Kegagalan jaringan dan status RETRY_STATUS dicoba ulang
+    dengan backoff eksponensial plus jitter, menghormati Retry-After.
+    """
+
+    def __init__(self, rate=5.0, burst=10, retries=3, backoff=0.5, impersonate="chrome", **kwargs):
+        super().__init__(impersonate=impersonate, **kwargs)
+        self.limiter = TokenBucket(rate, burst)
+        self.retries = retries
+        self.backoff = backoff
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+    def request(self, method, url, *args, **kwargs):
+        if method.upper() != 'GET' or kwargs.get('stream'):
+            return self._send(method, url, *args, **kwargs)
+
+        key = (url, repr(kwargs.get('params', args[0] if args else None)))
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            metrics.count('http_coalesced')
+            return future.result()
+
+        try:
+            response = self._send(method, url, *args, **kwargs)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+    def _delay(self, attempt, response=None):
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * 2 ** attempt * (0.5 + random.random())
+
+    def _send(self, method, url, *args, **kwargs):
+        with metrics.span('http', host=urlsplit(url).hostname, method=method.upper()) as span:
+            for attempt in range(self.retries + 1):
+                self.limiter.acquire()
+                try:
+                    response = super().request(method, url, *args, **kwargs)
+                except requests.RequestsError:
+                    if attempt == self.retries:
+                        raise
+                    metrics.count('http_retries')
+                    time.sleep(self._delay(attempt))
+                    continue
+                if response.status_code not in RETRY_STATUS or attempt == self.retries:
+                    span.set(status=response.status_code, retries=attempt)
+                    if not kwargs.get('stream'):
+                        span.set(bytes=len(response.content or b''))
+                    return response
+                metrics.count('http_retries')
+                time.sleep(self._delay(attempt, response))
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def shared_session():
+    """Session bersama untuk seluruh proses (dibuat saat pertama dipakai)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = Session()
+        return _session
+
+
+def configure(**kwargs):
+    """Mengganti session bersama, mis. configure(rate=2, retries=5)"""
+    global _session
+    with _session_lock:
+        _session = Session(**kwargs)
+        return _session
@@ -0,0 +1,317 @@
+import os
+import json
+import re
+import tempfile
+import time
+
+from abc import ABC, abstractmethod
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from core import metrics
+
+_PERIOD_RE = re.compile(r'^(\d+)(d|wk|mo|y)$')
+
+# Batas Yahoo untuk interval intraday: (hari per request, hari ke belakang)
+INTRADAY_LIMITS = {
+    '1m': (7, 30),
+    '2m': (60, 60),
+    '5m': (60, 60),
+    '15m': (60, 60),
+    '30m': (60, 60),
+    '60m': (730, 730),
+    '90m': (60, 60),
+    '1h': (730, 730),
+}
+
+
+def period_start(period, now=None):
+    """Menghitung tanggal awal dari string period Yahoo (None untuk 'max')"""
+    now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    if now.tzinfo is not None:
+        now = now.tz_localize(None)
+    now = now.normalize()
+
+    if period == 'max':
+        return None
+    if period == 'ytd':
+        return now.replace(month=1, day=1)
+
+    match = _PERIOD_RE.match(period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+
+    n, unit = int(match.group(1)), match.group(2)
+    if unit == 'd':
+        return now - pd.Timedelta(days=n)
+    if unit == 'wk':
+        return now - pd.Timedelta(weeks=n)
+    if unit == 'mo':
+        return now - pd.DateOffset(months=n)
+    return now - pd.DateOffset(years=n)
+
+
+def compact_frame(df, dtype='float32'):
+    """Salinan frame dengan kolom float disimpan sebagai `dtype` (mis. float32).
+
+    Separuh memori float64; presisi float32 (~7 digit) cukup untuk harga,
+    tetapi volume di atas ~16 juta dibulatkan.
+    """
+    columns = {col: dtype for col in df.columns if df[col].dtype.kind == 'f' and df[col].dtype != dtype}
+    return df.astype(columns) if columns else df
+
+
+def resample_ohlcv(df, rule):
+    """Bar OHLCV diagregasi ke timeframe lebih besar (rule pandas, mis. 'W' atau 'ME'); periode kosong dibuang"""
+    agg = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+    out = df.resample(rule).agg({col: fn for col, fn in agg.items() if col in df})
+    return out[out['Close'].notna()]
+
+
+def _as_naive(ts):
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize(None) if ts.tzinfo is not None else ts
+
+
+def _write_atomic(path, write, mode='wb'):
+    """Menulis lewat file sementara unik di direktori yang sama lalu os.replace.
+
+    Nama sementara unik per penulis, sehingga dua proses yang menulis
+    ticker yang sama tidak saling menimpa file setengah jadi.
+    """
+    with tempfile.NamedTemporaryFile(mode, dir=os.path.dirname(path), prefix=os.path.basename(path) + '.',
+                                     suffix='.tmp', delete=False) as f:
+        try:
+            write(f)
+        except BaseException:
+            f.close()
+            os.unlink(f.name)
+            raise
+    os.replace(f.name, path)
+
+
+def _slice_from(df, start):
+    """Memotong frame mulai dari tanggal tertentu"""
+    if start is None or df.empty:
+        return df.copy()
+    index = df.index.tz_localize(None) if df.index.tz is not None else df.index
+    return df[index >= _as_naive(start)].copy()
+
+
+class DataSource(ABC):
+    """Antarmuka sumber data OHLCV"""
+
+    @abstractmethod
+    def fetch(self, ticker, period='ytd', interval='1d', start=None):
+        """Mengambil bar OHLCV; jika start diberikan, period diabaikan"""
+
+    def fetch_many(self, tickers, period='ytd', interval='1d', max_workers=8):
+        """Mengambil banyak ticker secara paralel, menghasilkan (ticker, frame atau error)"""
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(self.fetch, t, period, interval): t for t in tickers}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except Exception as e:
+                    yield futures[future], e
+
+
+class YahooSource(DataSource):
+    """Sumber data dari Yahoo Finance"""
+
+    def __init__(self, session=None):
+        # yfinance dan curl_cffi diimpor saat dipakai agar start-up tetap ringan
+        from core.client import shared_session
+
+        self.session = session or shared_session()
+
+    def fetch(self, ticker, period='ytd', interval='1d', start=None):
+        import yfinance as yf
+
+        stock = yf.Ticker(ticker, session=self.session)
+        if interval in INTRADAY_LIMITS:
+            return self._fetch_intraday(stock, period, interval, start)
+        if start is not None:
+            return stock.history(start=start, interval=interval)
+        return stock.history(period=period, interval=interval)
+
+    def _fetch_intraday(self, stock, period, interval, start):
+        """Bar intraday: awal dipotong ke batas Yahoo, rentang panjang dipecah per request"""
+        span, lookback = (pd.Timedelta(days=d) for d in INTRADAY_LIMITS[interval])
+        now = pd.Timestamp.now()
+        # Sedikit margin agar request pertama tidak jatuh tepat di batas
+        earliest = now - lookback + pd.Timedelta(hours=1)
+        begin = period_start(period) if start is None else _as_naive(start)
+        if begin is None or begin < earliest:
+            begin = earliest
+        if start is None and now - begin <= span and begin > earliest:
+            return stock.history(period=period, interval=interval)
+
+        frames = []
+        while begin < now:
+            end = min(begin + span, now)
+            frame = stock.history(start=begin, end=end, interval=interval)
+            if not frame.empty:
+                frames.append(frame)
+            begin = end
+        if not frames:
+            return pd.DataFrame()
+        df = pd.concat(frames)
+        return df[~df.index.duplicated(keep='last')].sort_index()
+
+    def fetch_many(self, tickers, period='ytd', interval='1d', max_workers=8, batch_size=100):
+        """Mengambil banyak ticker lewat download batch Yahoo"""
+        import yfinance as yf
+
+        tickers = list(tickers)
+        for i in range(0, len(tickers), batch_size):
+            batch = tickers[i:i + batch_size]
+            try:
+                with metrics.span('fetch_batch', source=type(self).__name__, size=len(batch)):
+                    data = yf.download(
+                        batch, period=period, interval=interval, group_by='ticker',
+                        actions=True, ignore_tz=False, threads=max_workers,
+                        progress=False, session=self.session,
+                    )
+            except Exception as e:
+                for ticker in batch:
+                    yield ticker, e
+                continue
+
+            available = set() if data is None else set(data.columns.get_level_values(0))
+            for ticker in batch:
+                if ticker not in available:
+                    yield ticker, ValueError("Unable to retrieve stock data")
+                    continue
+                yield ticker, data[ticker].dropna(how='all')
+
+
+class FileSource(DataSource):
+    """Sumber data dari file lokal (Parquet/CSV), satu file per ticker.
+
+    Period dihitung relatif terhadap bar terakhir di file, sehingga fixture
+    lama tetap memberikan hasil yang sama setiap kali dijalankan.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, ticker, interval):
+        for name in (f"{ticker}_{interval}", ticker):
+            for ext in ('.parquet', '.csv'):
+                path = os.path.join(self.root, name + ext)
+                if os.path.exists(path):
+                    return path
+        raise FileNotFoundError(f"No data file for {ticker} ({interval}) in {self.root}")
+
+    def fetch(self, ticker, period='ytd', interval='1d', start=None):
+        path = self._path(ticker, interval)
+        if path.endswith('.parquet'):
+            df = pd.read_parquet(path)
+        else:
+            df = pd.read_csv(path, index_col=0)
+            df.index = pd.to_datetime(df.index)
+        df = df.sort_index()
+
+        if start is None and not df.empty:
+            start = period_start(period, now=df.index[-1])
+        return _slice_from(df, start)
+
+
+class BarCache:
+    """Cache bar OHLCV di disk (Parquet), per ticker/interval"""
+
+    def __init__(self, root='.cache/bars'):
+        self.root = root
+
+    def _base(self, ticker, interval):
+        name = re.sub(r'[^A-Za-z0-9._=-]', '_', ticker)
+        return os.path.join(self.root, interval, name)
+
+    def load(self, ticker, interval):
+        """Membaca bar dan metadata cakupan dari cache"""
+        base = self._base(ticker, interval)
+        if not os.path.exists(base + '.parquet'):
+            return None, {}
+        df = pd.read_parquet(base + '.parquet')
+        meta = {}
+        if os.path.exists(base + '.json'):
+            with open(base + '.json') as f:
+                meta = json.load(f)
+        return df, meta
+
+    def store(self, ticker, interval, df, meta):
+        """Menulis bar dan metadata ke cache secara atomik"""
+        base = self._base(ticker, interval)
+        os.makedirs(os.path.dirname(base), exist_ok=True)
+        _write_atomic(base + '.parquet', df.to_parquet)
+        _write_atomic(base + '.json', lambda f: json.dump(meta, f), mode='w')
+
+    def append(self, ticker, interval, cached, fresh, meta):
+        """Menggabungkan bar baru ke cache; bar dengan timestamp sama ditimpa"""
+        if cached is None or cached.empty:
+            merged = fresh
+        elif fresh.empty:
+            merged = cached
+        else:
+            merged = pd.concat([cached, fresh])
+            merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+        self.store(ticker, interval, merged, meta)
+        return merged
+
+
+class CachedSource(DataSource):
+    """Sumber data dengan cache inkremental di depan sumber lain.
+
+    Hanya bar sejak timestamp terakhir di cache yang diambil ulang (bar
+    terakhir ikut diambil karena bisa saja belum lengkap). Dengan
+    offline=True jaringan tidak disentuh sama sekali, dan max_age (detik)
+    melewati pengambilan jika cache masih cukup baru.
+    """
+
+    def __init__(self, source, cache=None, offline=False, max_age=0):
+        self.source = source
+        self.cache = cache or BarCache()
+        self.offline = offline
+        self.max_age = max_age
+
+    def fetch(self, ticker, period='ytd', interval='1d', start=None):
+        wanted = period_start(period) if start is None else _as_naive(start)
+        cached, meta = self.cache.load(ticker, interval)
+
+        covered = cached is not None and 'start' in meta and (
+            meta['start'] is None or
+            (wanted is not None and pd.Timestamp(meta['start']) <= wanted)
+        )
+
+        if self.offline:
+            if cached is None:
+                metrics.count('bar_cache', result='offline_miss')
+                raise ValueError(f"No cached data for {ticker} ({interval})")
+            metrics.count('bar_cache', result='offline')
+            return _slice_from(cached, wanted)
+
+        now = time.time()
+        if covered and now - meta.get('fetched', 0) < self.max_age:
+            metrics.count('bar_cache', result='hit')
+            return _slice_from(cached, wanted)
+
+        if covered and not cached.empty:
+            metrics.count('bar_cache', result='incremental')
+            fresh = self.source.fetch(ticker, period=period, interval=interval, start=cached.index[-1])
+            meta['fetched'] = now
+        else:
+            metrics.count('bar_cache', result='miss')
+            fresh = self.source.fetch(ticker, period=period, interval=interval, start=start)
+            meta = {
+                'start': None if wanted is None else wanted.isoformat(),
+                'fetched': now,
+            }
+            # Riwayat lama di luar period tetap dipertahankan
+            if cached is not None and not cached.empty and not fresh.empty:
+                cached = cached[cached.index < fresh.index[0]]
+
+        merged = self.cache.append(ticker, interval, cached, fresh, meta)
+        return _slice_from(merged, wanted)
@@ -0,0 +1,35 @@
+import ast
+
+# Node AST yang boleh muncul di ekspresi filter (aturan alert, where screener);
+# atribut, subscript, lambda dan comprehension ditolak agar ekspresi tidak bisa
+# menjangkau objek Python di luar kolom yang diizinkan
+NODES = (
+    ast.Expression, ast.Compare, ast.BoolOp, ast.BinOp, ast.UnaryOp, ast.IfExp, ast.Constant, ast.Name,
+    ast.Tuple, ast.List, ast.Call, ast.Load, ast.operator, ast.cmpop, ast.boolop, ast.unaryop,
+)
+
+
+def validate(expression, names, functions=()):
+    """Memeriksa ekspresi filter dan mengembalikan AST-nya.
+
+    Hanya nama di `names` (kolom) dan pemanggilan fungsi di `functions`
+    (berdasarkan nama) yang diizinkan, selain konstanta, perbandingan,
+    and/or/not dan aritmetika; pangkat ditolak agar ekspresi tidak bisa
+    membuat bilangan raksasa (9 ** 9 ** 9). Ekspresi yang tidak valid
+    menghasilkan ValueError sebelum ada kode yang dijalankan.
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression {expression!r}: {e.msg}") from None
+    for node in ast.walk(tree):
+        if not isinstance(node, NODES) or isinstance(node, ast.Pow):
+            raise ValueError(f"Unsupported syntax in expression {expression!r}: {type(node).__name__}")
+        if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name) and node.func.id in functions
+                                               and not node.keywords):
+            allowed = f"only {', '.join(functions)} may be called" if functions else "function calls are not allowed"
+            raise ValueError(f"Unsupported call in expression {expression!r}: {allowed}")
+    unknown = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)} - set(names) - set(functions)
+    if unknown:
+        raise ValueError(f"Unknown field in expression {expression!r}: {', '.join(sorted(unknown))}")
+    return tree
@@ -1,60 +1,252 @@
-import yfinance as yf
-
-from curl_cffi import requests
-
-session = requests.Session(impersonate="chrome")
-
-def format_number(value):
-    if value is None:
-        return "N/A"
-    abs_value = abs(value)
-    if abs_value >= 1_000_000_000_000:
-        return f"{value/1_000_000_000_000:.2f}T"
-    elif abs_value >= 1_000_000_000:
-        return f"{value/1_000_000_000:.2f}B"
-    elif abs_value >= 1_000_000:
-        return f"{value/1_000_000:.2f}M"
-    else:
-        return str(value)
-    
-def get_fundamental_data(ticker):
-    stock = yf.Ticker(ticker, session=session)
-    info = stock.info
-    financials = stock.financials
-    balance_sheet = stock.balance_sheet
+import os
+import json
+import pickle
+import re
+import time
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from core import metrics
+
+MINUTE = 60
+DAY = 24 * 60 * MINUTE
+
+# Umur maksimum tiap payload: laporan keuangan berubah per kuartal, harga per menit
+TTL = {
+    'info': DAY,
+    'financials': 7 * DAY,
+    'balance_sheet': 7 * DAY,
+    'quarterly_financials': 7 * DAY,
+    'quarterly_balance_sheet': 7 * DAY,
+    'cashflow': 7 * DAY,
+    'quarterly_cashflow': 7 * DAY,
+    'quote': 15 * MINUTE,
+}
+
+
+def _quote(stock):
+    """Field turunan harga dari fast_info (lebih ringan daripada info)"""
+    fast = stock.fast_info
+    return {
+        'currentPrice': fast['lastPrice'],
+        'marketCap': fast['marketCap'],
+        'fiftyTwoWeekHigh': fast['yearHigh'],
+        'fiftyTwoWeekLow': fast['yearLow'],
+    }
+
+
+FIELDS = {
+    'info': lambda stock: stock.info,
+    'financials': lambda stock: stock.financials,
+    'balance_sheet': lambda stock: stock.balance_sheet,
+    'quote': _quote,
+}
+
+# Laporan keuangan lengkap (tahunan dan kuartalan) untuk core.statements
+STATEMENTS = {
+    name: (lambda stock, name=name: getattr(stock, name))
+    for name in ('financials', 'quarterly_financials', 'balance_sheet', 'quarterly_balance_sheet',
+                 'cashflow', 'quarterly_cashflow')
+}
+
+# Payload yang boleh tidak ada; nilainya sudah tercakup di info
+OPTIONAL = {'quote'}
+
+
+class FundamentalCache:
+    """Cache payload mentah fundamental di disk (pickle), per ticker/field"""
+
+    def __init__(self, root='.cache/fundamentals'):
+        self.root = root
+
+    def _base(self, ticker):
+        return os.path.join(self.root, re.sub(r'[^A-Za-z0-9._=-]', '_', ticker))
+
+    def load(self, ticker):
+        """Membaca semua payload dan waktu pengambilannya"""
+        base = self._base(ticker)
+        meta_path = os.path.join(base, 'meta.json')
+        if not os.path.exists(meta_path):
+            return {}, {}
+        with open(meta_path) as f:
+            meta = json.load(f)
+        payloads = {}
+        for field in list(meta):
+            path = os.path.join(base, field + '.pkl')
+            if not os.path.exists(path):
+                del meta[field]
+                continue
+            with open(path, 'rb') as f:
+                payloads[field] = pickle.load(f)
+        return payloads, meta
+
+    def store(self, ticker, field, payload, meta):
+        """Menulis satu payload lalu metadata secara atomik"""
+        base = self._base(ticker)
+        os.makedirs(base, exist_ok=True)
+        path = os.path.join(base, field + '.pkl')
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+        meta_path = os.path.join(base, 'meta.json')
+        with open(meta_path + '.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(meta_path + '.tmp', meta_path)
+
+
+class FundamentalFetcher:
+    """Mengambil payload fundamental secara paralel dengan cache ber-TTL.
+
+    Hanya field yang kedaluwarsa yang diambil ulang, dan semua field dari
+    semua ticker berbagi satu thread pool. Jika pengambilan gagal, payload
+    lama di cache tetap dipakai. offline=True tidak menyentuh jaringan.
+    fields memilih payload yang diambil (bawaan FIELDS, mis. STATEMENTS).
+    """
+
+    def __init__(self, cache=None, ttl=None, offline=False, session=None, fields=None):
+        self.cache = cache or FundamentalCache()
+        self.ttl = {**TTL, **(ttl or {})}
+        self.offline = offline
+        self.session = session
+        self.fields = fields or FIELDS
+
+    def _fetch_field(self, ticker, field):
+        import yfinance as yf
+
+        from core.client import shared_session
+
+        with metrics.span('fundamental_fetch', ticker=ticker, field=field):
+            return self.fields[field](yf.Ticker(ticker, session=self.session or shared_session()))
+
+    def _stale(self, meta, now):
+        if self.offline:
+            return []
+        return [field for field in self.fields if now - meta.get(field, 0) >= self.ttl[field]]
+
+    def _complete(self, ticker, payloads, errors):
+        missing = [field for field in self.fields if field not in payloads and field not in OPTIONAL]
+        if missing:
+            return errors.get(missing[0]) or ValueError(f"No cached {missing[0]} for {ticker}")
+        return payloads
+
+    def fetch(self, ticker):
+        """Payload mentah satu ticker (dict field -> payload)"""
+        for _, payloads in self.fetch_many([ticker], max_workers=len(self.fields)):
+            if isinstance(payloads, Exception):
+                raise payloads
+            return payloads
+
+    def fetch_many(self, tickers, max_workers=8):
+        """Menghasilkan (ticker, payloads atau Exception) begitu ticker lengkap"""
+        now = time.time()
+        state = {}
+        jobs = []
+        for ticker in dict.fromkeys(tickers):
+            payloads, meta = self.cache.load(ticker)
+            stale = self._stale(meta, now)
+            if metrics.enabled():
+                for field in self.fields:
+                    metrics.count('fundamental_cache', field=field, result='miss' if field in stale else 'hit')
+            if not stale:
+                yield ticker, self._complete(ticker, payloads, {})
+                continue
+            state[ticker] = [payloads, meta, {}, len(stale)]
+            jobs.extend((ticker, field) for field in stale)
+
+        if not jobs:
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(self._fetch_field, ticker, field): (ticker, field) for ticker, field in jobs}
+            for future in as_completed(futures):
+                ticker, field = futures[future]
+                payloads, meta, errors, _ = state[ticker]
+                try:
+                    payloads[field] = future.result()
+                    meta[field] = time.time()
+                    self.cache.store(ticker, field, payloads[field], meta)
+                except Exception as e:
+                    errors[field] = e
+
+                state[ticker][3] -= 1
+                if state[ticker][3] == 0:
+                    del state[ticker]
+                    yield ticker, self._complete(ticker, payloads, errors)
+
+
+_fetcher = None
+
+
+def default_fetcher():
+    """FundamentalFetcher bersama dengan cache bawaan"""
+    global _fetcher
+    if _fetcher is None:
+        _fetcher = FundamentalFetcher()
+    return _fetcher
+
+
+def get_fundamental_data(ticker, fetcher=None):
+    return summarize((fetcher or default_fetcher()).fetch(ticker))
+
+
+def get_fundamental_data_many(tickers, fetcher=None, max_workers=8):
+    """Data fundamental banyak ticker lewat satu pool terbatas.
+
+    Error per ticker dikembalikan sebagai {'Symbol', 'error'}.
+    """
+    results = {}
+    for ticker, payloads in (fetcher or default_fetcher()).fetch_many(tickers, max_workers=max_workers):
+        if isinstance(payloads, Exception):
+            results[ticker] = {'Symbol': ticker, 'error': f"{type(payloads).__name__}: {payloads}"}
+        else:
+            results[ticker] = summarize(payloads)
+    return {t: results[t] for t in tickers if t in results}
+
+
+def summarize(payloads):
+    """Ringkasan fundamental dari payload mentah.
+
+    Nilai tetap mentah dalam satuan Yahoo (mis. ROE 0.123, Dividend Yield
+    dalam persen, Debt to Equity dalam persen); None jika tidak tersedia.
+    Format tampilan ada di report.printer.
+    """
+    quote = payloads.get('quote') or {}
+    info = {**payloads['info'], **{k: v for k, v in quote.items() if v is not None and v == v}}
+    financials = payloads['financials']
+    balance_sheet = payloads['balance_sheet']
 
     return {
-        "Company": info.get("longName", "N/A"),
-        "Symbol": info.get("symbol", "N/A"),
-        "Sector": info.get("sector", "N/A"),
-        "Industry": info.get("industry", "N/A"),
-        "Recommendation": info.get("averageAnalystRating", "N/A"),
-        "Market Cap": format_number(info.get("marketCap")),
-        "Current Price": format_number(info.get("currentPrice")),
-        "Book Value per Share (BVPS)": f"{round(info.get('bookValue', 0), 2)}" if info.get("bookValue") else "N/A",
-        "Price to Book Value (PBV)": f"{round(info.get('priceToBook', 0), 2)}" if info.get("priceToBook") else "N/A",
-        "Trailing P/E": round(info.get("trailingPE", 0), 2) if info.get("trailingPE") else "N/A",
-        "Forward P/E": round(info.get("forwardPE", 0), 2) if info.get("forwardPE") else "N/A",
-        "EPS (TTM)": round(info.get("trailingEps", 0), 2) if info.get("trailingEps") else "N/A",
-        "Dividend Yield": f"{round(info.get('dividendYield', 0), 2)}%" if info.get("dividendYield") else "N/A",
-        "Dividend per Share": format_number(info.get("dividendRate")),
-        "Payout Ratio": f"{round(info.get('payoutRatio', 0) * 100, 2)}%" if info.get("payoutRatio") else "N/A",
-        "ROE": f"{round(info.get('returnOnEquity', 0) * 100, 2)}%" if info.get("returnOnEquity") else "N/A",
-        "ROA": f"{round(info.get('returnOnAssets', 0) * 100, 2)}%" if info.get("returnOnAssets") else "N/A",
-        "Debt to Equity": round(info.get("debtToEquity", 0) / 100, 2) if info.get("debtToEquity") else "N/A",
-        "Current Ratio": round(info.get("currentRatio", 0), 2) if info.get("currentRatio") else "N/A",
-        "Quick Ratio": round(info.get("quickRatio", 0), 2) if info.get("quickRatio") else "N/A",
-        "Gross Margin": f"{round(info.get('grossMargins', 0) * 100, 2)}%" if info.get("grossMargins") else "N/A",
-        "Operating Margin": f"{round(info.get('operatingMargins', 0) * 100, 2)}%" if info.get("operatingMargins") else "N/A",
-        "Profit Margin": f"{round(info.get('profitMargins', 0) * 100, 2)}%" if info.get("profitMargins") else "N/A",
-        "Revenue (TTM)": format_number(info.get("totalRevenue")),
-        "Net Income (TTM)": format_number(info.get("netIncomeToCommon")),
-        "Free Cash Flow": format_number(info.get("freeCashflow")),
-        "Beta": round(info.get("beta", 0), 2) if info.get("beta") else "N/A",
-        "52 Week High": format_number(info.get("fiftyTwoWeekHigh")),
-        "52 Week Low": format_number(info.get("fiftyTwoWeekLow")),
-        "Trailing Annual Net Income": format_number(financials.loc["Net Income"].sum()) if "Net Income" in financials.index else "N/A",
-        "Operating Cash Flow": format_number(info.get("operatingCashflow")),
-        "Shares Outstanding": format_number(info.get("sharesOutstanding")),
-        "Total Assets": format_number(balance_sheet.loc["Total Assets"].iloc[0]) if "Total Assets" in balance_sheet.index else "N/A",
-    }
\ No newline at end of file
+        "Company": info.get("longName"),
+        "Symbol": info.get("symbol"),
+        "Sector": info.get("sector"),
+        "Industry": info.get("industry"),
+        "Recommendation": info.get("averageAnalystRating"),
+        "Market Cap": info.get("marketCap"),
+        "Current Price": info.get("currentPrice"),
+        "Book Value per Share (BVPS)": info.get("bookValue"),
+        "Price to Book Value (PBV)": info.get("priceToBook"),
+        "Trailing P/E": info.get("trailingPE"),
+        "Forward P/E": info.get("forwardPE"),
+        "EPS (TTM)": info.get("trailingEps"),
+        "Dividend Yield": info.get("dividendYield"),
+        "Dividend per Share": info.get("dividendRate"),
+        "Payout Ratio": info.get("payoutRatio"),
+        "ROE": info.get("returnOnEquity"),
+        "ROA": info.get("returnOnAssets"),
+        "Debt to Equity": info.get("debtToEquity"),
+        "Current Ratio": info.get("currentRatio"),
+        "Quick Ratio": info.get("quickRatio"),
+        "Gross Margin": info.get("grossMargins"),
+        "Operating Margin": info.get("operatingMargins"),
+        "Profit Margin": info.get("profitMargins"),
+        "Revenue (TTM)": info.get("totalRevenue"),
+        "Net Income (TTM)": info.get("netIncomeToCommon"),
+        "Free Cash Flow": info.get("freeCashflow"),
+        "Beta": info.get("beta"),
+        "52 Week High": info.get("fiftyTwoWeekHigh"),
+        "52 Week Low": info.get("fiftyTwoWeekLow"),
+        "Trailing Annual Net Income": financials.loc["Net Income"].sum() if "Net Income" in financials.index else None,
+        "Operating Cash Flow": info.get("operatingCashflow"),
+        "Shares Outstanding": info.get("sharesOutstanding"),
+        "Total Assets": balance_sheet.loc["Total Assets"].iloc[0] if "Total Assets" in balance_sheet.index else None,
+    }
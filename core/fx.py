@@ -0,0 +1,168 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from core import metrics
+
+# Nilai ringkasan fundamental (core.fundamental.summarize) dalam satuan mata uang
+MONETARY = (
+    "Market Cap", "Current Price", "Book Value per Share (BVPS)", "EPS (TTM)", "Dividend per Share",
+    "Revenue (TTM)", "Net Income (TTM)", "Free Cash Flow", "52 Week High", "52 Week Low",
+    "Trailing Annual Net Income", "Operating Cash Flow", "Total Assets",
+)
+
+# Kolom harga OHLCV (Volume tidak dikonversi)
+PRICES = ('Open', 'High', 'Low', 'Close')
+
+# Mata uang perantara untuk pasangan yang tidak tersedia langsung
+CROSS = 'USD'
+
+
+def pair_ticker(base, quote):
+    """Ticker Yahoo pasangan mata uang, mis. ('USD', 'IDR') -> 'USDIDR=X' (harga 1 base dalam quote)"""
+    return f"{base}{quote}=X"
+
+
+def _dates(index):
+    """Tanggal lokal tanpa zona (int64 ns) untuk penyelarasan kurs harian"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize().as_unit('ns').asi8
+
+
+class FxRates:
+    """Kurs historis harian per pasangan mata uang dengan cache.
+
+    Deret kurs diambil lewat DataSource (bawaan CachedSource di atas Yahoo,
+    sehingga tersimpan di disk dan hanya bar baru yang diambil ulang) lalu
+    disimpan di memori selama max_age detik. Pasangan yang tidak ada
+    langsung dicoba terbalik (1 / kurs), lalu silang lewat CROSS.
+    Konversi memakai kurs penutupan terakhir pada atau sebelum tanggal
+    tiap nilai; tanggal sebelum kurs pertama menjadi NaN.
+    """
+
+    def __init__(self, source=None, offline=False, max_age=6 * 60 * 60):
+        self.source = source
+        self.offline = offline
+        self.max_age = max_age
+        self._series = {}
+
+    def _source(self):
+        if self.source is None:
+            from core.data import BarCache, CachedSource, YahooSource
+
+            self.source = CachedSource(YahooSource(), BarCache(), offline=self.offline, max_age=self.max_age)
+        return self.source
+
+    def _fetch(self, base, quote):
+        df = self._source().fetch(pair_ticker(base, quote), period='max', interval='1d')
+        close = df['Close'] if 'Close' in df else pd.Series(dtype=np.float64)
+        close = close[close.notna() & (close > 0)]
+        if close.empty:
+            raise ValueError(f"No FX data for {pair_ticker(base, quote)}")
+        dates = _dates(close.index)
+        # Satu kurs per tanggal (bar terakhir hari itu)
+        last = np.append(dates[1:] != dates[:-1], True)
+        return pd.Series(close.to_numpy(dtype=np.float64)[last], index=pd.DatetimeIndex(dates[last]))
+
+    def series(self, base, quote):
+        """Deret kurs harian (harga 1 base dalam quote), indeks tanggal tanpa zona"""
+        base, quote = base.upper(), quote.upper()
+        if base == quote:
+            return None
+        for key, invert in (((base, quote), False), ((quote, base), True)):
+            cached = self._series.get(key)
+            if cached is not None and time.time() - cached[0] < self.max_age:
+                metrics.count('fx_cache', result='hit')
+                return 1.0 / cached[1] if invert else cached[1]
+        metrics.count('fx_cache', result='miss')
+        series = self._resolve(base, quote)
+        self._series[(base, quote)] = (time.time(), series)
+        return series
+
+    def _resolve(self, base, quote):
+        errors = []
+        # Yahoo lebih lengkap untuk pasangan berbasis USD (mis. USDIDR=X)
+        candidates = [((base, quote), False), ((quote, base), True)]
+        for pair, invert in (candidates[::-1] if quote == CROSS else candidates):
+            try:
+                series = self._fetch(*pair)
+                return 1.0 / series if invert else series
+            except Exception as e:
+                errors.append(e)
+        if CROSS not in (base, quote):
+            first, second = self.series(base, CROSS), self.series(CROSS, quote)
+            second = second.reindex(first.index.union(second.index)).ffill()
+            return (first * second.reindex(first.index)).dropna()
+        raise errors[-1]
+
+    def rates(self, base, quote, dates=None):
+        """Kurs untuk tiap tanggal (array); dates=None memberi kurs terakhir (skalar)"""
+        series = self.series(base, quote)
+        if series is None:
+            return 1.0 if dates is None else np.ones(len(dates))
+        if dates is None:
+            return float(series.iloc[-1])
+        position = np.searchsorted(series.index.asi8, _dates(dates), side='right') - 1
+        values = series.to_numpy()
+        return np.where(position >= 0, values[np.maximum(position, 0)], np.nan)
+
+    def convert(self, values, base, quote, dates=None):
+        """Mengonversi skalar, array, Series atau DataFrame dari base ke quote sekaligus.
+
+        Series/DataFrame berindeks waktu memakai kurs per tanggal indeksnya
+        (seluruh kolom DataFrame dikonversi; lihat convert_frame untuk
+        OHLCV); selain itu dates menentukan tanggal, atau kurs terakhir.
+        """
+        indexed = isinstance(values, (pd.Series, pd.DataFrame)) and isinstance(values.index, pd.DatetimeIndex)
+        if dates is None and indexed:
+            dates = values.index
+        rate = self.rates(base, quote, dates)
+        if isinstance(values, pd.DataFrame):
+            return values.mul(rate, axis=0)
+        if isinstance(values, pd.Series):
+            return values * rate
+        return np.asarray(values, dtype=np.float64) * rate if np.ndim(values) else values * rate
+
+    def convert_frame(self, df, base, quote, columns=PRICES):
+        """Salinan frame OHLCV dengan kolom harga dikonversi per tanggal bar"""
+        rate = self.rates(base, quote, df.index)
+        out = df.copy()
+        for column in columns:
+            if column in out:
+                out[column] = out[column].to_numpy(dtype=np.float64) * rate
+        return out
+
+    def convert_frames(self, frames, base, quote, columns=PRICES):
+        """convert_frame untuk mapping ticker -> DataFrame; satu deret kurs untuk semua ticker"""
+        return {ticker: self.convert_frame(df, base, quote, columns) for ticker, df in frames.items()}
+
+    def convert_fundamental(self, summary, base, quote):
+        """Salinan ringkasan fundamental dengan nilai MONETARY dikonversi memakai kurs terakhir"""
+        rate = self.rates(base, quote)
+        return {key: value * rate if key in MONETARY and value is not None else value
+                for key, value in summary.items()}
+
+    def convert_statements(self, table, base, quote):
+        """Salinan tabel core.statements dengan item nominal dikonversi per akhir periode"""
+        from core.statements import ITEMS
+
+        rate = self.rates(base, quote, table['period_end'])
+        out = table.copy()
+        for column in ITEMS:
+            if column != 'shares':
+                out[column] = out[column].to_numpy(dtype=np.float64) * rate
+        return out
+
+
+_rates = None
+
+
+def default_rates():
+    """FxRates bersama dengan cache bawaan"""
+    global _rates
+    if _rates is None:
+        _rates = FxRates()
+    return _rates
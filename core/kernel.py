@@ -0,0 +1,441 @@
+import re
+import warnings
+
+import numpy as np
+
+# Batas pertumbuhan d^-j di dalam satu blok rekurensi (menjaga presisi)
+_BLOCK_GROWTH = np.log(1e4)
+
+# Jendela bawaan indikator; nama kolom (MA20, RSI, ...) tetap sama walaupun
+# jendelanya diganti
+WINDOWS = {
+    'ma_fast': 20, 'ma_mid': 50, 'ma_slow': 200,
+    'rsi': 14, 'rsi_ma': 9,
+    'macd_fast': 12, 'macd_slow': 26, 'macd_signal': 9,
+    'stoch': 14, 'stoch_d': 3,
+    'bb': 20, 'bb_std': 2,
+    'atr': 14, 'vwap': 20, 'obv_ma': 20,
+    'tenkan': 9, 'kijun': 26, 'senkou_b': 52,
+    'support': 20, 'fibonacci': 50, 'pivot': 5,
+}
+
+
+def resolve_windows(windows=None):
+    """WINDOWS digabung dengan override; kunci yang tidak dikenal dan jendela < 1 ditolak"""
+    windows = dict(windows or {})
+    unknown = set(windows) - set(WINDOWS)
+    if unknown:
+        raise ValueError(f"Unknown indicator windows: {', '.join(sorted(unknown))}")
+    for key, value in windows.items():
+        # bb_std adalah pengali simpangan baku, bukan jumlah bar
+        valid = value > 0 if key == 'bb_std' else value >= 1 and int(value) == value
+        if not valid:
+            expected = "a positive number" if key == 'bb_std' else "an integer >= 1"
+            raise ValueError(f"Invalid indicator window {key}={value!r} (expected {expected})")
+    return {**WINDOWS, **windows}
+
+
+def _scan(e, d):
+    """Rekurensi y[t] = d * y[t-1] + e[t] dengan prefix scan log2(n) langkah"""
+    y = e.copy()
+    factor, shift = d, 1
+    while shift < len(y) and factor > 1e-300:
+        y[shift:] = y[shift:] + factor * y[:-shift]
+        factor *= factor
+        shift *= 2
+    return y
+
+
+def linear_recurrence(u, d):
+    """Menghitung y[t] = d * y[t-1] + u[t] (y[-1] = 0) sepanjang axis 0.
+
+    Dikerjakan per blok: di dalam blok memakai bentuk tertutup cumsum, lalu
+    nilai akhir tiap blok dirambatkan dengan scan. Mendukung array 1-D dan
+    2-D (waktu x ticker).
+    """
+    u = np.asarray(u, dtype=np.float64)
+    n = u.shape[0]
+    if n == 0 or d == 0:
+        return u.copy()
+
+    block = int(min(n, max(1, _BLOCK_GROWTH // -np.log(d)))) if d < 1 else n
+    m = -(-n // block)
+    pad = m * block - n
+    if pad:
+        u = np.concatenate([u, np.zeros((pad,) + u.shape[1:])])
+
+    shape = (1, block) + (1,) * (u.ndim - 1)
+    powers = (d ** np.arange(block)).reshape(shape)
+    blocks = u.reshape((m, block) + u.shape[1:])
+    local = np.cumsum(blocks / powers, axis=1) * powers
+
+    if m > 1:
+        carry = _scan(local[:, -1], d ** block)
+        incoming = np.concatenate([np.zeros((1,) + carry.shape[1:]), carry[:-1]])
+        local += incoming[:, None] * (d * powers)
+
+    return local.reshape(u.shape)[:n]
+
+
+def ema(x, alpha, min_periods=0):
+    """EMA setara pandas ewm(adjust=False); NaN hanya boleh di awal deret"""
+    x = np.asarray(x, dtype=np.float64)
+    valid = ~np.isnan(x)
+    count = np.cumsum(valid, axis=0)
+
+    # Observasi valid pertama menjadi nilai awal: u = x / alpha pada titik itu
+    u = np.where(valid, alpha * np.where(valid, x, 0.0), 0.0)
+    first = valid & (count == 1)
+    u = np.where(first, np.where(valid, x, 0.0), u)
+
+    y = linear_recurrence(u, 1.0 - alpha)
+    y[count < max(min_periods, 1)] = np.nan
+    return y
+
+
+def prefix_sums(x):
+    """Prefix sum (nilai NaN dianggap 0) dan prefix jumlah nilai valid"""
+    x = np.asarray(x, dtype=np.float64)
+    valid = ~np.isnan(x)
+    # Dikurangi rata-rata agar prefix sum deret panjang tidak kehilangan presisi
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        ref = np.nan_to_num(np.nanmean(x, axis=0))
+    zero = np.zeros((1,) + x.shape[1:])
+    total = np.concatenate([zero, np.cumsum(np.where(valid, x - ref, 0.0), axis=0)])
+    count = np.concatenate([zero, np.cumsum(valid, axis=0)])
+    return total, count, ref
+
+
+def window_sum(prefix, window, min_periods=None):
+    """Jumlah bergulir dari hasil prefix_sums (NaN jika valid < min_periods)"""
+    total, count, ref = prefix
+    n = total.shape[0] - 1
+    min_periods = window if min_periods is None else max(min_periods, 1)
+
+    end = np.arange(1, n + 1)
+    start = np.maximum(end - window, 0)
+    k = count[end] - count[start]
+    s = total[end] - total[start] + k * ref
+    return np.where(k >= min_periods, s, np.nan), k
+
+
+def rolling_sum(x, window, min_periods=None):
+    return window_sum(prefix_sums(x), window, min_periods)[0]
+
+
+def rolling_mean(x, window, min_periods=None):
+    s, k = window_sum(prefix_sums(x), window, min_periods)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return s / k
+
+
+def _rolling_extreme(x, window, min_periods, ufunc):
+    """Rolling max/min O(n) (van Herk/Gil-Werman) dengan semantik pandas"""
+    x = np.asarray(x, dtype=np.float64)
+    n = x.shape[0]
+    out = np.full(x.shape, np.nan)
+    min_periods = window if min_periods is None else max(min_periods, 1)
+    # Jendela parsial dengan NaN (mis. awal ticker pendek di panel 2-D): NaN diabaikan seperti pandas
+    partial = min_periods < window and np.isnan(x).any()
+    if partial:
+        ufunc = np.fmax if ufunc is np.maximum else np.fmin
+
+    if n >= window:
+        m = -(-n // window)
+        pad = m * window - n
+        xp = np.concatenate([x, np.repeat(x[-1:], pad, axis=0)]) if pad else x
+        blocks = xp.reshape((m, window) + x.shape[1:])
+        prefix = ufunc.accumulate(blocks, axis=1).reshape(xp.shape)
+        suffix = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(xp.shape)
+        out[window - 1:] = ufunc(suffix[:n - window + 1], prefix[window - 1:n])
+
+    if min_periods < window and n:
+        head = min(window - 1, n)
+        out[:head] = ufunc.accumulate(x[:head], axis=0)
+        out[:min_periods - 1] = np.nan
+    if partial:
+        count = np.concatenate([np.zeros((1,) + x.shape[1:]), np.cumsum(~np.isnan(x), axis=0)])
+        end = np.arange(1, n + 1)
+        out[count[end] - count[np.maximum(end - window, 0)] < min_periods] = np.nan
+    return out
+
+
+def rolling_max(x, window, min_periods=None):
+    return _rolling_extreme(x, window, min_periods, np.maximum)
+
+
+def rolling_min(x, window, min_periods=None):
+    return _rolling_extreme(x, window, min_periods, np.minimum)
+
+
+def rolling_std(x, window, chunk=65536):
+    """Simpangan baku bergulir (ddof=0), dihitung dua-lintas per chunk"""
+    x = np.asarray(x, dtype=np.float64)
+    n = x.shape[0]
+    out = np.full(x.shape, np.nan)
+    for start in range(0, max(n - window + 1, 0), chunk):
+        stop = min(start + chunk, n - window + 1)
+        view = np.lib.stride_tricks.sliding_window_view(x[start:stop + window - 1], window, axis=0)
+        out[start + window - 1:stop + window - 1] = view.std(axis=-1)
+    return out
+
+
+def shift(x, periods=1):
+    """Menggeser array sepanjang axis 0, mengisi NaN"""
+    out = np.full(x.shape, np.nan)
+    out[periods:] = x[:-periods]
+    return out
+
+
+class IndicatorKernel:
+    """Kernel indikator berbasis array NumPy.
+
+    Semua hasil antara (prefix sum, rolling extrema, EMA, true range)
+    disimpan per kunci sehingga indikator yang memakai jendela yang sama
+    (mis. MA20 dan Bollinger middle, High/Low 20 untuk support dan
+    risk/reward) hanya dihitung sekali. Hasil cocok dengan library `ta`.
+    Jendela indikator diambil dari `windows` (lihat WINDOWS).
+    """
+
+    def __init__(self, df, windows=None):
+        self.arrays = {
+            col: np.ascontiguousarray(df[col].to_numpy(dtype=np.float64))
+            for col in ('Open', 'High', 'Low', 'Close', 'Volume') if col in df
+        }
+        self.windows = resolve_windows(windows)
+        self._memo = {}
+        self._columns = {}
+
+    @classmethod
+    def from_arrays(cls, arrays, windows=None):
+        """Kernel dari mapping kolom -> array 1-D atau 2-D (waktu x ticker).
+
+        Pada array 2-D, ticker dengan riwayat lebih pendek diisi NaN di awal.
+        """
+        kernel = cls.__new__(cls)
+        kernel.arrays = {name: np.ascontiguousarray(values, dtype=np.float64) for name, values in arrays.items()}
+        kernel.windows = resolve_windows(windows)
+        kernel._memo = {}
+        kernel._columns = {}
+        return kernel
+
+    def with_windows(self, **windows):
+        """Kernel dengan jendela lain yang berbagi array dan hasil antara.
+
+        Prefix sum, EMA, rolling extrema dan true range yang sudah dihitung
+        dipakai ulang; hanya kolom yang bergantung pada jendela baru yang
+        dihitung (lihat core.sweep).
+        """
+        kernel = self.__class__.__new__(self.__class__)
+        kernel.arrays = self.arrays
+        kernel.windows = resolve_windows({**self.windows, **windows})
+        kernel._memo = self._memo
+        kernel._columns = {}
+        return kernel
+
+    def _cached(self, key, fn):
+        if key not in self._memo:
+            self._memo[key] = fn()
+        return self._memo[key]
+
+    def array(self, name):
+        """Array dasar atau turunan; turunan seperti 'RSI14' dibuat saat diminta"""
+        if name not in self.arrays:
+            base, params = re.match(r'^([A-Z]+)([\d_]*)$', name).groups()
+            getattr(self, base.lower())(*(int(p) for p in params.split('_') if p))
+        return self.arrays[name]
+
+    def _register(self, name, values):
+        self.arrays[name] = values
+        return values
+
+    def prefix(self, name):
+        return self._cached(('prefix', name), lambda: prefix_sums(self.array(name)))
+
+    def sum(self, name, window, min_periods=None):
+        return self._cached(('sum', name, window, min_periods),
+                            lambda: window_sum(self.prefix(name), window, min_periods)[0])
+
+    def mean(self, name, window, min_periods=None):
+        def compute():
+            s, k = window_sum(self.prefix(name), window, min_periods)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return s / k
+        return self._cached(('mean', name, window, min_periods), compute)
+
+    def std(self, name, window):
+        return self._cached(('std', name, window), lambda: rolling_std(self.array(name), window))
+
+    def _extreme(self, kind, name, window, min_periods, ufunc):
+        def compute():
+            x = self.array(name)
+            previous = self._memo.get((kind, name, window - 1, None)) if min_periods is None else None
+            if previous is None or window > x.shape[0]:
+                return _rolling_extreme(x, window, min_periods, ufunc)
+            # Jendela w dari jendela w-1 yang sudah ada: satu ufunc, bukan van Herk penuh
+            out = np.full(x.shape, np.nan)
+            out[window - 1:] = ufunc(previous[window - 1:], x[:x.shape[0] - window + 1])
+            return out
+        return self._cached((kind, name, window, min_periods), compute)
+
+    def highest(self, name, window, min_periods=None):
+        return self._extreme('max', name, window, min_periods, np.maximum)
+
+    def lowest(self, name, window, min_periods=None):
+        return self._extreme('min', name, window, min_periods, np.minimum)
+
+    def _tail_extreme(self, kind, name, window, count):
+        full = self._memo.get((kind, name, window, None))
+        if full is not None:
+            return full[-count:]
+        # Hanya window + count - 1 bar terakhir yang dibutuhkan
+        x = self.array(name)[-(window + count - 1):]
+        if len(x) < window + count - 1:
+            x = np.concatenate([np.full(window + count - 1 - len(x), np.nan), x])
+        view = np.lib.stride_tricks.sliding_window_view(x, window)
+        return view.max(axis=-1) if kind == 'max' else view.min(axis=-1)
+
+    def tail_highest(self, name, window, count=1):
+        """`count` nilai terakhir rolling max tanpa menghitung seluruh deret"""
+        return self._tail_extreme('max', name, window, count)
+
+    def tail_lowest(self, name, window, count=1):
+        """`count` nilai terakhir rolling min tanpa menghitung seluruh deret"""
+        return self._tail_extreme('min', name, window, count)
+
+    def ema(self, name, span=None, alpha=None, min_periods=None):
+        alpha = 2.0 / (span + 1) if alpha is None else alpha
+        min_periods = span if min_periods is None else min_periods
+        return self._cached(('ema', name, alpha, min_periods),
+                            lambda: ema(self.array(name), alpha, min_periods))
+
+    def tr(self):
+        """True range; bar pertama memakai High - Low"""
+        def compute():
+            high, low = self.array('High'), self.array('Low')
+            prev_close = shift(self.array('Close'))
+            with np.errstate(invalid='ignore'):
+                return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        return self._register('TR', self._cached('tr', compute))
+
+    def obv(self):
+        def compute():
+            close, volume = self.array('Close'), self.array('Volume')
+            with np.errstate(invalid='ignore'):
+                signed = np.where(close < shift(close), -volume, volume)
+            # NaN di awal (ticker yang lebih pendek) tidak ikut menjalar
+            obv = np.nancumsum(signed, axis=0)
+            obv[np.isnan(signed)] = np.nan
+            return obv
+        return self._register('OBV', self._cached('obv', compute))
+
+    def tpv(self):
+        """Typical price x volume untuk VWAP"""
+        def compute():
+            typical = (self.array('High') + self.array('Low') + self.array('Close')) / 3.0
+            return typical * self.array('Volume')
+        return self._register('TPV', self._cached('tpv', compute))
+
+    def gains(self):
+        """Kenaikan dan penurunan Close per bar (UP/DOWN), dipakai RSI semua jendela"""
+        def compute():
+            close = self.array('Close')
+            diff = close - shift(close)
+            with np.errstate(invalid='ignore'):
+                up = np.where(diff > 0, diff, 0.0)
+                down = np.where(diff < 0, -diff, 0.0)
+            missing = np.isnan(close)
+            up[missing] = down[missing] = np.nan
+            self._register('UP', up)
+            self._register('DOWN', down)
+            return up, down
+        return self._cached('gains', compute)
+
+    def rsi(self, window=14):
+        def compute():
+            self.gains()
+            ema_up = self.ema('UP', alpha=1.0 / window, min_periods=window)
+            ema_down = self.ema('DOWN', alpha=1.0 / window, min_periods=window)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return np.where(ema_down == 0, 100.0, 100.0 - 100.0 / (1.0 + ema_up / ema_down))
+        return self._register(f'RSI{window}', self._cached(('rsi', window), compute))
+
+    def atr(self, window=14):
+        """ATR Wilder, nol sebelum jendela pertama penuh (seperti `ta`)"""
+        def compute():
+            tr = self.tr()
+            # Jendela pertama dihitung dari bar valid pertama tiap kolom
+            count = np.cumsum(~np.isnan(tr), axis=0)
+            u = np.where(count > window, tr / window, 0.0)
+            seed = count == window
+            seed[1:] &= count[:-1] < window
+            if seed.any():
+                rows, *cols = np.nonzero(seed)
+                windows = np.lib.stride_tricks.sliding_window_view(tr, window, axis=0)
+                u[seed] = windows[(rows - window + 1, *cols)].mean(axis=-1)
+            return linear_recurrence(u, (window - 1) / window)
+        return self._cached(('atr', window), compute)
+
+    def macd(self, fast=12, slow=26, sign=9):
+        def compute():
+            line = self.ema('Close', fast) - self.ema('Close', slow)
+            name = f'MACD{fast}_{slow}'
+            self._register(name, line)
+            signal = self.ema(name, sign)
+            return line, signal, line - signal
+        return self._cached(('macd', fast, slow, sign), compute)
+
+    def stoch(self, window=14):
+        def compute():
+            low = self.lowest('Low', window)
+            high = self.highest('High', window)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return 100 * (self.array('Close') - low) / (high - low)
+        return self._register(f'STOCH{window}', self._cached(('stoch', window), compute))
+
+    def vwap(self, window=20):
+        def compute():
+            self.tpv()
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return self.sum('TPV', window) / self.sum('Volume', window)
+        return self._cached(('vwap', window), compute)
+
+    def ichimoku_line(self, window, min_periods=None):
+        return self._cached(('ichimoku', window, min_periods), lambda: 0.5 * (
+            self.highest('High', window, min_periods) + self.lowest('Low', window, min_periods)))
+
+    def column(self, name):
+        """Nilai kolom indikator StockAnalyzer berdasarkan namanya (dengan jendela self.windows)"""
+        if name not in self._columns:
+            self._columns[name] = COLUMNS[name](self, self.windows)
+        return self._columns[name]
+
+
+# Kolom kumulatif: hasil per chunk berbeda dari deret penuh sebesar konstanta
+CUMULATIVE = ('OBV', 'OBV_MA')
+
+# Definisi kolom indikator StockAnalyzer (MA200 memakai min_periods=1 seperti semula)
+COLUMNS = {
+    'MA20': lambda k, w: k.mean('Close', w['ma_fast']),
+    'MA50': lambda k, w: k.mean('Close', w['ma_mid']),
+    'MA200': lambda k, w: k.mean('Close', w['ma_slow'], min_periods=1),
+    'RSI': lambda k, w: k.rsi(w['rsi']),
+    'RSI_MA': lambda k, w: k.mean(f"RSI{w['rsi']}", w['rsi_ma']),
+    'MACD': lambda k, w: k.macd(w['macd_fast'], w['macd_slow'], w['macd_signal'])[0],
+    'MACD_signal': lambda k, w: k.macd(w['macd_fast'], w['macd_slow'], w['macd_signal'])[1],
+    'MACD_hist': lambda k, w: k.macd(w['macd_fast'], w['macd_slow'], w['macd_signal'])[2],
+    'Stoch_%K': lambda k, w: k.stoch(w['stoch']),
+    'Stoch_%D': lambda k, w: k.mean(f"STOCH{w['stoch']}", w['stoch_d']),
+    'BB_upper': lambda k, w: k.mean('Close', w['bb']) + w['bb_std'] * k.std('Close', w['bb']),
+    'BB_middle': lambda k, w: k.mean('Close', w['bb']),
+    'BB_lower': lambda k, w: k.mean('Close', w['bb']) - w['bb_std'] * k.std('Close', w['bb']),
+    'ATR': lambda k, w: k.atr(w['atr']),
+    'VWAP': lambda k, w: k.vwap(w['vwap']),
+    'OBV': lambda k, w: k.obv(),
+    'OBV_MA': lambda k, w: k.mean('OBV', w['obv_ma']),
+    'Tenkan_sen': lambda k, w: k.ichimoku_line(w['tenkan']),
+    'Kijun_sen': lambda k, w: k.ichimoku_line(w['kijun']),
+    'Senkou_span_a': lambda k, w: 0.5 * (k.ichimoku_line(w['tenkan']) + k.ichimoku_line(w['kijun'])),
+    'Senkou_span_b': lambda k, w: k.ichimoku_line(w['senkou_b'], min_periods=0),
+}
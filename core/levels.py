@@ -0,0 +1,171 @@
+import numpy as np
+import pandas as pd
+
+from core.data import resample_ohlcv
+from core.kernel import rolling_max, rolling_min, shift
+from core.signals import consolidation_zones
+
+# Timeframe (rule resample pandas, None = bar asli) -> bobot pivot
+TIMEFRAMES = {None: 1.0, 'W': 2.0, 'ME': 3.0}
+
+COLUMNS = ('level', 'low', 'high', 'kind', 'touches', 'highs', 'lows', 'bases', 'last', 'score', 'distance_pct')
+
+# Asal titik harga: swing high, swing low, zona konsolidasi
+HIGH, LOW, BASE = 0, 1, 2
+
+
+def _ahead(values, periods):
+    """values[t + periods], NaN di ujung"""
+    out = np.full(values.shape, np.nan)
+    out[:max(len(values) - periods, 0)] = values[periods:]
+    return out
+
+
+def pivots(high, low, left=5, right=None):
+    """Indeks swing high dan swing low.
+
+    Bar t adalah swing high jika high[t] lebih tinggi dari `left` bar
+    sebelumnya dan tidak lebih rendah dari `right` bar sesudahnya (swing
+    low sebaliknya), sehingga pivot baru terkonfirmasi `right` bar
+    kemudian. Rolling extrema O(n) membuat biayanya linear.
+    """
+    right = left if right is None else right
+    if left < 1 or right < 1:
+        raise ValueError("Pivot windows must be at least 1 bar")
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        is_high = (high > shift(rolling_max(high, left))) & (high >= _ahead(rolling_max(high, right), right))
+        is_low = (low < shift(rolling_min(low, left))) & (low <= _ahead(rolling_min(low, right), right))
+    return np.flatnonzero(is_high), np.flatnonzero(is_low)
+
+
+def cluster_levels(prices, weights, tolerance=0.01):
+    """Label zona untuk tiap harga pivot dari histogram log-harga berbobot.
+
+    Lebar bin log(1 + tolerance); histogram dihaluskan [0.5, 1, 0.5], puncak
+    lokalnya menjadi pusat zona dan tiap harga masuk ke puncak terdekat.
+    Biaya linear terhadap jumlah pivot dan jumlah bin.
+    """
+    log_price = np.log(prices)
+    bins = ((log_price - log_price.min()) / np.log1p(tolerance)).astype(np.int64)
+    hist = np.bincount(bins, weights=weights)
+    smooth = np.convolve(hist, [0.5, 1.0, 0.5], mode='same')
+    padded = np.concatenate([[-np.inf], smooth, [-np.inf]])
+    peaks = np.flatnonzero((smooth > padded[:-2]) & (smooth >= padded[2:]))
+    return np.searchsorted((peaks[1:] + peaks[:-1]) / 2, bins)
+
+
+def find_levels(df, left=5, right=None, timeframes=TIMEFRAMES, tolerance=0.01, half_life=250, min_touches=2,
+                consolidation=5, threshold=0.015):
+    """Zona support/resistance dari pivot seluruh riwayat, diurutkan menurut skor.
+
+    Pivot tiap timeframe dikumpulkan dengan bobot volume relatif x bobot
+    timeframe x peluruhan umur (setengah tiap `half_life` bar asli), lalu
+    dikelompokkan dengan cluster_levels. Skor zona adalah jumlah bobot
+    pivotnya, sehingga sentuhan berulang, volume besar dan sentuhan baru
+    menaikkan skor. Zona konsolidasi bar asli (consolidation_zones dengan
+    jendela `consolidation` bar, None = tanpa) ikut sebagai titik harga di
+    rata-rata close-nya, berbobot panjang zona per jendela. kind relatif
+    terhadap close terakhir.
+    """
+    n = len(df)
+    prices, weights, positions, origin = [], [], [], []
+    for rule, timeframe_weight in timeframes.items():
+        frame = df if rule is None else resample_ohlcv(df, rule)
+        high_idx, low_idx = pivots(frame['High'], frame['Low'], left, right)
+        volume = frame['Volume'].to_numpy(dtype=np.float64) if 'Volume' in frame else np.ones(len(frame))
+        mean_volume = np.nanmean(volume) if len(volume) else np.nan
+        relative = volume / mean_volume if mean_volume > 0 else np.ones(len(frame))
+        relative = np.where(np.isfinite(relative), relative, 1.0)
+        # Posisi bar asli terakhir di dalam tiap bar timeframe (untuk umur dan tanggal)
+        position = np.arange(n) if rule is None else np.clip(df.index.searchsorted(frame.index, side='right') - 1, 0, n - 1)
+        for rows, column, flag in ((high_idx, 'High', HIGH), (low_idx, 'Low', LOW)):
+            prices.append(frame[column].to_numpy(dtype=np.float64)[rows])
+            weights.append(relative[rows] * timeframe_weight)
+            positions.append(position[rows])
+            origin.append(np.full(len(rows), flag))
+    if consolidation:
+        zones = consolidation_zones(df['High'], df['Low'], df['Close'], consolidation, threshold)
+        prices.append(zones['mean'])
+        weights.append((zones['end'] - zones['start'] + 1) / consolidation)
+        positions.append(zones['end'])
+        origin.append(np.full(len(zones['end']), BASE))
+
+    prices, weights, positions, origin = (np.concatenate(parts) for parts in (prices, weights, positions, origin))
+    keep = np.isfinite(prices) & (prices > 0)
+    if not keep.any():
+        return pd.DataFrame(columns=list(COLUMNS))
+    prices, weights, positions, origin = prices[keep], weights[keep], positions[keep], origin[keep]
+    weights = weights * 0.5 ** ((n - 1 - positions) / half_life)
+
+    labels = cluster_levels(prices, weights, tolerance)
+    zones = labels.max() + 1
+    score = np.bincount(labels, weights=weights, minlength=zones)
+    low = np.full(zones, np.inf)
+    high = np.full(zones, -np.inf)
+    last = np.zeros(zones, dtype=np.int64)
+    np.minimum.at(low, labels, prices)
+    np.maximum.at(high, labels, prices)
+    np.maximum.at(last, labels, positions)
+
+    close = float(df['Close'].iloc[-1])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        level = np.bincount(labels, weights=weights * prices, minlength=zones) / score
+    table = pd.DataFrame({
+        'level': level,
+        'low': low,
+        'high': high,
+        'kind': np.where(level < close, 'support', 'resistance'),
+        'touches': np.bincount(labels, minlength=zones),
+        'highs': np.bincount(labels, weights=origin == HIGH, minlength=zones).astype(np.int64),
+        'lows': np.bincount(labels, weights=origin == LOW, minlength=zones).astype(np.int64),
+        'bases': np.bincount(labels, weights=origin == BASE, minlength=zones).astype(np.int64),
+        'last': df.index[last],
+        'score': score,
+        'distance_pct': (level / close - 1) * 100,
+    })
+    table = table[table['touches'] >= min_touches]
+    return table.sort_values('score', ascending=False, ignore_index=True)
+
+
+def nearest_levels(table, count=3):
+    """Level zona support dan resistance terdekat dari close terakhir"""
+    support = table[table['kind'] == 'support'].sort_values('distance_pct', ascending=False)
+    resistance = table[table['kind'] == 'resistance'].sort_values('distance_pct')
+    return {
+        'Support': list(support['level'].head(count)),
+        'Resistance': list(resistance['level'].head(count)),
+    }
+
+
+def _failed(chunk, e):
+    return [(ticker, {'error': f"{type(e).__name__}: {e}"}) for ticker, _ in chunk]
+
+
+def _levels_chunk(items, kwargs):
+    out = []
+    for ticker, df in items:
+        try:
+            out.append((ticker, find_levels(df, **kwargs)))
+        except Exception as e:
+            out.append((ticker, {'error': f"{type(e).__name__}: {e}"}))
+    return out
+
+
+def find_levels_many(frames, max_workers=None, chunksize=16, **kwargs):
+    """find_levels untuk banyak ticker di process pool.
+
+    frames adalah mapping ticker -> DataFrame OHLCV; error per ticker
+    dikembalikan sebagai {'error': ...}. max_workers=1 berjalan di proses
+    yang sama.
+    """
+    # Impor lokal: core.batch mengimpor core.technical, yang mengimpor modul ini
+    from core.batch import run_chunks
+
+    items = list(frames.items())
+    chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+    results = {}
+    for chunk_result in run_chunks(_levels_chunk, chunks, (kwargs,), max_workers, _failed):
+        results.update(chunk_result)
+    return results
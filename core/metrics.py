@@ -0,0 +1,265 @@
+import os
+import json
+import atexit
+import multiprocessing
+import threading
+import time
+
+# Instrumentasi ringan: span waktu dan counter yang dikirim ke sink. Saat
+# nonaktif, span() mengembalikan objek no-op bersama dan count() langsung
+# kembali, sehingga hook di jalur panas hampir tanpa biaya.
+
+_enabled = False
+_sinks = []
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Span aktif: mencatat durasi wall/CPU dan atribut tambahan (mis. bytes)"""
+
+    __slots__ = ('name', 'labels', 'attrs', 'start', '_wall', '_cpu')
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+        self.attrs = {}
+
+    def __enter__(self):
+        self.start = time.time()
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        event = {
+            'type': 'span',
+            'name': self.name,
+            'labels': self.labels,
+            'start': self.start,
+            'seconds': time.perf_counter() - self._wall,
+            'cpu_seconds': time.thread_time() - self._cpu,
+            'pid': os.getpid(),
+            **self.attrs,
+        }
+        if exc_type is not None:
+            event['error'] = exc_type.__name__
+        _emit(event)
+        return False
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+def enabled():
+    return _enabled
+
+
+def span(name, **labels):
+    """Context manager pengukur waktu; `with span('fetch', ticker=t) as s: s.set(bytes=n)`"""
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, labels)
+
+
+def count(name, value=1, **labels):
+    """Menambah counter (mis. cache hit/miss)"""
+    if not _enabled:
+        return
+    _emit({'type': 'counter', 'name': name, 'labels': labels, 'value': value, 'pid': os.getpid()})
+
+
+def _emit(event):
+    for sink in _sinks:
+        sink.emit(event)
+
+
+def enable(*sinks):
+    """Mengaktifkan instrumentasi dengan sink yang diberikan"""
+    global _enabled
+    _sinks.extend(sinks)
+    _enabled = bool(_sinks)
+
+
+def disable():
+    """Menonaktifkan instrumentasi lalu flush dan menutup semua sink"""
+    global _enabled
+    _enabled = False
+    while _sinks:
+        _sinks.pop().close()
+
+
+class JsonLinesSink:
+    """Satu event JSON per baris; aman dipakai beberapa proses (mode append)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = open(path, 'a', buffering=1)
+
+    def emit(self, event):
+        line = json.dumps(event, default=str) + '\n'
+        with self.lock:
+            self.file.write(line)
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+class PrometheusSink:
+    """Agregasi counter dan span ke file teks Prometheus (textfile collector).
+
+    Label dengan kardinalitas tinggi (default: ticker) dibuang saat agregasi.
+    File ditulis ulang secara atomik saat flush()/close() dan saat proses
+    berakhir. path=None hanya mengumpulkan agregat (dipakai di worker) yang
+    diambil lewat drain() dan digabung ke sink proses utama dengan merge().
+    """
+
+    def __init__(self, path, prefix='analin', drop_labels=('ticker',)):
+        self.path = path
+        self.prefix = prefix
+        self.drop_labels = set(drop_labels)
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.spans = {}
+        atexit.register(self.flush)
+
+    def _key(self, event):
+        labels = tuple(sorted((k, str(v)) for k, v in event['labels'].items() if k not in self.drop_labels))
+        return event['name'], labels
+
+    def emit(self, event):
+        key = self._key(event)
+        with self.lock:
+            if event['type'] == 'counter':
+                self.counters[key] = self.counters.get(key, 0) + event['value']
+            else:
+                total = self.spans.setdefault(key, [0, 0.0, 0.0])
+                total[0] += 1
+                total[1] += event['seconds']
+                total[2] += event['cpu_seconds']
+
+    def drain(self):
+        """Mengambil lalu mengosongkan agregat: (counters, spans)"""
+        with self.lock:
+            counters, spans = self.counters, self.spans
+            self.counters, self.spans = {}, {}
+        return counters, spans
+
+    def merge(self, counters, spans):
+        """Menambahkan agregat dari drain() sink lain (mis. worker)"""
+        with self.lock:
+            for key, value in counters.items():
+                self.counters[key] = self.counters.get(key, 0) + value
+            for key, (calls, seconds, cpu) in spans.items():
+                total = self.spans.setdefault(key, [0, 0.0, 0.0])
+                total[0] += calls
+                total[1] += seconds
+                total[2] += cpu
+
+    def _series(self, name, labels, value):
+        text = ','.join(f'{k}="{v}"' for k, v in labels)
+        return f"{self.prefix}_{name}{{{text}}} {value}" if text else f"{self.prefix}_{name} {value}"
+
+    def _type(self, lines, typed, metric, kind):
+        if metric not in typed:
+            typed.add(metric)
+            lines.append(f"# TYPE {self.prefix}_{metric} {kind}")
+
+    def flush(self):
+        if self.path is None:
+            return
+        with self.lock:
+            lines = []
+            typed = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                self._type(lines, typed, f"{name}_total", 'counter')
+                lines.append(self._series(f"{name}_total", labels, value))
+            # Span sebagai summary (_sum/_count); semua seri satu metrik harus berurutan
+            spans = sorted(self.spans.items())
+            for suffix, column in (('seconds', 1), ('cpu_seconds', 2)):
+                for (name, labels), total in spans:
+                    metric = f"{name}_{suffix}"
+                    self._type(lines, typed, metric, 'summary')
+                    lines.append(self._series(f"{metric}_sum", labels, total[column]))
+                    lines.append(self._series(f"{metric}_count", labels, total[0]))
+        with open(self.path + '.tmp', 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(self.path + '.tmp', self.path)
+
+    def close(self):
+        self.flush()
+        atexit.unregister(self.flush)
+
+
+def _collectors():
+    return [sink for sink in _sinks if isinstance(sink, PrometheusSink) and sink.path is None]
+
+
+def drain():
+    """Agregat Prometheus yang dikumpulkan worker ini sejak drain() terakhir (None bila tidak ada)"""
+    collected = [sink.drain() for sink in _collectors()]
+    return collected or None
+
+
+def merge(collected):
+    """Menggabungkan hasil drain() dari worker ke sink Prometheus proses ini"""
+    for counters, spans in collected or ():
+        for sink in _sinks:
+            if isinstance(sink, PrometheusSink) and sink.path is not None:
+                sink.merge(counters, spans)
+
+
+def traced(fn, *args):
+    """Menjalankan fn(*args) di worker; mengembalikan (hasil, drain()) untuk merge() di proses utama"""
+    return fn(*args), drain()
+
+
+def _after_fork():
+    # Worker hasil fork mewarisi sink Prometheus proses utama: kosongkan dan
+    # jadikan pengumpul, agar agregatnya dikirim lewat traced() dan tidak
+    # dihitung dua kali atau menimpa file
+    for sink in _sinks:
+        if isinstance(sink, PrometheusSink):
+            sink.lock = threading.Lock()
+            sink.path = None
+            sink.drain()
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+def enable_from_env():
+    """Mengaktifkan sink dari ANALIN_METRICS (JSON lines) dan ANALIN_METRICS_PROM.
+
+    Dipanggil saat modul diimpor, sehingga worker process pool yang
+    mewarisi environment ikut tercatat ke file JSON lines. File Prometheus
+    hanya ditulis proses utama agar tidak saling menimpa; worker hanya
+    mengumpulkan agregat yang dikirim kembali lewat traced().
+    """
+    sinks = []
+    if os.environ.get('ANALIN_METRICS'):
+        sinks.append(JsonLinesSink(os.environ['ANALIN_METRICS']))
+    if os.environ.get('ANALIN_METRICS_PROM'):
+        main = multiprocessing.parent_process() is None
+        sinks.append(PrometheusSink(os.environ['ANALIN_METRICS_PROM'] if main else None))
+    if sinks:
+        enable(*sinks)
+
+
+enable_from_env()
@@ -0,0 +1,218 @@
+import os
+import json
+
+import numpy as np
+import pandas as pd
+
+from core.data import DataSource, _as_naive, period_start
+
+FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+def _stamps(index):
+    """Timestamp int64 (ns); indeks berzona waktu disimpan dalam UTC"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return index.as_unit('ns').asi8
+
+
+def _save_json(path, data):
+    with open(path + '.tmp', 'w') as f:
+        json.dump(data, f)
+    os.replace(path + '.tmp', path)
+
+
+class PanelStore:
+    """Panel OHLCV satu universe di disk sebagai array memory-mapped.
+
+    Tiap field disimpan sebagai array .npy (ticker x waktu) dengan kapasitas
+    cadangan di sumbu waktu, sehingga sesi baru cukup ditulis di tempat.
+    calendar.npy berisi timestamp (int64 ns) dan mask.npy menandai bar yang
+    ada; bar yang hilang bernilai NaN. meta.json ditulis terakhir secara
+    atomik dan menentukan panjang yang valid, sehingga proses lain yang
+    membuka panel (mode baca, tanpa salinan) selalu melihat data yang utuh.
+    """
+
+    def __init__(self, root, writable=False):
+        self.root = root
+        self.writable = writable
+        self._open()
+
+    def _path(self, name):
+        return os.path.join(self.root, name + '.npy')
+
+    def _open(self):
+        with open(os.path.join(self.root, 'meta.json')) as f:
+            self.meta = json.load(f)
+        mode = 'r+' if self.writable else 'r'
+        self.tickers = list(self.meta['tickers'])
+        self._row = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self._stamps = np.load(self._path('calendar'), mmap_mode=mode)
+        self._mask = np.load(self._path('mask'), mmap_mode=mode)
+        self._fields = {name: np.load(self._path(name), mmap_mode=mode) for name in FIELDS}
+        self._calendar = None
+
+    @classmethod
+    def create(cls, root, frames, interval='1d', dtype='float64', capacity=0):
+        """Membuat panel baru dari mapping ticker -> DataFrame OHLCV"""
+        frames = {t: df for t, df in frames.items() if df is not None and not df.empty}
+        tz = next((str(df.index.tz) for df in frames.values() if df.index.tz is not None), None)
+        length = len(np.unique(np.concatenate([_stamps(df.index) for df in frames.values()]))) if frames else 0
+        os.makedirs(root, exist_ok=True)
+        cls._allocate(root, len(frames), max(capacity, length, 1), dtype)
+        _save_json(os.path.join(root, 'meta.json'), {
+            'tickers': [], 'length': 0, 'interval': interval, 'tz': tz, 'dtype': str(np.dtype(dtype)),
+        })
+        store = cls(root, writable=True)
+        store.append(frames)
+        return store
+
+    @classmethod
+    def _allocate(cls, root, tickers, capacity, dtype, suffix=''):
+        shape = (max(tickers, 1), capacity)
+        arrays = {'calendar': ((capacity,), np.int64), 'mask': (shape, np.bool_)}
+        arrays.update((name, (shape, dtype)) for name in FIELDS)
+        for name, (array_shape, array_dtype) in arrays.items():
+            # File baru berisi nol (sparse); area yang dipakai diisi saat append
+            array = np.lib.format.open_memmap(os.path.join(root, name + '.npy' + suffix), mode='w+',
+                                              dtype=array_dtype, shape=array_shape)
+            del array
+
+    def __len__(self):
+        return self.meta['length']
+
+    @property
+    def interval(self):
+        return self.meta['interval']
+
+    @property
+    def capacity(self):
+        return self._stamps.shape[0]
+
+    @property
+    def calendar(self):
+        """Indeks waktu panel (DatetimeIndex sepanjang len(self))"""
+        if self._calendar is None or len(self._calendar) != len(self):
+            index = pd.DatetimeIndex(np.asarray(self._stamps[:len(self)]).view('datetime64[ns]'))
+            if self.meta['tz']:
+                index = index.tz_localize('UTC').tz_convert(self.meta['tz'])
+            self._calendar = index
+        return self._calendar
+
+    @property
+    def mask(self):
+        """Mask bar yang ada (ticker x waktu)"""
+        return self._mask[:len(self.tickers), :len(self)]
+
+    def field(self, name):
+        """Array (ticker x waktu) satu field tanpa salinan"""
+        return self._fields[name][:len(self.tickers), :len(self)]
+
+    def frame(self, ticker):
+        """DataFrame OHLCV satu ticker.
+
+        Kolom berupa view ke file (tanpa salinan) selama tidak ada bar yang
+        hilang di tengah deret; bar kosong di awal/akhir dipotong.
+        """
+        row = self._row[ticker]
+        present = np.flatnonzero(self._mask[row, :len(self)])
+        if not len(present):
+            return pd.DataFrame(columns=list(FIELDS), index=self.calendar[:0])
+        lo, hi = present[0], present[-1] + 1
+        select = slice(lo, hi) if hi - lo == len(present) else present
+        data = {name: self._fields[name][row, select] for name in FIELDS}
+        return pd.DataFrame(data, index=self.calendar[select], copy=False)
+
+    def append(self, frames):
+        """Menambah sesi baru dan/atau ticker baru.
+
+        Bar dengan timestamp yang sudah ada ditimpa (mis. bar terakhir yang
+        belum lengkap); bar baru hanya boleh setelah sesi terakhir.
+        """
+        if not self.writable:
+            raise PermissionError("Panel opened read-only")
+        frames = {t: df for t, df in frames.items() if df is not None and not df.empty}
+        if not frames:
+            return self
+
+        length = len(self)
+        current = np.asarray(self._stamps[:length])
+        stamps = np.unique(np.concatenate([_stamps(df.index) for df in frames.values()]))
+        fresh = stamps[stamps > current[-1]] if length else stamps
+        old = stamps[:len(stamps) - len(fresh)]
+        if len(old) and not np.isin(old, current).all():
+            raise ValueError("Cannot insert bars before the last session of the panel")
+
+        tickers = self.tickers + [t for t in frames if t not in self._row]
+        size = length + len(fresh)
+        if size > self.capacity or len(tickers) > self._mask.shape[0]:
+            self._resize(len(tickers), max(size, 2 * self.capacity) if size > self.capacity else self.capacity)
+
+        self._stamps[length:size] = fresh
+        for name in FIELDS:
+            self._fields[name][:, length:size] = np.nan
+        calendar = np.asarray(self._stamps[:size])
+        rows = {ticker: i for i, ticker in enumerate(tickers)}
+        for ticker, df in frames.items():
+            row = rows[ticker]
+            cols = np.searchsorted(calendar, _stamps(df.index))
+            for name in FIELDS:
+                if name in df:
+                    self._fields[name][row, cols] = df[name].to_numpy(dtype=np.float64)
+            self._mask[row, cols] = True
+
+        for array in (self._stamps, self._mask, *self._fields.values()):
+            array.flush()
+        self.meta.update(tickers=tickers, length=size)
+        _save_json(os.path.join(self.root, 'meta.json'), self.meta)
+        self._open()
+        return self
+
+    def _resize(self, tickers, capacity):
+        """Memindahkan panel ke file yang lebih besar (pembaca lama tetap memegang file lama)"""
+        length, rows = len(self), len(self.tickers)
+        self._allocate(self.root, tickers, capacity, self.meta['dtype'], suffix='.tmp')
+        for name, array in (('calendar', self._stamps), ('mask', self._mask), *self._fields.items()):
+            target = np.load(self._path(name) + '.tmp', mmap_mode='r+')
+            if name == 'calendar':
+                target[:length] = array[:length]
+            else:
+                target[:rows, :length] = array[:rows, :length]
+            target.flush()
+            del target
+        for name in ('calendar', 'mask', *FIELDS):
+            os.replace(self._path(name) + '.tmp', self._path(name))
+        self._open()
+
+
+def closes(source):
+    """Matriks close (waktu x ticker) dari PanelStore atau mapping ticker -> DataFrame OHLCV.
+
+    Bar yang tidak ada (mask panel, atau tanggal yang tidak dimiliki
+    ticker) bernilai NaN.
+    """
+    if isinstance(source, PanelStore):
+        close = np.where(source.mask, source.field('Close'), np.nan)
+        return pd.DataFrame(close.T, index=source.calendar, columns=source.tickers)
+    return pd.DataFrame({ticker: df['Close'] for ticker, df in source.items() if df is not None and not df.empty})
+
+
+class PanelSource(DataSource):
+    """Sumber data dari PanelStore; period dihitung relatif terhadap bar terakhir"""
+
+    def __init__(self, store):
+        self.store = store if isinstance(store, PanelStore) else PanelStore(store)
+
+    def fetch(self, ticker, period='ytd', interval='1d', start=None):
+        if interval != self.store.interval:
+            raise ValueError(f"Panel holds {self.store.interval} bars, not {interval}")
+        df = self.store.frame(ticker)
+        if df.empty:
+            return df
+        start = period_start(period, now=df.index[-1]) if start is None else start
+        if start is None:
+            return df
+        # Dipotong dengan iloc agar kolom tetap berupa view ke panel
+        index = df.index.tz_localize(None) if df.index.tz is not None else df.index
+        return df.iloc[index.searchsorted(_as_naive(start)):]
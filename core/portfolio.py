@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+
+from core import metrics
+from core.kernel import prefix_sums, window_sum
+from core.panel import closes
+
+# Baris per perkalian matriks; membatasi array sementara (baris x ticker)
+CHUNK = 256
+
+# Kolom ticker per blok untuk rolling_beta
+BLOCK = 256
+
+
+def returns(source):
+    """Return sederhana (waktu x ticker) yang diselaraskan per tanggal.
+
+    source berupa PanelStore, mapping ticker -> DataFrame OHLCV, atau
+    DataFrame close (waktu x ticker). Return bernilai NaN bila close hari
+    itu atau sebelumnya tidak ada (ticker belum listing, suspensi).
+    """
+    close = source if isinstance(source, pd.DataFrame) else closes(source)
+    values = close.to_numpy(dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[1:] = values[1:] / values[:-1] - 1.0
+    return pd.DataFrame(out, index=close.index, columns=close.columns)
+
+
+class RollingCovariance:
+    """Kovarians/korelasi bergulir seluruh pasangan ticker dengan update inkremental.
+
+    Menyimpan jumlah berpasangan dalam jendela (jumlah observasi, sum x,
+    sum x^2 dan sum x*y, masing-masing matriks ticker x ticker) dari baris
+    yang valid untuk kedua ticker, setara pandas rolling().cov()/corr()
+    berpasangan. update() menambah baris baru dan mengurangi baris yang
+    keluar jendela lewat perkalian matriks per blok CHUNK baris, sehingga
+    memori tetap O(ticker^2 + window x ticker) berapa pun panjang riwayat.
+    Jumlah dihitung ulang dari jendela tiap `window` baris agar galat
+    pembulatan dari penambahan/pengurangan berulang tidak menumpuk.
+    """
+
+    def __init__(self, tickers, window, min_periods=None):
+        self.tickers = list(tickers)
+        self.window = window
+        self.min_periods = window if min_periods is None else max(min_periods, 2)
+        size = len(self.tickers)
+        self._rows = np.empty((0, size))
+        self._sums = np.zeros((4, size, size))
+        self._since = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _accumulate(self, rows, signs):
+        """Menambah (sign +1) atau mengurangi (sign -1) baris ke jumlah berpasangan"""
+        size = len(self.tickers)
+        for lo in range(0, len(rows), CHUNK):
+            block, sign = rows[lo:lo + CHUNK], signs[lo:lo + CHUNK, None]
+            valid = ~np.isnan(block)
+            x = np.where(valid, block, 0.0)
+            weight = valid * sign
+            # count, sum x dan sum x^2 dalam satu perkalian: [valid, x, x^2]^T @ valid
+            self._sums[:3] += (np.hstack([valid, x, x * x]).T @ weight).reshape(3, size, size)
+            self._sums[3] += x.T @ (x * sign)
+
+    def update(self, rows):
+        """Menambah baris return (baris x ticker, NaN = tidak ada); baris terlama keluar jendela"""
+        rows = np.atleast_2d(np.asarray(rows, dtype=np.float64))
+        if rows.shape[1] != len(self.tickers):
+            raise ValueError(f"Expected {len(self.tickers)} columns, got {rows.shape[1]}")
+        if not len(rows):
+            return self
+        combined = np.concatenate([self._rows, rows])
+        leaving = combined[:max(len(combined) - self.window, 0)]
+        self._rows = combined[-self.window:]
+        self._since += len(rows)
+        if self._since >= self.window:
+            # Hitung ulang dari jendela (juga lebih murah bila rows lebih panjang dari jendela)
+            self._sums[:] = 0.0
+            self._accumulate(self._rows, np.ones(len(self._rows)))
+            self._since = 0
+        else:
+            self._accumulate(np.concatenate([rows, leaving]),
+                             np.concatenate([np.ones(len(rows)), -np.ones(len(leaving))]))
+        return self
+
+    def _moments(self):
+        count, sx, sxx, sxy = self._sums
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cross = sxy - sx * sx.T / count
+            square = np.maximum(sxx - sx * sx / count, 0.0)
+        enough = count >= self.min_periods
+        return count, cross, square, enough
+
+    def covariance(self):
+        """Matriks kovarians (ddof=1); NaN untuk pasangan dengan observasi < min_periods"""
+        count, cross, _, enough = self._moments()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(enough, cross / (count - 1), np.nan)
+
+    def correlation(self):
+        """Matriks korelasi; NaN bila observasi < min_periods atau variansi nol"""
+        _, cross, square, enough = self._moments()
+        scale = np.sqrt(square * square.T)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = np.clip(cross / scale, -1.0, 1.0)
+        return np.where(enough & (scale > 0), corr, np.nan)
+
+
+def _emissions(length, step, first):
+    """Posisi baris keluaran tiap `step` baris, diselaraskan agar baris terakhir ikut"""
+    positions = np.arange(length - 1, -1, -step)[::-1]
+    return positions[positions >= first]
+
+
+def rolling_matrices(source, window=252, step=21, kind='corr', min_periods=None):
+    """Matriks korelasi (kind='corr') atau kovarians ('cov') bergulir tiap `step` bar.
+
+    source berupa DataFrame return (lihat returns) atau sumber untuk
+    returns(). Menghasilkan (tanggal, DataFrame ticker x ticker) secara
+    berurutan sebagai generator, sehingga riwayat panjang tidak perlu
+    disimpan seluruhnya; tanggal terakhir selalu ikut.
+    """
+    if kind not in ('corr', 'cov'):
+        raise ValueError(f"Unknown kind: {kind!r} (expected 'corr' or 'cov')")
+    frame = source if isinstance(source, pd.DataFrame) else returns(source)
+    values = frame.to_numpy(dtype=np.float64)
+    engine = RollingCovariance(frame.columns, window, min_periods)
+    done = 0
+    for position in _emissions(len(values), step, engine.min_periods - 1):
+        # Baris yang sudah pasti keluar jendela tidak perlu ditambahkan
+        engine.update(values[max(done, position + 1 - window):position + 1])
+        done = position + 1
+        with metrics.span('correlation_matrix', kind=kind):
+            matrix = engine.correlation() if kind == 'corr' else engine.covariance()
+        yield frame.index[position], pd.DataFrame(matrix, index=frame.columns, columns=frame.columns)
+
+
+def mean_correlation(matrix):
+    """Rata-rata korelasi antar pasangan (tanpa diagonal, NaN diabaikan)"""
+    values = np.asarray(matrix, dtype=np.float64)
+    values = values[~np.eye(len(values), dtype=bool)]
+    values = values[~np.isnan(values)]
+    return float(values.mean()) if len(values) else float('nan')
+
+
+def rolling_beta(source, market=None, window=252, min_periods=None):
+    """Beta dan korelasi bergulir tiap ticker terhadap return indeks.
+
+    market berupa Series return indeks (mis. returns() dari ^JKSE) yang
+    diselaraskan ke tanggal source; bawaan rata-rata return universe
+    (bobot sama). Dihitung dengan prefix sum per blok BLOCK ticker, O(waktu
+    x ticker). Mengembalikan (beta, korelasi), keduanya DataFrame waktu x
+    ticker.
+    """
+    frame = source if isinstance(source, pd.DataFrame) else returns(source)
+    x = frame.to_numpy(dtype=np.float64)
+    if market is None:
+        with np.errstate(invalid='ignore'):
+            valid = ~np.isnan(x)
+            total = np.where(valid, x, 0.0).sum(axis=1)
+            index = np.where(valid.any(axis=1), total / np.maximum(valid.sum(axis=1), 1), np.nan)
+    else:
+        index = pd.Series(market).reindex(frame.index).to_numpy(dtype=np.float64)
+    min_periods = window if min_periods is None else max(min_periods, 2)
+
+    beta, corr = np.full(x.shape, np.nan), np.full(x.shape, np.nan)
+    for lo in range(0, x.shape[1], BLOCK):
+        block = x[:, lo:lo + BLOCK]
+        both = ~np.isnan(block) & ~np.isnan(index)[:, None]
+        xs = np.where(both, block, np.nan)
+        ms = np.where(both, index[:, None], np.nan)
+        sx, k = window_sum(prefix_sums(xs), window, min_periods)
+        sm = window_sum(prefix_sums(ms), window, min_periods)[0]
+        sxm = window_sum(prefix_sums(xs * ms), window, min_periods)[0]
+        sxx = window_sum(prefix_sums(xs * xs), window, min_periods)[0]
+        smm = window_sum(prefix_sums(ms * ms), window, min_periods)[0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cross = sxm - sx * sm / k
+            var_m = np.maximum(smm - sm * sm / k, 0.0)
+            var_x = np.maximum(sxx - sx * sx / k, 0.0)
+            beta[:, lo:lo + BLOCK] = np.where(var_m > 0, cross / var_m, np.nan)
+            scale = np.sqrt(var_x * var_m)
+            corr[:, lo:lo + BLOCK] = np.where(scale > 0, np.clip(cross / scale, -1.0, 1.0), np.nan)
+    return (pd.DataFrame(beta, index=frame.index, columns=frame.columns),
+            pd.DataFrame(corr, index=frame.index, columns=frame.columns))
@@ -0,0 +1,181 @@
+from dataclasses import dataclass, fields
+
+NAN = float('nan')
+
+
+@dataclass(slots=True)
+class TechnicalRecord:
+    """Hasil analisis teknikal satu ticker dalam bentuk angka mentah.
+
+    Kolom sinyal berisi label dari core.signals (*_LABELS) dan diperlakukan
+    sebagai kategori saat diekspor. Key levels diratakan menjadi tiga kolom.
+    """
+    ticker: str
+    price: float
+    trend: str
+    ma_status: str
+    macd_signal: str
+    rsi: float
+    rsi_signal: str
+    stochastic_signal: str
+    volume_signal: str
+    vwap_signal: str
+    support: float
+    resistance: float
+    fib_0: float
+    fib_236: float
+    fib_382: float
+    fib_50: float
+    fib_618: float
+    fib_100: float
+    upside_pct: float
+    downside_pct: float
+    entry_low: float
+    entry_high: float
+    target1: float
+    target2: float
+    stop_loss: float
+    support1: float = NAN
+    support2: float = NAN
+    support3: float = NAN
+    resistance1: float = NAN
+    resistance2: float = NAN
+    resistance3: float = NAN
+    trend_confirmed: bool = False
+    volatility: str = ''
+
+    @classmethod
+    def from_result(cls, result):
+        """Membuat record dari dict result StockAnalyzer/StreamingAnalyzer"""
+        fib = result['Fibonacci Levels']
+        summary = result['Indicators Summary']
+        entry_low, entry_high = result['Entry Zone']
+        support1, support2, support3 = _pad(result['Key Support Levels'])
+        resistance1, resistance2, resistance3 = _pad(result['Key Resistance Levels'])
+        return cls(
+            ticker=result['Ticker'],
+            price=float(result['Current Price']),
+            trend=result['Trend'],
+            ma_status=result['MA Status'],
+            macd_signal=result['MACD Signal'],
+            rsi=float(result['RSI (14)']),
+            rsi_signal=result['RSI Signal'],
+            stochastic_signal=result['Stochastic Signal'],
+            volume_signal=result['Volume Signal'],
+            vwap_signal=result['VWAP Signal'],
+            support=float(result['Support Level']),
+            resistance=float(result['Resistance Level']),
+            fib_0=float(fib['0%']),
+            fib_236=float(fib['23.6%']),
+            fib_382=float(fib['38.2%']),
+            fib_50=float(fib['50%']),
+            fib_618=float(fib['61.8%']),
+            fib_100=float(fib['100%']),
+            upside_pct=float(result['Potential Upside']),
+            downside_pct=float(result['Potential Downside']),
+            entry_low=float(entry_low),
+            entry_high=float(entry_high),
+            target1=float(result['Target 1']),
+            target2=float(result['Target 2']),
+            stop_loss=float(result['Stop Loss']),
+            support1=support1,
+            support2=support2,
+            support3=support3,
+            resistance1=resistance1,
+            resistance2=resistance2,
+            resistance3=resistance3,
+            trend_confirmed=summary['Trend Confirmation'] == "Confirmed",
+            volatility=summary['Volatility'],
+        )
+
+
+@dataclass(slots=True)
+class FundamentalRecord:
+    """Ringkasan fundamental dalam satuan Yahoo (lihat core.fundamental.summarize)"""
+    company: str | None = None
+    symbol: str | None = None
+    sector: str | None = None
+    industry: str | None = None
+    recommendation: str | None = None
+    market_cap: float = NAN
+    current_price: float = NAN
+    book_value: float = NAN
+    price_to_book: float = NAN
+    trailing_pe: float = NAN
+    forward_pe: float = NAN
+    trailing_eps: float = NAN
+    dividend_yield: float = NAN
+    dividend_rate: float = NAN
+    payout_ratio: float = NAN
+    roe: float = NAN
+    roa: float = NAN
+    debt_to_equity: float = NAN
+    current_ratio: float = NAN
+    quick_ratio: float = NAN
+    gross_margin: float = NAN
+    operating_margin: float = NAN
+    profit_margin: float = NAN
+    revenue: float = NAN
+    net_income: float = NAN
+    free_cash_flow: float = NAN
+    beta: float = NAN
+    high_52w: float = NAN
+    low_52w: float = NAN
+    annual_net_income: float = NAN
+    operating_cash_flow: float = NAN
+    shares_outstanding: float = NAN
+    total_assets: float = NAN
+
+    @classmethod
+    def from_summary(cls, summary):
+        """Membuat record dari dict core.fundamental.summarize"""
+        values = {}
+        for field in fields(cls):
+            value = summary.get(FUNDAMENTAL_KEYS[field.name])
+            if field.type is float:
+                value = NAN if value is None else float(value)
+            values[field.name] = value
+        return cls(**values)
+
+
+# Field FundamentalRecord -> kunci ringkasan core.fundamental.summarize
+FUNDAMENTAL_KEYS = {
+    'company': "Company",
+    'symbol': "Symbol",
+    'sector': "Sector",
+    'industry': "Industry",
+    'recommendation': "Recommendation",
+    'market_cap': "Market Cap",
+    'current_price': "Current Price",
+    'book_value': "Book Value per Share (BVPS)",
+    'price_to_book': "Price to Book Value (PBV)",
+    'trailing_pe': "Trailing P/E",
+    'forward_pe': "Forward P/E",
+    'trailing_eps': "EPS (TTM)",
+    'dividend_yield': "Dividend Yield",
+    'dividend_rate': "Dividend per Share",
+    'payout_ratio': "Payout Ratio",
+    'roe': "ROE",
+    'roa': "ROA",
+    'debt_to_equity': "Debt to Equity",
+    'current_ratio': "Current Ratio",
+    'quick_ratio': "Quick Ratio",
+    'gross_margin': "Gross Margin",
+    'operating_margin': "Operating Margin",
+    'profit_margin': "Profit Margin",
+    'revenue': "Revenue (TTM)",
+    'net_income': "Net Income (TTM)",
+    'free_cash_flow': "Free Cash Flow",
+    'beta': "Beta",
+    'high_52w': "52 Week High",
+    'low_52w': "52 Week Low",
+    'annual_net_income': "Trailing Annual Net Income",
+    'operating_cash_flow': "Operating Cash Flow",
+    'shares_outstanding': "Shares Outstanding",
+    'total_assets': "Total Assets",
+}
+
+
+def _pad(levels, size=3):
+    levels = [float(level) for level in levels[:size]]
+    return levels + [NAN] * (size - len(levels))
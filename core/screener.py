@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+
+from core import signals
+from core.expressions import validate
+from core.kernel import IndicatorKernel
+from core.panel import FIELDS
+
+# Bar terakhir per ticker yang dihitung: cukup untuk MA200 dan membuat
+# pengaruh nilai awal EMA (MACD, RSI Wilder) dapat diabaikan
+LOOKBACK = 500
+
+# Kolom sinyal tabel -> label kategori (kode dari fungsi *_codes di core.signals)
+LABELS = {
+    'trend': signals.TREND_LABELS,
+    'ma_status': signals.MA_STATUS_LABELS,
+    'macd_signal': signals.MACD_LABELS,
+    'rsi_signal': signals.RSI_LABELS,
+    'stochastic_signal': signals.STOCHASTIC_LABELS,
+    'volume_signal': signals.VOLUME_LABELS,
+    'vwap_signal': signals.VWAP_LABELS,
+    'volatility': signals.VOLATILITY_LABELS,
+}
+
+# Kolom tabel Screener.table() (nama yang boleh dipakai di where dan sort)
+COLUMNS = (
+    'price', 'change_pct', *LABELS, 'trend_confirmed', 'rsi', 'ma20', 'ma50', 'ma200', 'macd', 'macd_hist',
+    'stoch_k', 'stoch_d', 'atr', 'atr_pct', 'support', 'resistance', 'bars', 'last_bar',
+)
+
+# Kolom ringkas untuk tampilan teks
+SUMMARY = ('price', 'change_pct', 'trend', 'rsi', 'macd_signal', 'volume_signal', 'atr_pct', 'support', 'resistance')
+
+
+def _align(series, lookback):
+    """Matriks (waktu x ticker) dari deret per ticker, rata kanan menurut urutan bar"""
+    out = np.full((lookback, len(series)), np.nan)
+    for j, values in enumerate(series):
+        values = values[-lookback:]
+        out[lookback - len(values):, j] = values
+    return out
+
+
+class Screener:
+    """Screening satu universe sekaligus di atas matriks (waktu x ticker).
+
+    Tiap ticker diratakan ke kanan menurut urutan bar (bukan kalender),
+    sehingga baris terakhir adalah bar terakhir tiap ticker seperti pada
+    StockAnalyzer; ticker dengan riwayat lebih pendek berisi NaN di awal.
+    Indikator dihitung sekali untuk semua ticker lewat IndicatorKernel,
+    lalu disaring dan diurutkan secara deklaratif dengan screen().
+    windows mengganti jendela indikator (lihat core.kernel.WINDOWS).
+    """
+
+    def __init__(self, arrays, tickers, last_bar=None, bars=None, windows=None):
+        self.kernel = IndicatorKernel.from_arrays(arrays, windows)
+        self.tickers = list(tickers)
+        self.last_bar = last_bar
+        self.bars = bars
+        self._table = None
+
+    @classmethod
+    def from_frames(cls, frames, lookback=LOOKBACK, windows=None):
+        """Dari mapping ticker -> DataFrame OHLCV (frame kosong dilewati)"""
+        frames = {t: df for t, df in frames.items() if df is not None and not df.empty}
+        arrays = {
+            name: _align([df[name].to_numpy(dtype=np.float64) for df in frames.values()], lookback)
+            for name in FIELDS
+        }
+        last_bar = [df.index[-1] for df in frames.values()]
+        bars = np.array([min(len(df), lookback) for df in frames.values()])
+        return cls(arrays, frames, last_bar, bars, windows)
+
+    @classmethod
+    def from_panel(cls, store, tickers=None, lookback=LOOKBACK, windows=None):
+        """Dari PanelStore; hanya bar yang ada (mask) yang dipakai"""
+        tickers = list(tickers or store.tickers)
+        position = {ticker: i for i, ticker in enumerate(store.tickers)}
+        rows = [position[t] for t in tickers]
+        mask = store.mask
+        present = [np.flatnonzero(mask[row])[-lookback:] for row in rows]
+        keep = [j for j, cols in enumerate(present) if len(cols)]
+        arrays = {
+            name: _align([store.field(name)[rows[j], present[j]] for j in keep], lookback)
+            for name in FIELDS
+        }
+        calendar = store.calendar
+        last_bar = [calendar[present[j][-1]] for j in keep]
+        bars = np.array([len(present[j]) for j in keep])
+        return cls(arrays, [tickers[j] for j in keep], last_bar, bars, windows)
+
+    def table(self):
+        """Nilai bar terakhir dan sinyal tiap ticker (satu baris per ticker)"""
+        if self._table is not None:
+            return self._table
+
+        k = self.kernel
+        last = {name: k.column(name)[-1] for name in (
+            'MA20', 'MA50', 'MA200', 'RSI', 'RSI_MA', 'MACD', 'MACD_signal', 'MACD_hist',
+            'Stoch_%K', 'Stoch_%D', 'ATR', 'VWAP', 'OBV', 'OBV_MA',
+        )}
+        close = k.array('Close')
+        price = close[-1]
+        codes = {
+            'trend': signals.trend_codes(price, last['MA20'], last['MA50'], last['MA200']),
+            'ma_status': signals.ma_status_codes(price, last['MA20'], last['MA50'], last['MA200']),
+            'macd_signal': signals.macd_codes(last['MACD'], last['MACD_signal']),
+            'rsi_signal': signals.rsi_codes(last['RSI'], last['RSI_MA']),
+            'stochastic_signal': signals.stochastic_codes(last['Stoch_%K'], last['Stoch_%D']),
+            'volume_signal': signals.volume_codes(last['OBV'], last['OBV_MA']),
+            'vwap_signal': signals.vwap_codes(price, last['VWAP']),
+            'volatility': signals.volatility_codes(last['ATR'], price),
+        }
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            columns = {
+                'price': price,
+                'change_pct': (price / close[-2] - 1) * 100 if len(close) > 1 else np.full(price.shape, np.nan),
+                **{name: pd.Categorical.from_codes(c, LABELS[name]) for name, c in codes.items()},
+                'trend_confirmed': signals.trend_confirmed_codes(
+                    codes['trend'], codes['macd_signal'], codes['rsi_signal']
+                ),
+                'rsi': last['RSI'],
+                'ma20': last['MA20'],
+                'ma50': last['MA50'],
+                'ma200': last['MA200'],
+                'macd': last['MACD'],
+                'macd_hist': last['MACD_hist'],
+                'stoch_k': last['Stoch_%K'],
+                'stoch_d': last['Stoch_%D'],
+                'atr': last['ATR'],
+                'atr_pct': last['ATR'] / price * 100,
+                'support': k.lowest('Close', k.windows['support'])[-1],
+                'resistance': k.highest('Close', k.windows['support'])[-1],
+                'bars': self.bars,
+                'last_bar': self.last_bar,
+            }
+        self._table = pd.DataFrame(columns, index=pd.Index(self.tickers, name='ticker'))
+        return self._table
+
+    def screen(self, where=None, sort=None, ascending=False, limit=None):
+        """Menyaring dan mengurutkan tabel.
+
+        where: ekspresi DataFrame.query atas kolom tabel, mis. "trend ==
+        'Strong Uptrend' and rsi < 60" (diperiksa dengan
+        core.expressions.validate sebelum dijalankan; ValueError bila tidak
+        valid), atau fungsi tabel -> mask boolean. sort: nama kolom (atau
+        daftar kolom), default menurun.
+        """
+        table = self.table()
+        if callable(where):
+            table = table[where(table)]
+        elif where is not None:
+            validate(where, table.columns)
+            table = table.query(where)
+        if sort is not None:
+            table = table.sort_values(sort, ascending=ascending, na_position='last')
+        return table.head(limit) if limit else table
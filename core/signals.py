@@ -0,0 +1,362 @@
+import numpy as np
+
+from core.kernel import rolling_max, rolling_min
+
+
+def trend_signal(close, ma20, ma50, ma200):
+    """Klasifikasi tren dari posisi harga terhadap MA20/50/200"""
+    price_above_ma200 = close > ma200
+    ma20_above_ma50 = ma20 > ma50
+    ma50_above_ma200 = ma50 > ma200
+
+    return "Strong Uptrend" if (price_above_ma200 and ma20_above_ma50 and ma50_above_ma200) else \
+           "Uptrend" if (price_above_ma200 and ma50_above_ma200) else \
+           "Downtrend" if (close < ma50 and ma50 < ma200) else \
+           "Strong Downtrend" if (close < ma200 and ma20 < ma50 and ma50 < ma200) else \
+           "Sideways/Rebound"
+
+
+def ma_status_signal(close, ma20, ma50, ma200):
+    """Klasifikasi susunan moving average"""
+    return "Bullish (Price > MA20 > MA50 > MA200)" if close > ma20 > ma50 > ma200 else \
+           "Bearish (Price < MA20 < MA50 < MA200)" if close < ma20 < ma50 < ma200 else \
+           "Bullish Crossover (Price > MA20 > MA50)" if close > ma20 > ma50 else \
+           "Bearish Crossover (Price < MA20 < MA50)" if close < ma20 < ma50 else \
+           "Mixed Signals (Watch for confirmation)"
+
+
+def macd_signal(macd, signal):
+    """Klasifikasi MACD terhadap garis sinyal"""
+    return "Bullish (MACD > Signal)" if macd > signal else \
+           "Bearish (MACD < Signal)" if macd < signal else \
+           "Neutral (MACD = Signal)"
+
+
+def rsi_signal(rsi, rsi_ma):
+    """Klasifikasi RSI terhadap batas 70/30 dan MA-nya"""
+    return "Overbought (RSI > 70)" if rsi > 70 else \
+           "Oversold (RSI < 30)" if rsi < 30 else \
+           "Bullish (RSI > MA)" if rsi > rsi_ma else \
+           "Bearish (RSI < MA)" if rsi < rsi_ma else \
+           "Neutral"
+
+
+def stochastic_signal(k, d):
+    """Klasifikasi Stochastic %K/%D"""
+    return "Overbought (%K > 80)" if k > 80 else \
+           "Oversold (%K < 20)" if k < 20 else \
+           "Bullish Cross (%K > %D)" if k > d else \
+           "Bearish Cross (%K < %D)" if k < d else \
+           "Neutral"
+
+
+def volume_signal(obv, obv_ma):
+    """Klasifikasi OBV terhadap MA-nya"""
+    return "Bullish (OBV > MA)" if obv > obv_ma else \
+           "Bearish (OBV < MA)" if obv < obv_ma else \
+           "Neutral Volume"
+
+
+def vwap_signal(close, vwap):
+    """Klasifikasi harga terhadap VWAP"""
+    return "Bullish (Price > VWAP)" if close > vwap else \
+           "Bearish (Price < VWAP)" if close < vwap else \
+           "Neutral (Price ≈ VWAP)"
+
+
+def ichimoku_signal(close, span_a, span_b, tenkan, kijun):
+    """Klasifikasi harga terhadap awan Ichimoku"""
+    return "Strong Bullish (Price above cloud, Tenkan > Kijun)" if (close > span_a) and (close > span_b) and (tenkan > kijun) else \
+           "Bullish (Price above cloud)" if (close > span_a) and (close > span_b) else \
+           "Strong Bearish (Price below cloud, Tenkan < Kijun)" if (close < span_a) and (close < span_b) and (tenkan < kijun) else \
+           "Bearish (Price below cloud)" if (close < span_a) and (close < span_b) else \
+           "Neutral (Price in cloud)"
+
+
+def volatility_label(atr, close):
+    """Klasifikasi volatilitas dari ATR relatif terhadap harga"""
+    return "High" if atr > (0.02 * close) else "Medium" if atr > (0.01 * close) else "Low"
+
+
+def trend_confirmed(trend, macd, rsi):
+    """Tren terkonfirmasi jika MACD dan RSI searah dengan tren"""
+    return (
+        (trend.startswith("Uptrend") and
+         macd.startswith("Bullish") and
+         rsi.startswith("Bullish")) or
+        (trend.startswith("Downtrend") and
+         macd.startswith("Bearish") and
+         rsi.startswith("Bearish"))
+    )
+
+
+def timeframe_alignment(trends):
+    """Keselarasan label tren beberapa timeframe"""
+    return "Aligned Uptrend" if all(t in ("Strong Uptrend", "Uptrend") for t in trends) else \
+           "Aligned Downtrend" if all(t in ("Downtrend", "Strong Downtrend") for t in trends) else \
+           "Mixed"
+
+
+def fibonacci_levels(recent_low, recent_high):
+    """Level Fibonacci retracement dari rentang low/high"""
+    return {
+        '0%': recent_high,
+        '23.6%': recent_high - (recent_high - recent_low) * 0.236,
+        '38.2%': recent_high - (recent_high - recent_low) * 0.382,
+        '50%': recent_high - (recent_high - recent_low) * 0.5,
+        '61.8%': recent_high - (recent_high - recent_low) * 0.618,
+        '100%': recent_low
+    }
+
+
+def consolidated_areas(high, low, close, last_close):
+    """Rata-rata harga zona konsolidasi 5 bar dalam 19 bar terakhir.
+
+    Array berisi bar terakhir (maksimal 19); jendela diurutkan dari yang
+    terbaru ke yang terlama seperti pemindaian semula.
+    """
+    high, low, close = np.asarray(high, dtype=np.float64), np.asarray(low, dtype=np.float64), np.asarray(close, dtype=np.float64)
+    if len(close) < 5:
+        return []
+    # Jendela 5 bar sebagai 5 irisan bergeser: murah untuk array sependek ini
+    m = len(close) - 4
+    range_pct = (np.max([high[i:i + m] for i in range(5)], axis=0) - np.min([low[i:i + m] for i in range(5)], axis=0)) / last_close
+    means = np.sum([close[i:i + m] for i in range(5)], axis=0) / 5
+    return list(means[::-1][range_pct[::-1] < 0.015 * last_close])
+
+
+def consolidation_zones(high, low, close, window=5, threshold=0.015):
+    """Mendeteksi zona konsolidasi di seluruh riwayat secara vektor.
+
+    Jendela `window` bar dianggap konsolidasi jika (high - low) kurang dari
+    threshold x close terakhir jendela. Jendela berurutan yang memenuhi
+    digabung menjadi satu zona. Mengembalikan dict array per zona: indeks
+    bar awal/akhir, batas bawah/atas dan rata-rata close.
+    """
+    high, low, close = np.asarray(high, dtype=np.float64), np.asarray(low, dtype=np.float64), np.asarray(close, dtype=np.float64)
+    highs, lows = rolling_max(high, window), rolling_min(low, window)
+    with np.errstate(invalid='ignore'):
+        mask = (highs - lows) < threshold * close
+
+    # Run jendela berurutan digabung; zona mencakup awal jendela pertama s.d. akhir jendela terakhir
+    edges = np.diff(np.concatenate([[0], mask.view(np.int8), [0]]))
+    run_start = np.flatnonzero(edges == 1)
+    run_end = np.flatnonzero(edges == -1) - 1
+    if len(run_start) == 0:
+        empty = np.array([], dtype=np.int64)
+        return {'start': empty, 'end': empty, 'low': np.array([]), 'high': np.array([]), 'mean': np.array([])}
+
+    # Segmen [run_start, run_end] disisipi celah, sentinel di akhir untuk run yang berakhir di bar terakhir
+    bounds = np.column_stack([run_start, run_end + 1]).ravel()
+    start = run_start - (window - 1)
+    cumsum = np.concatenate([[0.0], np.cumsum(close)])
+    return {
+        'start': start,
+        'end': run_end,
+        'low': np.minimum.reduceat(np.append(lows, np.nan), bounds)[::2],
+        'high': np.maximum.reduceat(np.append(highs, np.nan), bounds)[::2],
+        'mean': (cumsum[run_end + 1] - cumsum[start]) / (run_end - start + 1),
+    }
+
+
+def risk_reward(last_close, last_atr, fib, recent_low, recent_high, consolidated, recent_lows):
+    """Menyusun entry, target, stop loss dan level kunci (angka mentah).
+
+    Potential Upside/Downside dalam persen; Entry Zone berupa (low, high).
+    Pembulatan dan teks diserahkan ke report.printer.
+    """
+    all_levels = [
+        fib['23.6%'],
+        fib['38.2%'],
+        fib['50%'],
+        fib['61.8%'],
+        recent_low,
+        recent_high,
+        *consolidated
+    ]
+
+    support_levels = sorted([lvl for lvl in all_levels if lvl < last_close], reverse=True)
+    resistance_levels = sorted([lvl for lvl in all_levels if lvl > last_close])
+
+    atr_multiplier = 1.5 if (last_atr/last_close) < 0.02 else 2.0
+
+    entry_low = min(recent_lows) - (0.5 * last_atr)
+    entry_high = max(min(recent_lows) + (0.5 * last_atr), last_close - (0.3 * last_atr))
+
+    if resistance_levels:
+        target1 = resistance_levels[0]
+        if len(resistance_levels) > 1:
+            target2 = resistance_levels[1]
+        else:
+            target2 = target1 + (2 * last_atr)
+    else:
+        target1 = last_close + (atr_multiplier * last_atr)
+        target2 = last_close + (2 * atr_multiplier * last_atr)
+
+    if support_levels:
+        stop_loss = min(support_levels[0] - (0.5 * last_atr), last_close - (atr_multiplier * last_atr))
+    else:
+        stop_loss = last_close - (atr_multiplier * last_atr)
+
+    return {
+        'Potential Upside': ((target1 - last_close) / last_close) * 100,
+        'Potential Downside': ((last_close - stop_loss) / last_close) * 100,
+        'Entry Zone': (entry_low, entry_high),
+        'Target 1': target1,
+        'Target 2': target2,
+        'Stop Loss': stop_loss,
+        'Key Support Levels': support_levels[:3],
+        'Key Resistance Levels': resistance_levels[:3],
+    }
+
+
+# Versi vektor: setiap fungsi *_codes mengembalikan kode int8 per bar yang
+# menunjuk ke tuple label di bawah, dengan urutan kondisi yang sama persis
+# dengan fungsi skalar di atas (perbandingan dengan NaN bernilai False).
+
+TREND_LABELS = ("Strong Uptrend", "Uptrend", "Downtrend", "Strong Downtrend", "Sideways/Rebound")
+MA_STATUS_LABELS = (
+    "Bullish (Price > MA20 > MA50 > MA200)",
+    "Bearish (Price < MA20 < MA50 < MA200)",
+    "Bullish Crossover (Price > MA20 > MA50)",
+    "Bearish Crossover (Price < MA20 < MA50)",
+    "Mixed Signals (Watch for confirmation)",
+)
+MACD_LABELS = ("Bullish (MACD > Signal)", "Bearish (MACD < Signal)", "Neutral (MACD = Signal)")
+RSI_LABELS = ("Overbought (RSI > 70)", "Oversold (RSI < 30)", "Bullish (RSI > MA)", "Bearish (RSI < MA)", "Neutral")
+STOCHASTIC_LABELS = ("Overbought (%K > 80)", "Oversold (%K < 20)", "Bullish Cross (%K > %D)", "Bearish Cross (%K < %D)", "Neutral")
+VOLUME_LABELS = ("Bullish (OBV > MA)", "Bearish (OBV < MA)", "Neutral Volume")
+VWAP_LABELS = ("Bullish (Price > VWAP)", "Bearish (Price < VWAP)", "Neutral (Price ≈ VWAP)")
+ICHIMOKU_LABELS = (
+    "Strong Bullish (Price above cloud, Tenkan > Kijun)",
+    "Bullish (Price above cloud)",
+    "Strong Bearish (Price below cloud, Tenkan < Kijun)",
+    "Bearish (Price below cloud)",
+    "Neutral (Price in cloud)",
+)
+VOLATILITY_LABELS = ("High", "Medium", "Low")
+
+
+def _select(conditions):
+    with np.errstate(invalid='ignore'):
+        conds = [np.asarray(c) for c in conditions]
+    return np.select(conds, np.arange(len(conds), dtype=np.int8), default=len(conds)).astype(np.int8)
+
+
+def trend_codes(close, ma20, ma50, ma200):
+    with np.errstate(invalid='ignore'):
+        return _select([
+            (close > ma200) & (ma20 > ma50) & (ma50 > ma200),
+            (close > ma200) & (ma50 > ma200),
+            (close < ma50) & (ma50 < ma200),
+            (close < ma200) & (ma20 < ma50) & (ma50 < ma200),
+        ])
+
+
+def ma_status_codes(close, ma20, ma50, ma200):
+    with np.errstate(invalid='ignore'):
+        return _select([
+            (close > ma20) & (ma20 > ma50) & (ma50 > ma200),
+            (close < ma20) & (ma20 < ma50) & (ma50 < ma200),
+            (close > ma20) & (ma20 > ma50),
+            (close < ma20) & (ma20 < ma50),
+        ])
+
+
+def macd_codes(macd, signal):
+    with np.errstate(invalid='ignore'):
+        return _select([macd > signal, macd < signal])
+
+
+def rsi_codes(rsi, rsi_ma):
+    with np.errstate(invalid='ignore'):
+        return _select([rsi > 70, rsi < 30, rsi > rsi_ma, rsi < rsi_ma])
+
+
+def stochastic_codes(k, d):
+    with np.errstate(invalid='ignore'):
+        return _select([k > 80, k < 20, k > d, k < d])
+
+
+def volume_codes(obv, obv_ma):
+    with np.errstate(invalid='ignore'):
+        return _select([obv > obv_ma, obv < obv_ma])
+
+
+def vwap_codes(close, vwap):
+    with np.errstate(invalid='ignore'):
+        return _select([close > vwap, close < vwap])
+
+
+def ichimoku_codes(close, span_a, span_b, tenkan, kijun):
+    with np.errstate(invalid='ignore'):
+        above = (close > span_a) & (close > span_b)
+        below = (close < span_a) & (close < span_b)
+        return _select([above & (tenkan > kijun), above, below & (tenkan < kijun), below])
+
+
+def volatility_codes(atr, close):
+    with np.errstate(invalid='ignore'):
+        return _select([atr > 0.02 * close, atr > 0.01 * close])
+
+
+def trend_confirmed_codes(trend, macd, rsi):
+    """Versi vektor trend_confirmed dari kode trend/MACD/RSI"""
+    up = (trend == TREND_LABELS.index("Uptrend")) & (macd == 0) & (rsi == RSI_LABELS.index("Bullish (RSI > MA)"))
+    down = (trend == TREND_LABELS.index("Downtrend")) & (macd == 1) & (rsi == RSI_LABELS.index("Bearish (RSI < MA)"))
+    return up | down
+
+
+def risk_reward_levels(close, atr, high, low, close_min50, close_max50, low_min20, high_max20, low_min5):
+    """Versi vektor risk_reward untuk setiap bar sekaligus.
+
+    Semua argumen adalah array per bar; rolling extrema dihitung oleh
+    pemanggil. Level kandidat (Fibonacci, low/high 20 bar dan zona
+    konsolidasi) disusun sebagai matriks bar x level lalu support dan
+    resistance terdekat dipilih per baris.
+    """
+    n = len(close)
+    span = close_max50 - close_min50
+    fib = [close_max50 - span * ratio for ratio in (0.236, 0.382, 0.5, 0.618)]
+
+    # Zona konsolidasi: jendela 5 bar yang berakhir 0..14 bar sebelum bar ini
+    high5 = np.full(n, np.nan)
+    low5 = np.full(n, np.nan)
+    mean5 = np.full(n, np.nan)
+    if n >= 5:
+        view = np.lib.stride_tricks.sliding_window_view
+        high5[4:] = view(high, 5).max(axis=-1)
+        low5[4:] = view(low, 5).min(axis=-1)
+        mean5[4:] = view(close, 5).sum(axis=-1) / 5
+    areas = []
+    with np.errstate(invalid='ignore'):
+        for lag in range(15):
+            h, l, m = (np.concatenate([np.full(min(lag, n), np.nan), a[:max(n - lag, 0)]]) for a in (high5, low5, mean5))
+            areas.append(np.where((h - l) / close < 0.015 * close, m, np.nan))
+
+    levels = np.column_stack(fib + [low_min20, high_max20] + areas)
+    with np.errstate(invalid='ignore'):
+        below = np.where(levels < close[:, None], levels, -np.inf)
+        above = np.sort(np.where(levels > close[:, None], levels, np.inf), axis=1)
+        support = below.max(axis=1)
+        r1, r2 = above[:, 0], above[:, 1]
+
+        atr_multiplier = np.where(atr / close < 0.02, 1.5, 2.0)
+        has_r1, has_r2, has_s = np.isfinite(r1), np.isfinite(r2), np.isfinite(support)
+
+        target1 = np.where(has_r1, r1, close + atr_multiplier * atr)
+        target2 = np.where(has_r2, r2, np.where(has_r1, r1 + 2 * atr, close + 2 * atr_multiplier * atr))
+        fallback_stop = close - atr_multiplier * atr
+        stop_loss = np.where(has_s, np.minimum(support - 0.5 * atr, fallback_stop), fallback_stop)
+
+    recent_low = np.full(n, np.nan)
+    if n >= 5:
+        recent_low[4:] = view(low_min5, 5).min(axis=-1)
+
+    return {
+        'Entry Low': recent_low - 0.5 * atr,
+        'Entry High': np.maximum(recent_low + 0.5 * atr, close - 0.3 * atr),
+        'Target 1': target1,
+        'Target 2': target2,
+        'Stop Loss': stop_loss,
+    }
@@ -0,0 +1,268 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.data import _as_naive
+from core.fundamental import STATEMENTS, FundamentalFetcher
+
+# Payload laporan -> (jenis laporan, frekuensi: A tahunan, Q kuartalan)
+SOURCES = {
+    'financials': ('income', 'A'),
+    'quarterly_financials': ('income', 'Q'),
+    'balance_sheet': ('balance', 'A'),
+    'quarterly_balance_sheet': ('balance', 'Q'),
+    'cashflow': ('cashflow', 'A'),
+    'quarterly_cashflow': ('cashflow', 'Q'),
+}
+
+# Kolom tabel -> (jenis laporan, nama baris Yahoo yang dicoba berurutan)
+ITEMS = {
+    'revenue': ('income', ('Total Revenue', 'Operating Revenue')),
+    'gross_profit': ('income', ('Gross Profit',)),
+    'operating_income': ('income', ('Operating Income', 'EBIT')),
+    'net_income': ('income', ('Net Income Common Stockholders', 'Net Income')),
+    'total_assets': ('balance', ('Total Assets',)),
+    'equity': ('balance', ('Stockholders Equity', 'Common Stock Equity')),
+    'total_debt': ('balance', ('Total Debt',)),
+    'current_assets': ('balance', ('Current Assets',)),
+    'current_liabilities': ('balance', ('Current Liabilities',)),
+    'shares': ('balance', ('Ordinary Shares Number', 'Share Issued')),
+    'operating_cash_flow': ('cashflow', ('Operating Cash Flow',)),
+    'free_cash_flow': ('cashflow', ('Free Cash Flow',)),
+}
+
+# Item arus (laba rugi, arus kas) dijumlahkan 4 kuartal untuk TTM; item neraca tidak
+FLOWS = tuple(column for column, (kind, _) in ITEMS.items() if kind != 'balance')
+
+COLUMNS = ('ticker', 'frequency', 'period_end', *ITEMS)
+
+RATIOS = (
+    'roe', 'roa', 'gross_margin', 'operating_margin', 'net_margin', 'fcf_margin', 'debt_to_equity',
+    'current_ratio', 'revenue_growth', 'earnings_growth', 'eps', 'bvps',
+)
+
+# Perkiraan jeda (hari) dari akhir periode sampai laporan terbit, agar
+# rasio tidak dipakai sebelum tersedia (batas publikasi BEI: kuartalan
+# 1-3 bulan, tahunan 3 bulan)
+LAG = {'Q': 60, 'A': 90}
+
+# Jarak hari antar periode berurutan dan toleransinya
+PERIOD_DAYS = {'Q': 91, 'A': 365}
+TOLERANCE_DAYS = 40
+
+
+def _blocks(ticker, payloads):
+    """(ticker, frekuensi, akhir periode, matriks periode x ITEMS) per frekuensi dari payload Yahoo"""
+    for frequency in ('A', 'Q'):
+        statements = []
+        for field, (kind, field_frequency) in SOURCES.items():
+            statement = payloads.get(field)
+            if field_frequency == frequency and statement is not None and not statement.empty:
+                stamps = np.asarray(statement.columns, dtype='datetime64[ns]')
+                statements.append((kind, statement, stamps))
+        if not statements:
+            continue
+        periods = np.unique(np.concatenate([stamps for *_, stamps in statements]))
+        values = np.full((len(periods), len(ITEMS)), np.nan)
+        for kind, statement, stamps in statements:
+            columns = np.searchsorted(periods, stamps)
+            rows = {name: i for i, name in enumerate(statement.index.tolist())}
+            data = statement.to_numpy()
+            for j, (item_kind, names) in enumerate(ITEMS.values()):
+                row = next((rows[n] for n in names if n in rows), None) if item_kind == kind else None
+                if row is not None:
+                    values[columns, j] = pd.to_numeric(data[row], errors='coerce')
+        yield ticker, frequency, periods, values
+
+
+def statement_table(payloads):
+    """Tabel laporan satu universe (satu baris per ticker x frekuensi x akhir periode) dari mapping ticker -> payload Yahoo"""
+    blocks = [block for ticker, data in payloads.items() for block in _blocks(ticker, data)]
+    if not blocks:
+        return pd.DataFrame(columns=list(COLUMNS))
+    sizes = [len(periods) for _, _, periods, _ in blocks]
+    table = pd.DataFrame(np.concatenate([values for *_, values in blocks]), columns=list(ITEMS))
+    table.insert(0, 'ticker', np.repeat([ticker for ticker, *_ in blocks], sizes))
+    table.insert(1, 'frequency', np.repeat([frequency for _, frequency, *_ in blocks], sizes))
+    table.insert(2, 'period_end', np.concatenate([periods for _, _, periods, _ in blocks]))
+    return table.sort_values(['ticker', 'frequency', 'period_end'], ignore_index=True)
+
+
+def collect_statements(tickers, fetcher=None, max_workers=8):
+    """Tabel laporan untuk banyak ticker lewat FundamentalFetcher (cache yang sama).
+
+    Mengembalikan (tabel, error per ticker sebagai {'error': ...}).
+    """
+    fetcher = fetcher or FundamentalFetcher(fields=STATEMENTS)
+    payloads, errors = {}, {}
+    for ticker, data in fetcher.fetch_many(tickers, max_workers=max_workers):
+        if isinstance(data, Exception):
+            errors[ticker] = {'error': f"{type(data).__name__}: {data}"}
+        else:
+            payloads[ticker] = data
+    return statement_table(payloads), errors
+
+
+class StatementStore:
+    """Tabel laporan keuangan satu universe di disk (satu file Parquet kolumnar).
+
+    Riwayat disimpan kumulatif: Yahoo hanya memberi beberapa periode
+    terakhir, sehingga periode lama tetap ada setelah update, sedangkan
+    periode yang sama ditimpa dengan data terbaru (mis. restatement).
+    """
+
+    def __init__(self, root='.cache/statements'):
+        self.root = root
+        self.path = os.path.join(root, 'statements.parquet')
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return pd.DataFrame(columns=list(COLUMNS))
+        return pd.read_parquet(self.path)
+
+    def store(self, table):
+        """Menulis tabel secara atomik"""
+        os.makedirs(self.root, exist_ok=True)
+        table.to_parquet(self.path + '.tmp', index=False)
+        os.replace(self.path + '.tmp', self.path)
+
+    def merge(self, table):
+        """Menggabungkan tabel baru ke tabel tersimpan; mengembalikan hasil gabungan"""
+        current = self.load()
+        merged = table if current.empty else pd.concat([current, table], ignore_index=True)
+        merged = merged.drop_duplicates(['ticker', 'frequency', 'period_end'], keep='last')
+        merged = merged.sort_values(['ticker', 'frequency', 'period_end'], ignore_index=True)
+        self.store(merged)
+        return merged
+
+    def update(self, tickers, fetcher=None, max_workers=8):
+        """Mengambil laporan (lewat cache fundamental) lalu menggabungkannya; mengembalikan (tabel, error)"""
+        table, errors = collect_statements(tickers, fetcher, max_workers)
+        return self.merge(table), errors
+
+
+def _ratio(numerator, denominator):
+    """numerator / denominator, NaN jika penyebut tidak positif"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def ratios(table, frequency='Q', lag=None):
+    """Deret rasio fundamental semua ticker dalam satu tabel panjang.
+
+    Dihitung sekaligus dengan operasi array di atas tabel yang diurutkan
+    per ticker; nilai periode sebelumnya diambil dengan pergeseran indeks
+    dan hanya dipakai jika milik ticker yang sama dan berjarak tepat k
+    periode. Untuk frequency='Q' item arus berupa TTM (jumlah 4 kuartal
+    berurutan), pertumbuhan adalah year-on-year (kuartal yang sama tahun
+    sebelumnya). Rasio bernilai mentah (ROE 0.12, debt_to_equity 0.8).
+    Kolom available = period_end + lag hari (bawaan LAG).
+    """
+    data = table[table['frequency'] == frequency].sort_values(['ticker', 'period_end'], ignore_index=True)
+    codes = pd.factorize(data['ticker'])[0]
+    days = data['period_end'].to_numpy(dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+    year = 4 if frequency == 'Q' else 1
+
+    def previous(values, k):
+        """values[i - k] jika baris itu ticker yang sama dan tepat k periode sebelumnya"""
+        out = np.full(len(values), np.nan)
+        if k < len(values):
+            gap = days[k:] - days[:-k]
+            valid = (codes[k:] == codes[:-k]) & (np.abs(gap - k * PERIOD_DAYS[frequency]) <= TOLERANCE_DAYS)
+            out[k:] = np.where(valid, values[:-k], np.nan)
+        return out
+
+    item = {column: data[column].to_numpy(dtype=np.float64) for column in ITEMS}
+    if frequency == 'Q':
+        for column in FLOWS:
+            item[column] = item[column] + sum(previous(item[column], k) for k in range(1, 4))
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        revenue_before = previous(data['revenue'].to_numpy(dtype=np.float64), year)
+        earnings = data['net_income'].to_numpy(dtype=np.float64)
+        earnings_before = previous(earnings, year)
+        out = pd.DataFrame({
+            'ticker': data['ticker'],
+            'period_end': data['period_end'],
+            'available': data['period_end'] + pd.Timedelta(days=(lag if lag is not None else LAG[frequency])),
+            'roe': _ratio(item['net_income'], item['equity']),
+            'roa': _ratio(item['net_income'], item['total_assets']),
+            'gross_margin': _ratio(item['gross_profit'], item['revenue']),
+            'operating_margin': _ratio(item['operating_income'], item['revenue']),
+            'net_margin': _ratio(item['net_income'], item['revenue']),
+            'fcf_margin': _ratio(item['free_cash_flow'], item['revenue']),
+            'debt_to_equity': _ratio(item['total_debt'], item['equity']),
+            'current_ratio': _ratio(item['current_assets'], item['current_liabilities']),
+            'revenue_growth': _ratio(data['revenue'].to_numpy(dtype=np.float64), revenue_before) - 1,
+            'earnings_growth': np.where(earnings_before != 0, (earnings - earnings_before) / np.abs(earnings_before),
+                                        np.nan),
+            'eps': _ratio(item['net_income'], item['shares']),
+            'bvps': _ratio(item['equity'], item['shares']),
+        })
+    return out
+
+
+def _stamps(index):
+    """Timestamp int64 (ns) waktu lokal; zona waktu dibuang tanpa konversi"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.as_unit('ns').asi8
+
+
+def as_of(table, columns, calendar, tickers=None):
+    """Matriks (waktu x ticker) per kolom: nilai periode terakhir yang sudah tersedia pada tiap tanggal.
+
+    Semua ticker diselaraskan dengan satu searchsorted atas kunci
+    (ticker, peringkat tanggal available), tanpa loop per ticker.
+    Mengembalikan dict kolom -> DataFrame.
+    """
+    tickers = list(pd.unique(table['ticker'])) if tickers is None else list(tickers)
+    calendar = pd.DatetimeIndex(calendar)
+    codes = pd.Categorical(table['ticker'], categories=tickers).codes.astype(np.int64)
+    rows = np.flatnonzero(codes >= 0)
+    available = _stamps(table['available'].iloc[rows])
+    dates = _stamps(calendar)
+
+    _, rank = np.unique(np.concatenate([available, dates]), return_inverse=True)
+    size = rank.max() + 1 if len(rank) else 1
+    keys = codes[rows] * size + rank[:len(rows)]
+    # Pada available yang sama periode terakhir menang
+    period = _stamps(table['period_end'].iloc[rows])
+    order = np.lexsort((period, keys))
+    keys, rows = keys[order], rows[order]
+
+    query = rank[len(available):, None] + np.arange(len(tickers))[None, :] * size
+    position = np.searchsorted(keys, query, side='right') - 1
+    found = (position >= 0) & (keys[np.maximum(position, 0)] // size == np.arange(len(tickers))[None, :])
+    picked = rows[np.maximum(position, 0)] if len(rows) else np.zeros(query.shape, dtype=np.int64)
+
+    out = {}
+    for column in columns:
+        values = table[column].to_numpy(dtype=np.float64)
+        matrix = np.where(found, values[picked], np.nan) if len(rows) else np.full(query.shape, np.nan)
+        out[column] = pd.DataFrame(matrix, index=calendar, columns=tickers)
+    return out
+
+
+def valuation(table, close):
+    """Deret PE, PBV dan earnings yield (waktu x ticker) dari tabel ratios() dan matriks close (core.panel.closes).
+
+    Tiap tanggal memakai EPS TTM dan BVPS periode terakhir yang sudah
+    tersedia (kolom available); PE dan PBV NaN jika EPS/BVPS tidak positif.
+    """
+    values = as_of(table, ('eps', 'bvps'), close.index, close.columns)
+    eps, bvps = values['eps'], values['bvps']
+    return {
+        'pe': close / eps.where(eps > 0),
+        'pbv': close / bvps.where(bvps > 0),
+        'earnings_yield': eps / close,
+    }
+
+
+def cross_section(table, date=None):
+    """Rasio terakhir yang sudah tersedia per ticker pada `date` (bawaan: semua), untuk ranking satu bursa"""
+    if date is not None:
+        table = table[table['available'] <= _as_naive(date)]
+    return table.sort_values(['ticker', 'period_end']).groupby('ticker').tail(1).set_index('ticker')
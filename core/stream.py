@@ -0,0 +1,413 @@
+import math
+
+from collections import deque
+
+import numpy as np
+
+from core import signals
+from core.kernel import COLUMNS, IndicatorKernel, ema, resolve_windows
+
+NAN = float('nan')
+
+
+class RollingMean:
+    """Rata-rata bergulir O(1) dengan semantik min_periods pandas.
+
+    Jumlah berjalan dihitung ulang dari isi jendela setiap `window` update
+    agar galat pembulatan tidak menumpuk pada stream yang panjang.
+    """
+
+    def __init__(self, window, min_periods=None):
+        self.window = window
+        self.min_periods = window if min_periods is None else max(min_periods, 1)
+        self.values = deque()
+        self.total = 0.0
+        self.count = 0
+        self._since_resync = 0
+
+    def update(self, x):
+        self.values.append(x)
+        if x == x:
+            self.total += x
+            self.count += 1
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if old == old:
+                self.total -= old
+                self.count -= 1
+
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            self.total = math.fsum(v for v in self.values if v == v)
+            self._since_resync = 0
+        return self.value
+
+    def seed(self, values):
+        """Mengisi jendela dari ekor deret riwayat (array) tanpa update per nilai"""
+        self.values = deque(values[-self.window:].tolist())
+        valid = [v for v in self.values if v == v]
+        self.total = math.fsum(valid)
+        self.count = len(valid)
+        self._since_resync = 0
+
+    @property
+    def sum(self):
+        return self.total if self.count >= self.min_periods else NAN
+
+    @property
+    def value(self):
+        return self.total / self.count if self.count >= self.min_periods else NAN
+
+
+class RollingStd:
+    """Simpangan baku bergulir (ddof=0) dari deviasi terhadap nilai acuan"""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.ref = None
+        self.s1 = 0.0
+        self.s2 = 0.0
+        self._since_resync = 0
+
+    def _resync(self):
+        self.ref = math.fsum(self.values) / len(self.values)
+        self.s1 = math.fsum(v - self.ref for v in self.values)
+        self.s2 = math.fsum((v - self.ref) ** 2 for v in self.values)
+        self._since_resync = 0
+
+    def update(self, x):
+        if self.ref is None:
+            self.ref = x
+        self.values.append(x)
+        d = x - self.ref
+        self.s1 += d
+        self.s2 += d * d
+        if len(self.values) > self.window:
+            d = self.values.popleft() - self.ref
+            self.s1 -= d
+            self.s2 -= d * d
+
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            self._resync()
+        return self.value
+
+    def seed(self, values):
+        self.values = deque(values[-self.window:].tolist())
+        if self.values:
+            self._resync()
+
+    @property
+    def value(self):
+        n = len(self.values)
+        if n < self.window:
+            return NAN
+        mean = self.s1 / n
+        return math.sqrt(max(self.s2 / n - mean * mean, 0.0))
+
+
+class RollingExtreme:
+    """Rolling max/min O(1) amortisasi dengan monotonic deque"""
+
+    def __init__(self, window, kind='max', min_periods=None):
+        self.window = window
+        self.min_periods = window if min_periods is None else max(min_periods, 1)
+        self.better = (lambda a, b: a >= b) if kind == 'max' else (lambda a, b: a <= b)
+        self.queue = deque()
+        self.index = -1
+
+    def update(self, x):
+        self.index += 1
+        while self.queue and self.better(x, self.queue[-1][1]):
+            self.queue.pop()
+        self.queue.append((self.index, x))
+        if self.queue[0][0] <= self.index - self.window:
+            self.queue.popleft()
+        return self.value
+
+    def seed(self, values):
+        """Membangun deque dari `window` nilai terakhir deret riwayat"""
+        self.queue = deque()
+        self.index = len(values) - 1
+        start = max(len(values) - self.window, 0)
+        for i, x in enumerate(values[start:].tolist(), start):
+            while self.queue and self.better(x, self.queue[-1][1]):
+                self.queue.pop()
+            self.queue.append((i, x))
+
+    @property
+    def value(self):
+        if min(self.index + 1, self.window) < self.min_periods:
+            return NAN
+        return self.queue[0][1]
+
+
+class EMA:
+    """EMA setara ewm(adjust=False) dengan min_periods"""
+
+    def __init__(self, alpha, min_periods=0):
+        self.alpha = alpha
+        self.min_periods = max(min_periods, 1)
+        self.state = NAN
+        self.count = 0
+
+    def update(self, x):
+        if x == x:
+            self.count += 1
+            self.state = x if self.count == 1 else self.state + self.alpha * (x - self.state)
+        return self.value
+
+    def seed(self, values):
+        """State dari deret riwayat, dihitung vektor (NaN hanya boleh di awal)"""
+        self.count = int((values == values).sum())
+        self.state = float(ema(values, self.alpha)[-1]) if self.count else NAN
+
+    @property
+    def value(self):
+        return self.state if self.count >= self.min_periods else NAN
+
+
+class WilderATR:
+    """ATR Wilder seperti `ta`: nol sampai jendela pertama penuh"""
+
+    def __init__(self, window=14):
+        self.window = window
+        self.first = []
+        self.value = 0.0
+
+    def update(self, tr):
+        if len(self.first) < self.window:
+            self.first.append(tr)
+            if len(self.first) == self.window:
+                self.value = math.fsum(self.first) / self.window
+        else:
+            self.value = (self.value * (self.window - 1) + tr) / self.window
+        return self.value
+
+    def seed(self, tr, value):
+        """State dari deret true range riwayat dan nilai ATR terakhirnya"""
+        self.first = tr[:self.window].tolist()
+        self.value = float(value)
+
+
+class StreamingAnalyzer:
+    """Analyzer stateful yang memperbarui semua indikator per bar dalam O(1).
+
+    Menghasilkan dict `result` yang sama dengan StockAnalyzer.analyze_all
+    tanpa menghitung ulang seluruh riwayat. Bar dianggap final; koreksi bar
+    yang sama tidak didukung. windows seperti pada StockAnalyzer.
+    """
+
+    def __init__(self, ticker, windows=None):
+        w = self.windows = resolve_windows(windows)
+        self.ticker = ticker
+        self.bars = 0
+        self.prev_close = NAN
+        self.last = {}
+        self.result = {}
+
+        self.ma20 = RollingMean(w['ma_fast'])
+        self.ma50 = RollingMean(w['ma_mid'])
+        self.ma200 = RollingMean(w['ma_slow'], min_periods=1)
+        self.bb_mean = self.ma20 if w['bb'] == w['ma_fast'] else RollingMean(w['bb'])
+        self.bb_std = RollingStd(w['bb'])
+
+        self.rsi_up = EMA(1 / w['rsi'], min_periods=w['rsi'])
+        self.rsi_down = EMA(1 / w['rsi'], min_periods=w['rsi'])
+        self.rsi_ma = RollingMean(w['rsi_ma'])
+        self.ema_fast = EMA(2 / (w['macd_fast'] + 1), min_periods=w['macd_fast'])
+        self.ema_slow = EMA(2 / (w['macd_slow'] + 1), min_periods=w['macd_slow'])
+        self.macd_signal = EMA(2 / (w['macd_signal'] + 1), min_periods=w['macd_signal'])
+        self.stoch_low = RollingExtreme(w['stoch'], 'min')
+        self.stoch_high = RollingExtreme(w['stoch'], 'max')
+        self.stoch_d = RollingMean(w['stoch_d'])
+
+        self.atr = WilderATR(w['atr'])
+        self.vwap_pv = RollingMean(w['vwap'])
+        self.vwap_volume = RollingMean(w['vwap'])
+        self.obv = 0.0
+        self.obv_ma = RollingMean(w['obv_ma'])
+
+        self.ichimoku = {
+            line: (RollingExtreme(w[line], 'max', min_periods), RollingExtreme(w[line], 'min', min_periods))
+            for line, min_periods in (('tenkan', None), ('kijun', None), ('senkou_b', 0))
+        }
+
+        self.close_20 = (RollingExtreme(w['support'], 'min'), RollingExtreme(w['support'], 'max'))
+        self.close_50 = (RollingExtreme(w['fibonacci'], 'min'), RollingExtreme(w['fibonacci'], 'max'))
+        self.low_20 = RollingExtreme(20, 'min')
+        self.high_20 = RollingExtreme(20, 'max')
+        self.low_5 = RollingExtreme(5, 'min')
+        self.recent_lows = deque(maxlen=5)
+        self.tail = deque(maxlen=19)
+
+    @classmethod
+    def from_frame(cls, ticker, df, windows=None):
+        """Menghangatkan state dari riwayat bar yang sudah ada.
+
+        State diisi dari IndicatorKernel (vektor) dan ekor tiap jendela,
+        bukan dengan memutar update() per bar; update berikutnya sama dengan
+        hasil pemutaran ulang hingga galat pembulatan.
+        """
+        analyzer = cls(ticker, windows)
+        if len(df):
+            analyzer._seed(IndicatorKernel(df, analyzer.windows))
+            analyzer.evaluate()
+        return analyzer
+
+    def _seed(self, k):
+        close, high, low, volume = (k.array(name) for name in ('Close', 'High', 'Low', 'Volume'))
+        col = k.column
+
+        for mean in (self.ma20, self.ma50, self.ma200):
+            mean.seed(close)
+        if self.bb_mean is not self.ma20:
+            self.bb_mean.seed(close)
+        self.bb_std.seed(close)
+
+        up, down = k.gains()
+        self.rsi_up.seed(up)
+        self.rsi_down.seed(down)
+        self.rsi_ma.seed(col('RSI'))
+        self.ema_fast.seed(close)
+        self.ema_slow.seed(close)
+        self.macd_signal.seed(col('MACD'))
+        self.stoch_low.seed(low)
+        self.stoch_high.seed(high)
+        self.stoch_d.seed(col('Stoch_%K'))
+
+        self.atr.seed(k.tr(), col('ATR')[-1])
+        k.tpv()
+        self.vwap_pv.seed(k.array('TPV'))
+        self.vwap_volume.seed(volume)
+        self.obv = float(col('OBV')[-1])
+        self.obv_ma.seed(col('OBV'))
+
+        for hi, lo in self.ichimoku.values():
+            hi.seed(high)
+            lo.seed(low)
+        for extreme in (*self.close_20, *self.close_50):
+            extreme.seed(close)
+        self.low_20.seed(low)
+        self.high_20.seed(high)
+        self.low_5.seed(low)
+        self.recent_lows.extend(k.lowest('Low', 5)[-5:].tolist())
+        self.tail.extend(zip(high[-19:].tolist(), low[-19:].tolist(), close[-19:].tolist()))
+
+        self.last = {'Close': float(close[-1]), **{name: float(col(name)[-1]) for name in COLUMNS}}
+        self.prev_close = float(close[-1])
+        self.bars = len(close)
+
+    def update(self, bar, evaluate=True):
+        """Menambahkan satu bar (mapping berisi High/Low/Close/Volume)"""
+        high, low, close = float(bar['High']), float(bar['Low']), float(bar['Close'])
+        volume = float(bar['Volume'])
+        prev_close = self.prev_close
+        last = self.last
+
+        last['Close'] = close
+        last['MA20'] = self.ma20.update(close)
+        last['MA50'] = self.ma50.update(close)
+        last['MA200'] = self.ma200.update(close)
+
+        diff = close - prev_close
+        up = self.rsi_up.update(diff if diff > 0 else 0.0)
+        down = self.rsi_down.update(-diff if diff < 0 else 0.0)
+        rsi = 100.0 if down == 0 else 100.0 - 100.0 / (1.0 + up / down) if down == down else NAN
+        last['RSI'] = rsi
+        last['RSI_MA'] = self.rsi_ma.update(rsi)
+
+        fast, slow = self.ema_fast.update(close), self.ema_slow.update(close)
+        macd = fast - slow
+        last['MACD'] = macd
+        last['MACD_signal'] = self.macd_signal.update(macd)
+        last['MACD_hist'] = macd - last['MACD_signal']
+
+        stoch_low, stoch_high = self.stoch_low.update(low), self.stoch_high.update(high)
+        span = stoch_high - stoch_low
+        k = 100 * (close - stoch_low) / span if span else (NAN if close == stoch_low else math.copysign(math.inf, close - stoch_low))
+        last['Stoch_%K'] = k
+        last['Stoch_%D'] = self.stoch_d.update(k)
+
+        std = self.bb_std.update(close)
+        middle = last['MA20'] if self.bb_mean is self.ma20 else self.bb_mean.update(close)
+        last['BB_middle'] = middle
+        last['BB_upper'] = middle + self.windows['bb_std'] * std
+        last['BB_lower'] = middle - self.windows['bb_std'] * std
+
+        if prev_close == prev_close:
+            tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        else:
+            tr = high - low
+        last['ATR'] = self.atr.update(tr)
+
+        self.vwap_pv.update((high + low + close) / 3.0 * volume)
+        self.vwap_volume.update(volume)
+        pv, vol = self.vwap_pv.sum, self.vwap_volume.sum
+        last['VWAP'] = pv / vol if vol else NAN
+
+        self.obv += -volume if close < prev_close else volume
+        last['OBV'] = self.obv
+        last['OBV_MA'] = self.obv_ma.update(self.obv)
+
+        lines = {}
+        for line, (hi, lo) in self.ichimoku.items():
+            lines[line] = 0.5 * (hi.update(high) + lo.update(low))
+        last['Tenkan_sen'] = lines['tenkan']
+        last['Kijun_sen'] = lines['kijun']
+        last['Senkou_span_a'] = 0.5 * (lines['tenkan'] + lines['kijun'])
+        last['Senkou_span_b'] = lines['senkou_b']
+
+        for extreme in (*self.close_20, *self.close_50):
+            extreme.update(close)
+        self.low_20.update(low)
+        self.high_20.update(high)
+        self.recent_lows.append(self.low_5.update(low))
+        self.tail.append((high, low, close))
+
+        self.prev_close = close
+        self.bars += 1
+        if evaluate:
+            return self.evaluate()
+
+    def evaluate(self):
+        """Menyusun dict result dari state terakhir"""
+        last = self.last
+        close = last['Close']
+        result = {}
+
+        result['Fibonacci Levels'] = signals.fibonacci_levels(self.close_50[0].value, self.close_50[1].value)
+        result['Trend'] = signals.trend_signal(close, last['MA20'], last['MA50'], last['MA200'])
+        result['Current Price'] = close
+        result['MA Status'] = signals.ma_status_signal(close, last['MA20'], last['MA50'], last['MA200'])
+        result['MACD Signal'] = signals.macd_signal(last['MACD'], last['MACD_signal'])
+        result['RSI (14)'] = last['RSI']
+        result['RSI Signal'] = signals.rsi_signal(last['RSI'], last['RSI_MA'])
+        result['Stochastic Signal'] = signals.stochastic_signal(last['Stoch_%K'], last['Stoch_%D'])
+        result['Volume Signal'] = signals.volume_signal(last['OBV'], last['OBV_MA'])
+        result['VWAP Signal'] = signals.vwap_signal(close, last['VWAP'])
+        result['Support Level'] = self.close_20[0].value
+        result['Resistance Level'] = self.close_20[1].value
+
+        tail = np.array(self.tail)
+        result.update(signals.risk_reward(
+            close,
+            last['ATR'],
+            result['Fibonacci Levels'],
+            self.low_20.value,
+            self.high_20.value,
+            signals.consolidated_areas(tail[:, 0], tail[:, 1], tail[:, 2], close),
+            list(self.recent_lows),
+        ))
+
+        result['Indicators Summary'] = {
+            'Trend Confirmation': "Confirmed" if signals.trend_confirmed(
+                result['Trend'], result['MACD Signal'], result['RSI Signal']) else "Unconfirmed",
+            'Volume Confirmation': result['Volume Signal'],
+            'Volatility': signals.volatility_label(last['ATR'], close)
+        }
+        result['Ticker'] = self.ticker
+
+        self.result = result
+        return result
@@ -0,0 +1,96 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from core import signals
+from core.batch import run_chunks
+from core.kernel import IndicatorKernel, resolve_windows
+from core.panel import FIELDS
+from core.screener import _align
+
+
+def confirmed_uptrend(k):
+    """Entry bawaan (seperti core.backtest): Uptrend yang dikonfirmasi MACD dan RSI"""
+    col = k.column
+    trend = signals.trend_codes(k.array('Close'), col('MA20'), col('MA50'), col('MA200'))
+    confirmed = signals.trend_confirmed_codes(
+        trend, signals.macd_codes(col('MACD'), col('MACD_signal')), signals.rsi_codes(col('RSI'), col('RSI_MA'))
+    )
+    return (trend == signals.TREND_LABELS.index("Uptrend")) & confirmed
+
+
+def grid_combinations(grid):
+    """Kombinasi grid {kunci jendela: [nilai, ...]} sebagai daftar dict.
+
+    Nilai diurutkan naik sehingga kombinasi yang berurutan hanya berbeda di
+    satu jendela dan berbagi hasil antara di kernel.
+    """
+    keys = list(grid)
+    values = [sorted(set(grid[key])) for key in keys]
+    combos = [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+    for combo in combos:
+        resolve_windows(combo)
+    return combos
+
+
+def _sweep_chunk(frames, combos, entry, horizon):
+    """Statistik (sinyal, jumlah return, menang, ticker bersinyal) per kombinasi untuk satu chunk ticker"""
+    lookback = max(len(df) for df in frames.values())
+    arrays = {
+        name: _align([df[name].to_numpy(dtype=np.float64) for df in frames.values()], lookback)
+        for name in FIELDS
+    }
+    base = IndicatorKernel.from_arrays(arrays)
+    close = base.array('Close')
+    forward = np.full(close.shape, np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        forward[:-horizon] = close[horizon:] / close[:-horizon] - 1
+    valid = ~np.isnan(forward)
+
+    out = np.zeros((len(combos), 4))
+    for i, windows in enumerate(combos):
+        # Semua kombinasi memakai memo kernel yang sama (prefix sum, EMA, extrema)
+        hits = np.asarray(entry(base.with_windows(**windows)), dtype=bool) & valid
+        returns = forward[hits]
+        out[i] = hits.sum(), returns.sum(), (returns > 0).sum(), hits.any(axis=0).sum()
+    return out
+
+
+def sweep(frames, grid, entry=confirmed_uptrend, horizon=10, max_workers=None, chunksize=64):
+    """Mengevaluasi grid jendela indikator untuk banyak ticker sekaligus.
+
+    frames adalah mapping ticker -> DataFrame OHLCV, grid mis.
+    {'ma_fast': [10, 20, 30], 'rsi': [9, 14, 21]}. entry(kernel) mengembalikan
+    mask entry (waktu x ticker) dari kernel dengan jendela kombinasi; tiap
+    entry dinilai dengan return `horizon` bar ke depan. Ticker dibagi per
+    chunk ke process pool dan tiap worker menghitung semua kombinasi untuk
+    chunk-nya, sehingga hasil antara dipakai ulang antar kombinasi. Aturan
+    entry harus fungsi level modul agar bisa dikirim ke worker.
+    max_workers=1 menjalankan semuanya di proses yang sama. Ticker dari chunk
+    yang gagal tidak ikut dihitung dan dicatat di table.attrs['errors'].
+    """
+    frames = {t: df for t, df in frames.items() if df is not None and not df.empty}
+    combos = grid_combinations(grid)
+    items = list(frames.items())
+    chunks = [dict(items[i:i + chunksize]) for i in range(0, len(items), chunksize)]
+    totals = np.zeros((len(combos), 4))
+    errors = {}
+
+    def failed(chunk, e):
+        errors.update((ticker, f"{type(e).__name__}: {e}") for ticker in chunk)
+        return 0.0
+
+    for chunk_totals in run_chunks(_sweep_chunk, chunks, (combos, entry, horizon), max_workers, failed):
+        totals += chunk_totals
+
+    count, total, wins, tickers = totals.T
+    table = pd.DataFrame(combos, index=range(len(combos)))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        table['signals'] = count.astype(np.int64)
+        table['tickers'] = tickers.astype(np.int64)
+        table['mean_return'] = total / count
+        table['hit_rate'] = wins / count
+    table = table.sort_values('mean_return', ascending=False, na_position='last', ignore_index=True)
+    table.attrs['errors'] = errors
+    return table
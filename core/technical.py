@@ -1,346 +1,436 @@
-import yfinance as yf
+import numpy as np
+import pandas as pd
 
-from curl_cffi import requests
+from core import metrics, signals
+from core.data import YahooSource, compact_frame
+from core.kernel import COLUMNS, CUMULATIVE, IndicatorKernel, resolve_windows
+from core.levels import find_levels, nearest_levels
+
+# Graf analisis: node -> (method, dependensi). Indikator tidak bergantung
+# satu sama lain karena hasil antaranya sudah dibagi lewat IndicatorKernel.
+NODES = {
+    'MA': ('calculate_moving_averages', ()),
+    'RSI': ('calculate_rsi', ()),
+    'MACD': ('calculate_macd', ()),
+    'Stochastic': ('calculate_stochastic', ()),
+    'Bollinger': ('calculate_bollinger_bands', ()),
+    'ATR': ('calculate_atr', ()),
+    'VWAP': ('calculate_vwap', ()),
+    'OBV': ('calculate_obv', ()),
+    'Ichimoku': ('calculate_ichimoku_cloud', ()),
+    'Fibonacci Levels': ('calculate_fibonacci_levels', ()),
+    'Trend': ('analyze_trend', ('MA',)),
+    'MA Status': ('analyze_ma_status', ('MA',)),
+    'MACD Signal': ('analyze_macd', ('MACD',)),
+    'RSI Signal': ('analyze_rsi', ('RSI',)),
+    'Stochastic Signal': ('analyze_stochastic', ('Stochastic',)),
+    'Volume Signal': ('analyze_volume', ('OBV',)),
+    'VWAP Signal': ('analyze_vwap', ('VWAP',)),
+    'Ichimoku Signal': ('analyze_ichimoku', ('Ichimoku',)),
+    'Support/Resistance': ('calculate_support_resistance', ()),
+    'Price Zones': ('calculate_price_zones', ()),
+    'Multi-Timeframe': ('calculate_multi_timeframe', ('Trend',)),
+    'Risk/Reward': ('calculate_risk_reward', ('ATR', 'Fibonacci Levels')),
+    'Indicators Summary': ('summarize_indicators', ('Trend', 'MACD Signal', 'RSI Signal', 'Volume Signal', 'ATR')),
+}
+
+# Kunci result yang diisi oleh node dengan nama berbeda
+OUTPUTS = {
+    'Current Price': 'Trend',
+    'RSI (14)': 'RSI Signal',
+    'Support Level': 'Support/Resistance',
+    'Resistance Level': 'Support/Resistance',
+    'Potential Upside': 'Risk/Reward',
+    'Potential Downside': 'Risk/Reward',
+    'Entry Zone': 'Risk/Reward',
+    'Target 1': 'Risk/Reward',
+    'Target 2': 'Risk/Reward',
+    'Stop Loss': 'Risk/Reward',
+    'Key Support Levels': 'Risk/Reward',
+    'Key Resistance Levels': 'Risk/Reward',
+    'Timeframe Alignment': 'Multi-Timeframe',
+}
+
+# Urutan langkah analyze_all (Ichimoku dihitung tetapi sinyalnya opsional;
+# Price Zones dan Multi-Timeframe hanya dijalankan jika diminta)
+ANALYZE_ALL = (
+    'MA', 'RSI', 'MACD', 'Stochastic', 'Bollinger', 'ATR', 'VWAP', 'OBV', 'Ichimoku',
+    'Fibonacci Levels', 'Trend', 'MA Status', 'MACD Signal', 'RSI Signal',
+    'Stochastic Signal', 'Volume Signal', 'VWAP Signal', 'Support/Resistance',
+    'Risk/Reward', 'Indicators Summary',
+)
+
+# Bar warm-up di awal tiap chunk: mencakup jendela terpanjang (MA200) dan
+# membuat pengaruh nilai awal EMA/Wilder di bar pertama chunk < 1e-30
+WARMUP = 1000
+
+
+def chunk_bounds(n, chunk_size, warmup=WARMUP):
+    """(awal warm-up, awal, akhir) tiap chunk; warm-up tumpang tindih dengan chunk sebelumnya"""
+    for start in range(0, n, chunk_size):
+        yield max(start - warmup, 0), start, min(start + chunk_size, n)
+
+
+class _LastBar:
+    """Nilai bar terakhir (float64) langsung dari kernel, pengganti df.iloc[-1]"""
+
+    __slots__ = ('kernel',)
+
+    def __init__(self, kernel):
+        self.kernel = kernel
+
+    def __getitem__(self, name):
+        if name in COLUMNS:
+            return self.kernel.column(name)[-1]
+        return self.kernel.array(name)[-1]
 
-from ta.trend import SMAIndicator, MACD, IchimokuIndicator
-from ta.momentum import RSIIndicator, StochasticOscillator
-from ta.volatility import BollingerBands, AverageTrueRange
-from ta.volume import VolumeWeightedAveragePrice, OnBalanceVolumeIndicator
 
 class StockAnalyzer:
-    def __init__(self, ticker, period='ytd'):
+    """Analisis teknikal satu ticker.
+
+    dtype (mis. 'float32') menyimpan bar dan kolom indikator secara ringkas;
+    perhitungan tetap float64. inline=False menyimpan indikator hanya di
+    self.indicators (lihat indicator_frame()) sehingga self.df tetap berisi
+    bar mentah. Dengan chunk_size, deret yang lebih panjang dihitung per
+    chunk dengan `warmup` bar tumpang tindih agar memori kerja terbatas.
+    windows mengganti jendela indikator, mis. {'rsi': 9, 'ma_slow': 150}
+    (lihat core.kernel.WINDOWS).
+    """
+
+    def __init__(self, ticker, period='ytd', interval='1d', source=None, df=None,
+                 dtype=None, inline=True, chunk_size=None, warmup=WARMUP, windows=None):
+        self.windows = resolve_windows(windows)
+        longest = max(self.windows.values())
+        if chunk_size and warmup < longest:
+            raise ValueError(f"warmup must cover the longest indicator window ({longest} bars)")
         self.ticker = ticker
         self.period = period
-        self.df = None
+        self.interval = interval
+        self.source = source
+        self.df = df
+        self.dtype = dtype
+        self.inline = inline
+        self.chunk_size = chunk_size
+        self.warmup = warmup
+        self.chunked = False
+        self.kernel = None
+        self.indicators = {}
+        self.levels = None
+        self.pyramid = None
         self.result = {}
+        self._columns = {}
+        self._done = set()
         self._initialize_data()
     
     def _initialize_data(self):
-        """Mengambil data saham dari Yahoo Finance"""
-        session = requests.Session(impersonate="chrome")
-        stock = yf.Ticker(self.ticker, session=session)
-        self.df = stock.history(period=self.period)
+        """Mengambil data saham dari sumber data (dilewati jika df sudah diberikan)"""
+        if self.df is None:
+            self.source = self.source or YahooSource()
+            with metrics.span('fetch', ticker=self.ticker, source=type(self.source).__name__) as span:
+                self.df = self.source.fetch(self.ticker, period=self.period, interval=self.interval)
+                span.set(bars=len(self.df))
         
         if self.df.empty:
             raise ValueError("Unable to retrieve stock data")
+        if self.dtype is not None:
+            self.df = compact_frame(self.df, self.dtype)
+        
+        # Pada mode chunk, kernel hanya memuat ekor deret untuk nilai bar terakhir
+        self.chunked = bool(self.chunk_size) and len(self.df) > self.chunk_size
+        tail = self.df.iloc[-(self.chunk_size + self.warmup):] if self.chunked else self.df
+        self.kernel = IndicatorKernel(tail, self.windows)
     
     def analyze_all(self):
         """Menjalankan semua analisis"""
-        self.calculate_moving_averages()
-        self.calculate_momentum_indicators()
-        self.calculate_volatility_indicators()
-        self.calculate_volume_indicators()
-        self.calculate_ichimoku_cloud()
-        self.calculate_fibonacci_levels()
-        self.analyze_trend()
-        self.analyze_ma_status()
-        self.analyze_macd()
-        self.analyze_rsi()
-        self.analyze_stochastic()
-        self.analyze_volume()
-        self.analyze_vwap()
-        self.calculate_support_resistance()
-        self.calculate_risk_reward()
-        self.summarize_indicators()
+        with metrics.span('analyze_all', ticker=self.ticker) as span:
+            span.set(bars=len(self.df))
+            return self.analyze(*ANALYZE_ALL)
+    
+    def analyze(self, *outputs):
+        """Menjalankan hanya node yang dibutuhkan untuk output yang diminta.
+        
+        Output berupa nama node di NODES atau kunci result (mis. 'RSI (14)').
+        Node yang sudah dijalankan tidak diulang pada pemanggilan berikutnya.
+        """
+        for output in outputs:
+            self._run_node(OUTPUTS.get(output, output))
+        self.result.setdefault('Ticker', self.ticker)
         
         return self.result, self.df
     
+    def _run_node(self, name):
+        if name in self._done:
+            return
+        if name not in NODES:
+            raise KeyError(f"Unknown analysis output: {name}")
+        method, deps = NODES[name]
+        for dep in deps:
+            self._run_node(dep)
+        with metrics.span('node', node=name, ticker=self.ticker):
+            getattr(self, method)()
+        self._done.add(name)
+    
+    def column(self, name):
+        """Kolom indikator untuk seluruh deret (dalam dtype penyimpanan)"""
+        if name not in self._columns:
+            if self.chunked:
+                self._columns.update(self._chunked_columns())
+            else:
+                values = self.kernel.column(name)
+                self._columns[name] = values if self.dtype is None else values.astype(self.dtype)
+        return self._columns[name]
+    
+    def _chunked_columns(self):
+        """Semua kolom indikator dalam satu lintasan per chunk"""
+        n = len(self.df)
+        out = {name: np.empty(n, dtype=self.dtype or np.float64) for name in COLUMNS}
+        last_obv = 0.0
+        for warm, start, stop in chunk_bounds(n, self.chunk_size, self.warmup):
+            kernel = IndicatorKernel(self.df.iloc[warm:stop], self.windows)
+            skip = start - warm
+            obv = kernel.column('OBV')
+            # OBV kumulatif disambung ke chunk sebelumnya lewat bar warm-up terakhir
+            offset = last_obv - obv[skip - 1] if skip else 0.0
+            last_obv = obv[-1] + offset
+            for name in COLUMNS:
+                values = kernel.column(name)[skip:]
+                out[name][start:stop] = values + offset if name in CUMULATIVE else values
+        return out
+    
+    def indicator_frame(self):
+        """Kolom indikator yang sudah dihitung sebagai DataFrame terpisah dari bar"""
+        return pd.DataFrame(self.indicators, index=self.df.index, copy=False)
+    
+    def _last_bar(self):
+        return _LastBar(self.kernel)
+    
+    def _assign(self, *columns):
+        for name in columns:
+            self.indicators[name] = self.column(name)
+            if self.inline:
+                self.df[name] = self.indicators[name]
+    
     def calculate_moving_averages(self):
         """Menghitung moving averages"""
-        self.df['MA20'] = SMAIndicator(self.df['Close'], window=20).sma_indicator()
-        self.df['MA50'] = SMAIndicator(self.df['Close'], window=50).sma_indicator()
-        self.df['MA200'] = self.df['Close'].rolling(window=200, min_periods=1).mean()
+        self._assign('MA20', 'MA50', 'MA200')
     
     def calculate_momentum_indicators(self):
         """Menghitung indikator momentum"""
-        # RSI
-        self.df['RSI'] = RSIIndicator(self.df['Close'], window=14).rsi()
-        self.df['RSI_MA'] = SMAIndicator(self.df['RSI'], window=9).sma_indicator()
-        
-        # MACD
-        macd = MACD(self.df['Close'], window_slow=26, window_fast=12, window_sign=9)
-        self.df['MACD'] = macd.macd()
-        self.df['MACD_signal'] = macd.macd_signal()
-        self.df['MACD_hist'] = macd.macd_diff()
-        
-        # Stochastic
-        stoch = StochasticOscillator(
-            high=self.df['High'], 
-            low=self.df['Low'], 
-            close=self.df['Close'], 
-            window=14, 
-            smooth_window=3
-        )
-        self.df['Stoch_%K'] = stoch.stoch()
-        self.df['Stoch_%D'] = stoch.stoch_signal()
+        self.calculate_rsi()
+        self.calculate_macd()
+        self.calculate_stochastic()
+    
+    def calculate_rsi(self):
+        """Menghitung RSI dan MA-nya"""
+        self._assign('RSI', 'RSI_MA')
+    
+    def calculate_macd(self):
+        """Menghitung MACD"""
+        self._assign('MACD', 'MACD_signal', 'MACD_hist')
+    
+    def calculate_stochastic(self):
+        """Menghitung Stochastic"""
+        self._assign('Stoch_%K', 'Stoch_%D')
     
     def calculate_volatility_indicators(self):
         """Menghitung indikator volatilitas"""
-        # Bollinger Bands
-        bb = BollingerBands(close=self.df['Close'], window=20, window_dev=2)
-        self.df['BB_upper'] = bb.bollinger_hband()
-        self.df['BB_middle'] = bb.bollinger_mavg()
-        self.df['BB_lower'] = bb.bollinger_lband()
-        
-        # ATR
-        atr = AverageTrueRange(
-            high=self.df['High'], 
-            low=self.df['Low'], 
-            close=self.df['Close'], 
-            window=14
-        )
-        self.df['ATR'] = atr.average_true_range()
+        self.calculate_bollinger_bands()
+        self.calculate_atr()
+    
+    def calculate_bollinger_bands(self):
+        """Menghitung Bollinger Bands"""
+        self._assign('BB_upper', 'BB_middle', 'BB_lower')
+    
+    def calculate_atr(self):
+        """Menghitung ATR"""
+        self._assign('ATR')
     
     def calculate_volume_indicators(self):
         """Menghitung indikator volume"""
-        # VWAP
-        self.df['VWAP'] = VolumeWeightedAveragePrice(
-            high=self.df['High'],
-            low=self.df['Low'],
-            close=self.df['Close'],
-            volume=self.df['Volume'],
-            window=20
-        ).volume_weighted_average_price()
-        
-        # OBV
-        obv = OnBalanceVolumeIndicator(close=self.df['Close'], volume=self.df['Volume'])
-        self.df['OBV'] = obv.on_balance_volume()
-        self.df['OBV_MA'] = SMAIndicator(self.df['OBV'], window=20).sma_indicator()
+        self.calculate_vwap()
+        self.calculate_obv()
+    
+    def calculate_vwap(self):
+        """Menghitung VWAP"""
+        self._assign('VWAP')
+    
+    def calculate_obv(self):
+        """Menghitung OBV dan MA-nya"""
+        self._assign('OBV', 'OBV_MA')
     
     def calculate_ichimoku_cloud(self):
         """Menghitung indikator Ichimoku Cloud"""
-        ichimoku = IchimokuIndicator(
-            high=self.df['High'], 
-            low=self.df['Low'], 
-            window1=9, 
-            window2=26, 
-            window3=52
-        )
-        self.df['Tenkan_sen'] = ichimoku.ichimoku_conversion_line()
-        self.df['Kijun_sen'] = ichimoku.ichimoku_base_line()
-        self.df['Senkou_span_a'] = ichimoku.ichimoku_a()
-        self.df['Senkou_span_b'] = ichimoku.ichimoku_b()
+        self._assign('Tenkan_sen', 'Kijun_sen', 'Senkou_span_a', 'Senkou_span_b')
     
     def calculate_fibonacci_levels(self):
         """Menghitung level Fibonacci retracement"""
-        recent_low = self.df['Close'].rolling(50).min().iloc[-1]
-        recent_high = self.df['Close'].rolling(50).max().iloc[-1]
+        recent_low = self.kernel.tail_lowest('Close', self.windows['fibonacci'])[-1]
+        recent_high = self.kernel.tail_highest('Close', self.windows['fibonacci'])[-1]
         
-        self.result['Fibonacci Levels'] = {
-            '0%': recent_high,
-            '23.6%': recent_high - (recent_high - recent_low) * 0.236,
-            '38.2%': recent_high - (recent_high - recent_low) * 0.382,
-            '50%': recent_high - (recent_high - recent_low) * 0.5,
-            '61.8%': recent_high - (recent_high - recent_low) * 0.618,
-            '100%': recent_low
-        }
+        self.result['Fibonacci Levels'] = signals.fibonacci_levels(recent_low, recent_high)
     
     def analyze_trend(self):
         """Menganalisis tren saham"""
-        last = self.df.iloc[-1]
-        last_close = last['Close']
-        last_ma20 = last['MA20']
-        last_ma50 = last['MA50']
-        last_ma200 = last['MA200']
-        
-        price_above_ma200 = last_close > last_ma200
-        ma20_above_ma50 = last_ma20 > last_ma50
-        ma50_above_ma200 = last_ma50 > last_ma200
+        last = self._last_bar()
         
-        trend = "Strong Uptrend" if (price_above_ma200 and ma20_above_ma50 and ma50_above_ma200) else \
-                "Uptrend" if (price_above_ma200 and ma50_above_ma200) else \
-                "Downtrend" if (last_close < last_ma50 and last_ma50 < last_ma200) else \
-                "Strong Downtrend" if (last_close < last_ma200 and last_ma20 < last_ma50 and last_ma50 < last_ma200) else \
-                "Sideways/Rebound"
-        
-        self.result['Trend'] = trend
-        self.result['Current Price'] = last_close
+        self.result['Trend'] = signals.trend_signal(last['Close'], last['MA20'], last['MA50'], last['MA200'])
+        self.result['Current Price'] = last['Close']
     
     def analyze_ma_status(self):
         """Menganalisis status moving average"""
-        last = self.df.iloc[-1]
-        last_close = last['Close']
-        last_ma20 = last['MA20']
-        last_ma50 = last['MA50']
-        last_ma200 = last['MA200']
+        last = self._last_bar()
         
-        ma_status = "Bullish (Price > MA20 > MA50 > MA200)" if last_close > last_ma20 > last_ma50 > last_ma200 else \
-                    "Bearish (Price < MA20 < MA50 < MA200)" if last_close < last_ma20 < last_ma50 < last_ma200 else \
-                    "Bullish Crossover (Price > MA20 > MA50)" if last_close > last_ma20 > last_ma50 else \
-                    "Bearish Crossover (Price < MA20 < MA50)" if last_close < last_ma20 < last_ma50 else \
-                    "Mixed Signals (Watch for confirmation)"
-        
-        self.result['MA Status'] = ma_status
+        self.result['MA Status'] = signals.ma_status_signal(last['Close'], last['MA20'], last['MA50'], last['MA200'])
     
     def analyze_macd(self):
         """Menganalisis sinyal MACD"""
-        last = self.df.iloc[-1]
-        last_macd = last['MACD']
-        last_macd_signal = last['MACD_signal']
-        
-        macd_signal = "Bullish (MACD > Signal)" if last_macd > last_macd_signal else \
-                      "Bearish (MACD < Signal)" if last_macd < last_macd_signal else \
-                      "Neutral (MACD = Signal)"
+        last = self._last_bar()
         
-        self.result['MACD Signal'] = macd_signal
+        self.result['MACD Signal'] = signals.macd_signal(last['MACD'], last['MACD_signal'])
     
     def analyze_rsi(self):
         """Menganalisis sinyal RSI"""
-        last = self.df.iloc[-1]
-        last_rsi = last['RSI']
-        last_rsi_ma = last['RSI_MA']
+        last = self._last_bar()
         
-        rsi_signal = "Overbought (RSI > 70)" if last_rsi > 70 else \
-                     "Oversold (RSI < 30)" if last_rsi < 30 else \
-                     "Bullish (RSI > MA)" if last_rsi > last_rsi_ma else \
-                     "Bearish (RSI < MA)" if last_rsi < last_rsi_ma else \
-                     "Neutral"
-        
-        self.result['RSI (14)'] = round(last_rsi, 2)
-        self.result['RSI Signal'] = rsi_signal
+        self.result['RSI (14)'] = last['RSI']
+        self.result['RSI Signal'] = signals.rsi_signal(last['RSI'], last['RSI_MA'])
     
     def analyze_stochastic(self):
         """Menganalisis sinyal Stochastic"""
-        last = self.df.iloc[-1]
-        last_stoch_k = last['Stoch_%K']
-        last_stoch_d = last['Stoch_%D']
-        
-        stoch_signal = "Overbought (%K > 80)" if last_stoch_k > 80 else \
-                       "Oversold (%K < 20)" if last_stoch_k < 20 else \
-                       "Bullish Cross (%K > %D)" if last_stoch_k > last_stoch_d else \
-                       "Bearish Cross (%K < %D)" if last_stoch_k < last_stoch_d else \
-                       "Neutral"
+        last = self._last_bar()
         
-        self.result['Stochastic Signal'] = stoch_signal
+        self.result['Stochastic Signal'] = signals.stochastic_signal(last['Stoch_%K'], last['Stoch_%D'])
     
     def analyze_volume(self):
         """Menganalisis sinyal volume"""
-        last = self.df.iloc[-1]
-        last_obv = last['OBV']
-        last_obv_ma = last['OBV_MA']
-        
-        volume_signal = "Bullish (OBV > MA)" if last_obv > last_obv_ma else \
-                        "Bearish (OBV < MA)" if last_obv < last_obv_ma else \
-                        "Neutral Volume"
+        last = self._last_bar()
         
-        self.result['Volume Signal'] = volume_signal
+        self.result['Volume Signal'] = signals.volume_signal(last['OBV'], last['OBV_MA'])
     
     def analyze_vwap(self):
         """Menganalisis sinyal VWAP"""
-        last = self.df.iloc[-1]
-        last_close = last['Close']
-        last_vwap = last['VWAP']
-        
-        vwap_signal = "Bullish (Price > VWAP)" if last_close > last_vwap else \
-                      "Bearish (Price < VWAP)" if last_close < last_vwap else \
-                      "Neutral (Price ≈ VWAP)"
+        last = self._last_bar()
         
-        self.result['VWAP Signal'] = vwap_signal
+        self.result['VWAP Signal'] = signals.vwap_signal(last['Close'], last['VWAP'])
     
     def calculate_support_resistance(self):
         """Menghitung level support dan resistance"""
-        support = self.df['Close'].rolling(20).min().iloc[-1]
-        resistance = self.df['Close'].rolling(20).max().iloc[-1]
+        support = self.kernel.tail_lowest('Close', self.windows['support'])[-1]
+        resistance = self.kernel.tail_highest('Close', self.windows['support'])[-1]
         
-        self.result['Support Level'] = round(support, 2)
-        self.result['Resistance Level'] = round(resistance, 2)
+        self.result['Support Level'] = support
+        self.result['Resistance Level'] = resistance
+    
+    def calculate_price_zones(self):
+        """Menghitung zona support/resistance dari pivot seluruh riwayat (lihat core.levels)"""
+        self.levels = find_levels(self.df, left=self.windows['pivot'])
+        self.result['Price Zones'] = nearest_levels(self.levels)
+    
+    def calculate_multi_timeframe(self):
+        """Sinyal pada timeframe turunan (mingguan, bulanan, ...) dari bar yang sama (lihat core.timeframes)"""
+        from core.timeframes import TimeframePyramid, multi_timeframe
+
+        if self.pyramid is None:
+            self.pyramid = TimeframePyramid(self.df, self.interval, ticker=self.ticker, windows=self.windows)
+        summary = multi_timeframe(self.pyramid)
+        self.result['Multi-Timeframe'] = summary
+        self.result['Timeframe Alignment'] = signals.timeframe_alignment(
+            [self.result['Trend'], *(values['Trend'] for values in summary.values())]
+        )
     
     def calculate_risk_reward(self):
         """Menghitung rasio risiko/reward dengan pendekatan lebih komprehensif"""
-        last = self.df.iloc[-1]
+        last = self._last_bar()
         last_close = last['Close']
         last_atr = last['ATR']
-    
-        recent_low = self.df['Low'].rolling(20).min().iloc[-1]
-        recent_high = self.df['High'].rolling(20).max().iloc[-1]
-    
-        consolidation_threshold = 0.015 * last_close  
-        consolidated_areas = []
-        for i in range(len(self.df)-5, len(self.df)-20, -1):
-            window = self.df.iloc[i:i+5]
-            range_pct = (window['High'].max() - window['Low'].min()) / last_close
-            if range_pct < consolidation_threshold:
-                avg_price = window['Close'].mean()
-                consolidated_areas.append(avg_price)
-    
-        all_levels = [
-            self.result['Fibonacci Levels']['23.6%'],
-            self.result['Fibonacci Levels']['38.2%'],
-            self.result['Fibonacci Levels']['50%'],
-            self.result['Fibonacci Levels']['61.8%'],
-            recent_low,
-            recent_high,
-            *consolidated_areas
-        ]
-    
-        support_levels = sorted([lvl for lvl in all_levels if lvl < last_close], reverse=True)
-        resistance_levels = sorted([lvl for lvl in all_levels if lvl > last_close])
-    
-        atr_multiplier = 1.5 if (last_atr/last_close) < 0.02 else 2.0  
-    
-        recent_lows = self.df['Low'].rolling(5).min().iloc[-5:].tolist()
-        recent_highs = self.df['High'].rolling(5).max().iloc[-5:].tolist()
-    
-        entry_low = min(recent_lows) - (0.5 * last_atr)
-        entry_high = max(min(recent_lows) + (0.5 * last_atr), last_close - (0.3 * last_atr))
-    
-        if resistance_levels:
-            target1 = resistance_levels[0]  
-            if len(resistance_levels) > 1:
-                target2 = resistance_levels[1]  
-            else:
-                target2 = target1 + (2 * last_atr)  
-        else:
-            target1 = last_close + (atr_multiplier * last_atr)
-            target2 = last_close + (2 * atr_multiplier * last_atr)
-    
-        if support_levels:
-            stop_loss = min(support_levels[0] - (0.5 * last_atr), last_close - (atr_multiplier * last_atr))
-        else:
-            stop_loss = last_close - (atr_multiplier * last_atr)
-    
-        potential_upside_pct = round(((target1 - last_close) / last_close) * 100, 2)
-        potential_downside_pct = round(((last_close - stop_loss) / last_close) * 100, 2)
-    
-        self.result['Potential Upside'] = f"{potential_upside_pct}% to {round(target1, 2)}"
-        self.result['Potential Downside'] = f"-{potential_downside_pct}% to {round(stop_loss, 2)}"
-        self.result['Entry Zone'] = f"{round(entry_low, 2)} - {round(entry_high, 2)}"
-        self.result['Target 1'] = round(target1, 2)
-        self.result['Target 2'] = round(target2, 2)
-        self.result['Stop Loss'] = f"< {round(stop_loss, 2)}"
-        self.result['Key Support Levels'] = [round(lvl, 2) for lvl in support_levels[:3]]
-        self.result['Key Resistance Levels'] = [round(lvl, 2) for lvl in resistance_levels[:3]]
+        
+        consolidated = signals.consolidated_areas(
+            self.kernel.array('High')[-19:], self.kernel.array('Low')[-19:], self.kernel.array('Close')[-19:], last_close
+        )
+        
+        self.result.update(signals.risk_reward(
+            last_close,
+            last_atr,
+            self.result['Fibonacci Levels'],
+            self.kernel.tail_lowest('Low', 20)[-1],
+            self.kernel.tail_highest('High', 20)[-1],
+            consolidated,
+            list(self.kernel.tail_lowest('Low', 5, count=5)),
+        ))
     
     def analyze_ichimoku(self):
         """Menganalisis sinyal Ichimoku"""
-        last = self.df.iloc[-1]
-        last_close = last['Close']
-        
-        ichimoku_signal = "Strong Bullish (Price above cloud, Tenkan > Kijun)" if (last_close > last['Senkou_span_a']) and (last_close > last['Senkou_span_b']) and (last['Tenkan_sen'] > last['Kijun_sen']) else \
-                          "Bullish (Price above cloud)" if (last_close > last['Senkou_span_a']) and (last_close > last['Senkou_span_b']) else \
-                          "Strong Bearish (Price below cloud, Tenkan < Kijun)" if (last_close < last['Senkou_span_a']) and (last_close < last['Senkou_span_b']) and (last['Tenkan_sen'] < last['Kijun_sen']) else \
-                          "Bearish (Price below cloud)" if (last_close < last['Senkou_span_a']) and (last_close < last['Senkou_span_b']) else \
-                          "Neutral (Price in cloud)"
+        last = self._last_bar()
         
-        self.result['Ichimoku Signal'] = ichimoku_signal
+        self.result['Ichimoku Signal'] = signals.ichimoku_signal(
+            last['Close'], last['Senkou_span_a'], last['Senkou_span_b'], last['Tenkan_sen'], last['Kijun_sen']
+        )
     
     def summarize_indicators(self):
         """Membuat ringkasan indikator"""
-        trend_confirmed = (
-            (self.result['Trend'].startswith("Uptrend") and 
-             self.result['MACD Signal'].startswith("Bullish") and 
-             self.result['RSI Signal'].startswith("Bullish")) or 
-            (self.result['Trend'].startswith("Downtrend") and 
-             self.result['MACD Signal'].startswith("Bearish") and 
-             self.result['RSI Signal'].startswith("Bearish"))
+        trend_confirmed = signals.trend_confirmed(
+            self.result['Trend'], self.result['MACD Signal'], self.result['RSI Signal']
         )
         
-        last_atr = self.df.iloc[-1]['ATR']
-        last_close = self.df.iloc[-1]['Close']
+        last = self._last_bar()
+        last_atr = last['ATR']
+        last_close = last['Close']
         
         self.result['Indicators Summary'] = {
             'Trend Confirmation': "Confirmed" if trend_confirmed else "Unconfirmed",
             'Volume Confirmation': self.result['Volume Signal'],
-            'Volatility': "High" if last_atr > (0.02 * last_close) else "Medium" if last_atr > (0.01 * last_close) else "Low"
+            'Volatility': signals.volatility_label(last_atr, last_close)
         }
-        self.result['Ticker'] = self.ticker
\ No newline at end of file
+        self.result['Ticker'] = self.ticker
+    
+    def signal_history(self):
+        """Menghitung semua sinyal untuk setiap bar sekaligus.
+        
+        Kolom sinyal berupa pandas Categorical dengan label yang sama seperti
+        result, ditambah Trend Confirmation dan level risk/reward per bar.
+        Kolom indikator tidak ditulis ke self.df. Pada mode chunk, tiap chunk
+        dihitung dengan warm-up lalu digabung.
+        """
+        if not self.chunked:
+            return signal_frame(self.kernel, self.df.index)
+        return pd.concat([
+            signal_frame(IndicatorKernel(self.df.iloc[warm:stop], self.windows), self.df.index[warm:stop]).iloc[start - warm:]
+            for warm, start, stop in chunk_bounds(len(self.df), self.chunk_size, self.warmup)
+        ])
+
+
+def signal_frame(k, index):
+    """Sinyal per bar dari kernel indikator (lihat StockAnalyzer.signal_history)"""
+    col = k.column
+    close = k.array('Close')
+    
+    codes = {
+        'Trend': (signals.trend_codes(close, col('MA20'), col('MA50'), col('MA200')), signals.TREND_LABELS),
+        'MA Status': (signals.ma_status_codes(close, col('MA20'), col('MA50'), col('MA200')), signals.MA_STATUS_LABELS),
+        'MACD Signal': (signals.macd_codes(col('MACD'), col('MACD_signal')), signals.MACD_LABELS),
+        'RSI Signal': (signals.rsi_codes(col('RSI'), col('RSI_MA')), signals.RSI_LABELS),
+        'Stochastic Signal': (signals.stochastic_codes(col('Stoch_%K'), col('Stoch_%D')), signals.STOCHASTIC_LABELS),
+        'Volume Signal': (signals.volume_codes(col('OBV'), col('OBV_MA')), signals.VOLUME_LABELS),
+        'VWAP Signal': (signals.vwap_codes(close, col('VWAP')), signals.VWAP_LABELS),
+        'Ichimoku Signal': (signals.ichimoku_codes(
+            close, col('Senkou_span_a'), col('Senkou_span_b'), col('Tenkan_sen'), col('Kijun_sen')
+        ), signals.ICHIMOKU_LABELS),
+        'Volatility': (signals.volatility_codes(col('ATR'), close), signals.VOLATILITY_LABELS),
+    }
+    frame = pd.DataFrame(
+        {name: pd.Categorical.from_codes(c, labels) for name, (c, labels) in codes.items()},
+        index=index,
+    )
+    frame['Trend Confirmation'] = signals.trend_confirmed_codes(
+        codes['Trend'][0], codes['MACD Signal'][0], codes['RSI Signal'][0]
+    )
+    
+    levels = signals.risk_reward_levels(
+        close, col('ATR'), k.array('High'), k.array('Low'),
+        k.lowest('Close', k.windows['fibonacci']), k.highest('Close', k.windows['fibonacci']),
+        k.lowest('Low', 20), k.highest('High', 20), k.lowest('Low', 5),
+    )
+    for name, values in levels.items():
+        frame[name] = values
+    
+    return frame
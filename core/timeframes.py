@@ -0,0 +1,214 @@
+import numpy as np
+import pandas as pd
+
+from core.panel import FIELDS
+from core.technical import ANALYZE_ALL, WARMUP, StockAnalyzer
+
+# Interval Yahoo -> rule resample pandas (lihat core.data.resample_ohlcv)
+RULES = {
+    '1m': '1min', '2m': '2min', '5m': '5min', '15m': '15min', '30m': '30min', '60m': '60min', '90m': '90min',
+    '1h': '60min', '1d': 'D', '1wk': 'W', '1mo': 'ME', '3mo': 'QE',
+}
+
+# Perkiraan durasi satu bar, untuk memilih timeframe yang lebih besar dari bar dasar
+DURATION = {
+    name: pd.Timedelta(days={'D': 1, 'W': 7, 'ME': 31, 'QE': 92}[rule]) if rule in ('D', 'W', 'ME', 'QE')
+    else pd.Timedelta(rule)
+    for name, rule in RULES.items()
+}
+
+# Timeframe turunan yang dibangun bila lebih besar dari interval dasar
+PYRAMID = ('5m', '15m', '1h', '1d', '1wk', '1mo')
+
+# Ringkasan per timeframe untuk node 'Multi-Timeframe'
+SUMMARY = ('Trend', 'MA Status', 'MACD Signal', 'RSI Signal', 'Indicators Summary')
+
+
+def derived_intervals(interval):
+    """Interval PYRAMID yang lebih besar dari interval dasar, mis. '1d' -> ('1wk', '1mo')"""
+    if interval not in RULES:
+        raise ValueError(f"Unsupported interval: {interval!r} (expected one of {', '.join(RULES)})")
+    return tuple(name for name in PYRAMID if DURATION[name] > DURATION[interval])
+
+
+def bucket_labels(index, interval):
+    """Label bar turunan untuk tiap timestamp, sama seperti resample_ohlcv(df, RULES[interval])"""
+    rule = RULES[interval]
+    index = pd.DatetimeIndex(index)
+    if rule == 'W':
+        days = index.normalize()
+        return days + pd.to_timedelta((6 - days.dayofweek) % 7, unit='D')
+    if rule == 'ME':
+        return index.normalize() + pd.offsets.MonthEnd(0)
+    if rule == 'D':
+        return index.normalize()
+    return index.floor(rule)
+
+
+def _aggregate(labels, values, columns):
+    """Bar OHLCV per label berurutan: (label unik, baris teragregasi, posisi awal bucket terakhir)"""
+    starts = np.flatnonzero(np.concatenate([[True], labels[1:] != labels[:-1]]))
+    ends = np.append(starts[1:], len(labels)) - 1
+    out = np.empty((len(starts), len(columns)))
+    for j, column in enumerate(columns):
+        if column == 'Open':
+            out[:, j] = values[starts, j]
+        elif column == 'High':
+            out[:, j] = np.fmax.reduceat(values[:, j], starts)
+        elif column == 'Low':
+            out[:, j] = np.fmin.reduceat(values[:, j], starts)
+        elif column == 'Close':
+            out[:, j] = values[ends, j]
+        else:
+            out[:, j] = np.add.reduceat(np.nan_to_num(values[:, j]), starts)
+    return labels[starts], out, starts[-1]
+
+
+class TimeframePyramid:
+    """Bar timeframe turunan (mingguan, bulanan, atau 5m/15m/1h dari bar intraday) dari satu deret dasar.
+
+    Frame turunan dibangun sekali lalu diperbarui secara inkremental:
+    update() hanya mengagregasi bar baru dan menggabungkannya ke bar
+    turunan terakhir (yang bisa belum lengkap, mis. minggu berjalan),
+    bukan me-resample seluruh riwayat. Agregasi memakai label bucket dan
+    reduceat NumPy; bar dasar tanpa Close diabaikan. StockAnalyzer tiap
+    timeframe disimpan sampai frame-nya berubah, sehingga analyze()
+    berulang tidak menghitung ulang. Analisis hanya memakai `lookback`
+    bar terakhir (cukup untuk jendela terpanjang, lihat WARMUP); options
+    diteruskan ke StockAnalyzer (mis. windows).
+    """
+
+    def __init__(self, df, interval='1d', intervals=None, ticker='', lookback=WARMUP, **options):
+        self.ticker = ticker
+        self.interval = interval
+        self.lookback = lookback
+        # Indikator disimpan terpisah agar frame turunan tetap berisi OHLCV saja
+        self.options = {'inline': False, **options}
+        self.intervals = tuple(intervals) if intervals is not None else derived_intervals(interval)
+        unknown = [name for name in self.intervals if name not in PYRAMID]
+        if unknown:
+            raise ValueError(f"Unsupported timeframe: {unknown[0]!r} (expected one of {', '.join(PYRAMID)})")
+        self.base = df
+        self.columns = [column for column in FIELDS if column in df]
+        # interval -> (label, baris OHLCV, posisi bar dasar pertama di bucket terakhir)
+        self._bars = {}
+        self._frames = {}
+        self._analyzers = {}
+        for name in self.intervals:
+            self._rebuild(name, 0)
+
+    def _tail(self, start):
+        """Indeks dan nilai OHLCV bar dasar mulai posisi start (bar tanpa Close dibuang)"""
+        tail = self.base.iloc[start:]
+        values = tail[self.columns].to_numpy(np.float64)
+        present = ~np.isnan(values[:, self.columns.index('Close')])
+        return (tail.index, values) if present.all() else (tail.index[present], values[present])
+
+    def _segment(self, name, tail):
+        """Agregat bar dasar (hasil _tail) untuk satu timeframe"""
+        index, values = tail
+        if not len(index):
+            return index, np.empty((0, len(self.columns))), len(self.base)
+        labels, rows, last = _aggregate(bucket_labels(index, name), values, self.columns)
+        return labels, rows, len(self.base) - (len(index) - last)
+
+    def _rebuild(self, name, start):
+        """Mengganti bucket turunan mulai bucket yang memuat bar dasar posisi start"""
+        labels, rows, opened = self._segment(name, self._tail(start))
+        if start and name in self._bars:
+            old_labels, old_rows, _ = self._bars[name]
+            cut = old_labels.searchsorted(labels[0]) if len(labels) else len(old_labels)
+            labels, rows = old_labels[:cut].append(labels), np.concatenate([old_rows[:cut], rows])
+        self._bars[name] = (labels, rows, opened)
+
+    def _append(self, name, tail):
+        """Menggabungkan agregat bar dasar baru (hasil _tail) ke bar turunan terakhir"""
+        labels, rows, opened = self._segment(name, tail)
+        old_labels, old_rows, old_opened = self._bars[name]
+        if not len(labels):
+            return
+        if len(old_labels) and labels[0] == old_labels[-1]:
+            first, last = rows[0].copy(), old_rows[-1]
+            for j, column in enumerate(self.columns):
+                if column == 'Open':
+                    first[j] = last[j]
+                elif column == 'High':
+                    first[j] = np.fmax(last[j], first[j])
+                elif column == 'Low':
+                    first[j] = np.fmin(last[j], first[j])
+                elif column == 'Volume':
+                    first[j] += last[j]
+            rows = np.concatenate([old_rows[:-1], [first], rows[1:]])
+            labels = old_labels[:-1].append(labels)
+            opened = old_opened if len(labels) == len(old_labels) else opened
+        else:
+            rows = np.concatenate([old_rows, rows])
+            labels = old_labels.append(labels)
+        self._bars[name] = (labels, rows, opened)
+
+    def frame(self, interval):
+        """Bar satu timeframe (interval dasar atau turunan) sebagai DataFrame"""
+        if interval == self.interval:
+            return self.base
+        frame = self._frames.get(interval)
+        if frame is None:
+            labels, rows, _ = self._bars[interval]
+            frame = self._frames[interval] = pd.DataFrame(rows, index=labels, columns=self.columns)
+        return frame
+
+    def update(self, bars):
+        """Menambah bar dasar baru.
+
+        Bar dasar dengan timestamp >= bar pertama `bars` diganti (mis. bar
+        terakhir yang belum lengkap); bucket turunan yang terdampak
+        dihitung ulang dari bar dasarnya.
+        """
+        if bars is None or bars.empty:
+            return self
+        keep = self.base.index.searchsorted(bars.index[0])
+        appended = keep == len(self.base)
+        self.base = pd.concat([self.base.iloc[:keep], bars]) if keep else bars
+        self._analyzers.pop(self.interval, None)
+        tail = self._tail(keep) if appended else None
+        for name in self.intervals:
+            opened = self._bars[name][2]
+            if appended:
+                self._append(name, tail)
+            else:
+                self._rebuild(name, opened if keep >= opened else 0)
+            self._frames.pop(name, None)
+            self._analyzers.pop(name, None)
+        return self
+
+    def analyzer(self, interval):
+        """StockAnalyzer (tersimpan) untuk satu timeframe"""
+        analyzer = self._analyzers.get(interval)
+        if analyzer is None:
+            df = self.frame(interval)
+            df = df.iloc[-self.lookback:] if self.lookback else df
+            analyzer = StockAnalyzer(self.ticker, interval=interval, df=df, **self.options)
+            self._analyzers[interval] = analyzer
+        return analyzer
+
+    def analyze(self, outputs=ANALYZE_ALL, intervals=None):
+        """Hasil analisis per timeframe ({interval: result}); bawaan semua timeframe turunan"""
+        intervals = self.intervals if intervals is None else intervals
+        return {name: self.analyzer(name).analyze(*outputs)[0] for name in intervals}
+
+
+def multi_timeframe(pyramid, intervals=None):
+    """Ringkasan sinyal per timeframe untuk result['Multi-Timeframe']"""
+    results = pyramid.analyze(SUMMARY, intervals)
+    out = {}
+    for name, result in results.items():
+        frame = pyramid.frame(name)
+        out[name] = {
+            'Bars': len(frame),
+            'Last Bar': frame.index[-1] if len(frame) else None,
+            'Trend': result['Trend'],
+            'MA Status': result['MA Status'],
+            'MACD Signal': result['MACD Signal'],
+            'RSI Signal': result['RSI Signal'],
+            'Trend Confirmation': result['Indicators Summary']['Trend Confirmation'],
+        }
+    return out
@@ -1,17 +1,251 @@
-from core.technical import StockAnalyzer
-from core.fundamental import get_fundamental_data
-from report.printer import print_analysis
-from visual.plotter import plot_technical_chart
+import argparse
+import json
+import sys
+import time
 
-if __name__ == "__main__":
-    ticker = "ITMG.JK" #input("Enter stock ticker (e.g., AAPL, BBCA.JK): ")
-    result, df = StockAnalyzer(ticker).analyze_all()
+# Modul berat (pandas, yfinance, matplotlib) diimpor di dalam fungsi yang
+# membutuhkannya, agar pemanggilan singkat (--help, mode teks) tetap cepat.
+
+
+def window_item(item):
+    """Satu --window KEY=N sebagai (key, nilai); format atau nilai tidak valid menjadi error argparse"""
+    from core.kernel import resolve_windows
+
+    key, sep, value = item.partition("=")
+    key = key.strip()
+    try:
+        if not sep:
+            raise ValueError("expected KEY=N")
+        number = float(value) if key == "bb_std" else int(value)
+        resolve_windows({key: number})
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"invalid window {item!r}: {e}") from None
+    return key, number
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="analin", description="Analisis teknikal dan fundamental saham")
+    parser.add_argument("tickers", nargs="*", help="ticker, mis. BBCA.JK AAPL (default ITMG.JK, atau semua ticker panel)")
+    parser.add_argument("-p", "--period", default="ytd", help="periode data (ytd, 6mo, 1y, max, ...)")
+    parser.add_argument("-i", "--interval", default="1d", help="interval bar (1d, 1wk, 1h, ...)")
+    parser.add_argument("-f", "--format", choices=["text", "json"], default="text", help="format output")
+    parser.add_argument("--export", metavar="PATH", help="tulis hasil ke file .json/.csv/.parquet (kolumnar)")
+    parser.add_argument("--no-chart", action="store_true", help="tanpa chart (mode teks saja)")
+    parser.add_argument("--chart-dir", help="simpan chart ke direktori ini (headless) alih-alih menampilkannya")
+    parser.add_argument("--no-fundamental", action="store_true", help="lewati data fundamental")
+    parser.add_argument("--offline", action="store_true", help="hanya pakai cache lokal")
+    parser.add_argument("--panel", metavar="DIR", help="baca bar dari PanelStore alih-alih Yahoo")
+    parser.add_argument("--screen", nargs="?", const="", metavar="EXPR",
+                        help="mode screener, mis. \"trend == 'Strong Uptrend' and rsi < 60\"")
+    parser.add_argument("--sort", metavar="COL", help="urutkan hasil screener (menurun), mis. atr_pct")
+    parser.add_argument("--limit", type=int, metavar="N", help="batasi jumlah baris screener")
+    parser.add_argument("--compact", action="store_true", help="simpan bar dan indikator sebagai float32")
+    parser.add_argument("--chunk-size", type=int, metavar="N", help="hitung indikator per N bar (riwayat panjang)")
+    parser.add_argument("--window", action="append", default=[], type=window_item, metavar="KEY=N",
+                        help="ganti jendela indikator, mis. --window rsi=9 --window ma_slow=150")
+    parser.add_argument("--workers", type=int, default=None, help="jumlah proses analisis untuk banyak ticker")
+    parser.add_argument("--metrics", metavar="PATH", help="catat waktu per tahap ke file JSON lines")
+    parser.add_argument("--metrics-prom", metavar="PATH", help="tulis agregat metrik ke file teks Prometheus")
+    parser.add_argument("--bench-startup", type=int, nargs="?", const=5, metavar="N",
+                        help="ukur waktu start-up (N kali per skenario) lalu keluar")
+    return parser.parse_args(argv)
+
+
+def data_source(args):
+    if args.panel:
+        from core.panel import PanelSource
+
+        return PanelSource(args.panel)
+
+    from core.data import YahooSource, BarCache, CachedSource
+
+    return CachedSource(YahooSource(), BarCache(), offline=args.offline)
+
+
+def windows(args):
+    """Override jendela indikator dari --window KEY=N"""
+    return dict(args.window) or None
+
+
+def analyze(args):
+    """Mengembalikan {ticker: (result, df)}"""
+    source = data_source(args)
+    options = {"dtype": "float32" if args.compact else None, "chunk_size": args.chunk_size, "windows": windows(args)}
+    if len(args.tickers) == 1:
+        from core.technical import StockAnalyzer
 
-    if "error" not in result:
-        fundamental = get_fundamental_data(ticker)
-        result["Fundamental"] = fundamental
+        ticker = args.tickers[0]
+        try:
+            return {ticker: StockAnalyzer(ticker, args.period, args.interval, source=source, **options).analyze_all()}
+        except Exception as e:
+            return {ticker: ({"Ticker": ticker, "error": f"{type(e).__name__}: {e}"}, None)}
 
-        print_analysis(result)
-        plot_technical_chart(df, ticker)
+    if args.panel:
+        from core.batch import analyze_panel
+
+        return analyze_panel(args.panel, args.tickers, args.period, max_workers=args.workers,
+                             with_frames=True, options=options)
+
+    from core.batch import analyze_many
+
+    return analyze_many(args.tickers, args.period, args.interval, source=source,
+                        max_workers=args.workers, with_frames=True, options=options)
+
+
+def screen(args):
+    """Mode screener: satu tabel untuk semua ticker"""
+    from core.screener import SUMMARY, Screener
+
+    if args.panel:
+        from core.panel import PanelStore
+
+        screener = Screener.from_panel(PanelStore(args.panel), tickers=args.tickers, windows=windows(args))
     else:
-        print(result["error"])
+        frames = {}
+        for ticker, df in data_source(args).fetch_many(args.tickers, args.period, args.interval):
+            if isinstance(df, Exception):
+                print(f"{ticker}: {type(df).__name__}: {df}", file=sys.stderr)
+            else:
+                frames[ticker] = df
+        screener = Screener.from_frames(frames, windows=windows(args))
+
+    try:
+        table = screener.screen(args.screen or None, sort=args.sort, limit=args.limit)
+    except ValueError as e:
+        print(f"Invalid --screen expression: {e}", file=sys.stderr)
+        return 2
+    if args.export:
+        from report.export import write_frame
+
+        write_frame(table.reset_index(), args.export)
+    if args.format == "json":
+        print(table.reset_index().to_json(orient="records", date_format="iso", indent=2))
+    else:
+        print(table[list(SUMMARY)].to_string(float_format=lambda x: f"{x:,.2f}"))
+    return 0
+
+
+def attach_fundamentals(results, args):
+    from core.fundamental import FundamentalFetcher, get_fundamental_data_many
+
+    tickers = [t for t, (result, _) in results.items() if "error" not in result]
+    fundamentals = get_fundamental_data_many(tickers, fetcher=FundamentalFetcher(offline=args.offline))
+    for ticker, fundamental in fundamentals.items():
+        results[ticker][0]["Fundamental"] = fundamental
+
+
+def show_charts(results, args):
+    frames = {t: df for t, (result, df) in results.items() if "error" not in result}
+    titles = {t: result.get("Fundamental", {}).get("Company") for t, (result, _) in results.items()}
+    if args.chart_dir:
+        from visual.render import render_many
+
+        for ticker, path in render_many(frames, args.chart_dir, titles=titles, max_workers=args.workers).items():
+            print(f" Chart {ticker}: {path}", file=sys.stderr)
+        return
+
+    from visual.plotter import plot_technical_chart
+
+    for ticker, df in frames.items():
+        plot_technical_chart(df, ticker, title=titles.get(ticker))
+
+
+def _jsonable(value):
+    # Skalar NumPy (np.float64, np.int64) dan Timestamp
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+def report(results, args):
+    if args.format == "json":
+        payload = {t: result for t, (result, _) in results.items()}
+        print(json.dumps(payload, default=_jsonable, indent=2))
+        return
+
+    from report.printer import print_analysis
+
+    for ticker, (result, _) in results.items():
+        if "error" in result:
+            print(result["error"], file=sys.stderr)
+        else:
+            print_analysis(result)
+
+
+def bench_startup(repeat):
+    """Median waktu start-up proses baru untuk tiap skenario"""
+    import os
+    import statistics
+    import subprocess
+
+    root = os.path.dirname(os.path.abspath(__file__))
+
+    scenarios = {
+        "python": [sys.executable, "-c", "pass"],
+        "main --help": [sys.executable, __file__, "--help"],
+        "import core.technical": [sys.executable, "-c", "import core.technical"],
+        "import core.fundamental": [sys.executable, "-c", "import core.fundamental"],
+        "import report.printer": [sys.executable, "-c", "import report.printer"],
+        "import visual.plotter": [sys.executable, "-c", "import visual.plotter"],
+        "import yfinance": [sys.executable, "-c", "import yfinance"],
+    }
+    for name, command in scenarios.items():
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run(command, check=True, stdout=subprocess.DEVNULL, cwd=root)
+            times.append(time.perf_counter() - start)
+        print(f" {name:<26} {statistics.median(times) * 1000:8.1f} ms")
+
+
+def run(args):
+    if args.screen is not None:
+        return screen(args)
+
+    results = analyze(args)
+    if not args.no_fundamental:
+        attach_fundamentals(results, args)
+
+    report(results, args)
+    if args.export:
+        from report.export import export
+
+        export(results, args.export)
+    if not args.no_chart:
+        show_charts(results, args)
+    return 1 if any("error" in result for result, _ in results.values()) else 0
+
+
+def enable_metrics(args):
+    """Sink dipasang lewat environment agar worker process pool ikut mencatat"""
+    import os
+
+    if args.metrics:
+        os.environ["ANALIN_METRICS"] = os.path.abspath(args.metrics)
+    if args.metrics_prom:
+        os.environ["ANALIN_METRICS_PROM"] = os.path.abspath(args.metrics_prom)
+
+    from core import metrics
+
+    if not metrics.enabled():
+        metrics.enable_from_env()
+    return metrics
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.tickers and not args.panel:
+        args.tickers = ["ITMG.JK"]
+    if args.bench_startup:
+        bench_startup(args.bench_startup)
+        return 0
+
+    if args.metrics or args.metrics_prom:
+        metrics = enable_metrics(args)
+        try:
+            return run(args)
+        finally:
+            metrics.disable()
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import os
+
+from dataclasses import fields
+
+import pandas as pd
+
+from core import signals
+from core.records import TechnicalRecord, FundamentalRecord
+
+# Kolom label sinyal -> kategori tetap, agar kode kategori konsisten antar file
+CATEGORIES = {
+    'trend': signals.TREND_LABELS,
+    'ma_status': signals.MA_STATUS_LABELS,
+    'macd_signal': signals.MACD_LABELS,
+    'rsi_signal': signals.RSI_LABELS,
+    'stochastic_signal': signals.STOCHASTIC_LABELS,
+    'volume_signal': signals.VOLUME_LABELS,
+    'vwap_signal': signals.VWAP_LABELS,
+    'volatility': signals.VOLATILITY_LABELS,
+}
+
+FORMATS = ('json', 'csv', 'parquet')
+
+
+def to_frame(results):
+    """Satu tabel kolumnar dari mapping ticker -> result.
+
+    Nilai mapping boleh berupa dict result (dengan 'Fundamental' opsional)
+    atau tuple (result, df) dari analyze_many(with_frames=True). Ticker yang
+    gagal ({'error': ...}) dilewati. Kolom diisi dalam satu lintasan.
+    """
+    technical = [f.name for f in fields(TechnicalRecord)]
+    fundamental = [f.name for f in fields(FundamentalRecord)]
+    columns = {name: [] for name in technical}
+    fundamentals = {name: [] for name in fundamental}
+    has_fundamental = False
+
+    for result in results.values():
+        if isinstance(result, tuple):
+            result = result[0]
+        if 'error' in result:
+            continue
+        record = TechnicalRecord.from_result(result)
+        for name in technical:
+            columns[name].append(getattr(record, name))
+
+        summary = result.get('Fundamental')
+        has_fundamental = has_fundamental or (summary is not None and 'error' not in summary)
+        record = FundamentalRecord.from_summary(summary if summary and 'error' not in summary else {})
+        for name in fundamental:
+            fundamentals[name].append(getattr(record, name))
+
+    if has_fundamental:
+        columns.update(fundamentals)
+    frame = pd.DataFrame(columns)
+    for name, labels in CATEGORIES.items():
+        frame[name] = pd.Categorical(frame[name], categories=labels)
+    return frame
+
+
+def export(results, path, fmt=None):
+    """Menulis hasil satu universe ke JSON/CSV/Parquet (format dari ekstensi jika fmt kosong)"""
+    return write_frame(to_frame(results), path, fmt)
+
+
+def write_frame(frame, path, fmt=None):
+    """Menulis tabel kolumnar apa pun (mis. hasil screener) ke JSON/CSV/Parquet"""
+    fmt = fmt or os.path.splitext(path)[1].lstrip('.').lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt!r} (expected one of {', '.join(FORMATS)})")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    if fmt == 'json':
+        frame.to_json(path, orient='records', indent=2, date_format='iso')
+    elif fmt == 'csv':
+        frame.to_csv(path, index=False)
+    else:
+        frame.to_parquet(path, index=False)
+    return frame
@@ -1,30 +1,108 @@
+def format_number(value):
+    if value is None:
+        return "N/A"
+    abs_value = abs(value)
+    if abs_value >= 1_000_000_000_000:
+        return f"{value/1_000_000_000_000:.2f}T"
+    elif abs_value >= 1_000_000_000:
+        return f"{value/1_000_000_000:.2f}B"
+    elif abs_value >= 1_000_000:
+        return f"{value/1_000_000:.2f}M"
+    else:
+        return str(value)
+
+
+def _text(value):
+    return "N/A" if value is None else value
+
+
+def _round(value):
+    return round(value, 2) if value else "N/A"
+
+
+def _decimal(value):
+    return f"{round(value, 2)}" if value else "N/A"
+
+
+def _percent(value):
+    return f"{round(value, 2)}%" if value else "N/A"
+
+
+def _fraction_percent(value):
+    return f"{round(value * 100, 2)}%" if value else "N/A"
+
+
+# Format tampilan tiap nilai mentah dari core.fundamental.summarize
+FUNDAMENTAL_FORMATS = {
+    "Company": _text,
+    "Symbol": _text,
+    "Sector": _text,
+    "Industry": _text,
+    "Recommendation": _text,
+    "error": _text,
+    "Book Value per Share (BVPS)": _decimal,
+    "Price to Book Value (PBV)": _decimal,
+    "Trailing P/E": _round,
+    "Forward P/E": _round,
+    "EPS (TTM)": _round,
+    "Dividend Yield": _percent,
+    "Payout Ratio": _fraction_percent,
+    "ROE": _fraction_percent,
+    "ROA": _fraction_percent,
+    "Debt to Equity": lambda value: round(value / 100, 2) if value else "N/A",
+    "Current Ratio": _round,
+    "Quick Ratio": _round,
+    "Gross Margin": _fraction_percent,
+    "Operating Margin": _fraction_percent,
+    "Profit Margin": _fraction_percent,
+    "Beta": _round,
+}
+
+
+def format_fundamental(key, value):
+    return FUNDAMENTAL_FORMATS.get(key, format_number)(value)
+
+
 def print_analysis(result):
+    entry_low, entry_high = result['Entry Zone']
+    upside = round(result['Potential Upside'], 2)
+    downside = round(result['Potential Downside'], 2)
+
     print(f"\n TECHNICAL ANALYSIS RESULT FOR: {result['Ticker']}")
     print("="*80)
     print(f" Current Price: {result['Current Price']}")
     print(f" Trend: {result['Trend']}")
     print(f" Moving Averages: {result['MA Status']}")
-    print(f" RSI (14): {result['RSI (14)']} – {result['RSI Signal']}")
+    print(f" RSI (14): {round(result['RSI (14)'], 2)} – {result['RSI Signal']}")
     print(f" MACD: {result['MACD Signal']}")
     print(f" Stochastic: {result['Stochastic Signal']}")
     print(f" Volume: {result['Volume Signal']}")
     print(f" VWAP: {result['VWAP Signal']}")
     print("\n Support/Resistance:")
-    print(f" - Immediate Support: {result['Support Level']}")
-    print(f" - Immediate Resistance: {result['Resistance Level']}")
+    print(f" - Immediate Support: {round(result['Support Level'], 2)}")
+    print(f" - Immediate Resistance: {round(result['Resistance Level'], 2)}")
     print(" - Fibonacci Levels:")
     for level, price in result['Fibonacci Levels'].items():
         print(f"   {level}: {round(price, 2)}")
-    print(f"\n Potential Upside: {result['Potential Upside']}")
-    print(f" Potential Downside: {result['Potential Downside']}")
-    print(f" Entry Range: {result['Entry Zone']}")
-    print(f" Target 1: {result['Target 1']} | Target 2: {result['Target 2']} | Stop Loss: {result['Stop Loss']}")
+    if 'Price Zones' in result:
+        print(" - Price Zones (pivot clusters):")
+        for side, levels in result['Price Zones'].items():
+            print(f"   {side}: {', '.join(str(round(price, 2)) for price in levels) or 'N/A'}")
+    if 'Multi-Timeframe' in result:
+        print(f"\n Multi-Timeframe: {result['Timeframe Alignment']}")
+        for interval, values in result['Multi-Timeframe'].items():
+            print(f" - {interval} ({values['Bars']} bars): {values['Trend']}, {values['MACD Signal']}, "
+                  f"{values['RSI Signal']}")
+    print(f"\n Potential Upside: {upside}% to {round(result['Target 1'], 2)}")
+    print(f" Potential Downside: -{downside}% to {round(result['Stop Loss'], 2)}")
+    print(f" Entry Range: {round(entry_low, 2)} - {round(entry_high, 2)}")
+    print(f" Target 1: {round(result['Target 1'], 2)} | Target 2: {round(result['Target 2'], 2)} | Stop Loss: < {round(result['Stop Loss'], 2)}")
     print("\n Indicators Summary:")
     print(f" - Volume Confirmation: {result['Indicators Summary']['Volume Confirmation']}")
     print(f" - Volatility: {result['Indicators Summary']['Volatility']}")
     print("\n FUNDAMENTAL SNAPSHOT:")
-    for key, val in result["Fundamental"].items():
-        print(f" - {key}: {val}")
+    for key, val in result.get("Fundamental", {}).items():
+        print(f" - {key}: {format_fundamental(key, val)}")
     print("\nDescription:")
     print(" - MA (Moving Averages): Used to smooth price data to identify the direction of the trend.")
     print(" - Ichimoku Cloud: Combines multiple indicators to show support, resistance, trend, and momentum.")
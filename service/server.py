@@ -0,0 +1,404 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from core import metrics
+
+# Layanan analisis lokal (HTTP/JSON di atas asyncio, tanpa dependensi
+# tambahan). Bar, fundamental dan hasil analisis disimpan hangat di memori
+# sehingga dashboard yang meminta ticker yang sama mendapat jawaban dari
+# cache tanpa impor, sesi, download maupun komputasi ulang.
+
+MISSING = object()
+
+STATUS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class LRUCache:
+    """Cache LRU dengan TTL (detik) per entri; dipakai dari satu event loop"""
+
+    def __init__(self, name, maxsize=1024, ttl=None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self.data.get(key)
+        if entry is not None and (self.ttl is None or time.monotonic() - entry[0] < self.ttl):
+            self.data.move_to_end(key)
+            self.hits += 1
+            metrics.count('service_cache', cache=self.name, result='hit')
+            return entry[1]
+        if entry is not None:
+            del self.data[key]
+        self.misses += 1
+        metrics.count('service_cache', cache=self.name, result='miss')
+        return MISSING
+
+    def set(self, key, value):
+        self.data[key] = (time.monotonic(), value)
+        self.data.move_to_end(key)
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        return {'size': len(self.data), 'maxsize': self.maxsize, 'ttl': self.ttl,
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+def _plain(value):
+    """Nilai hasil analisis -> tipe JSON standar (NaN menjadi null)"""
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _encode(value):
+    return json.dumps(_plain(value), separators=(',', ':')).encode()
+
+
+def _init_worker():
+    # Impor dibayar sekali saat worker dibuat, bukan pada request pertama
+    import core.technical  # noqa: F401
+
+
+def _analyze(ticker, df):
+    from core.technical import StockAnalyzer
+
+    return StockAnalyzer(ticker, df=df, inline=False).analyze_all()[0]
+
+
+def _screen(frames, where, sort, ascending, limit):
+    from core.screener import Screener
+
+    table = Screener.from_frames(frames).screen(where, sort=sort, ascending=ascending, limit=limit)
+    return table.reset_index().to_json(orient='records', date_format='iso').encode()
+
+
+class AnalysisService:
+    """Cache hangat dan penggabungan request untuk analisis per ticker.
+
+    Request bersamaan untuk kunci yang sama menunggu satu task yang sama.
+    Fetch dan fundamental berjalan di thread pool, analisis di process pool
+    (max_workers=0: di thread pool yang sama). Hasil analisis disimpan
+    sudah dalam bentuk JSON sehingga request yang kena cache hanya menulis
+    bytes ke socket.
+    """
+
+    def __init__(self, source, fetcher=None, max_workers=None, bar_ttl=300, fundamental_ttl=900, max_entries=1024):
+        self.source = source
+        self.fetcher = fetcher
+        self.bars = LRUCache('bars', max_entries, bar_ttl)
+        self.results = LRUCache('results', max_entries, bar_ttl)
+        self.fundamentals = LRUCache('fundamentals', max_entries, fundamental_ttl)
+        self.io = ThreadPoolExecutor(max_workers=16)
+        if max_workers == 0:
+            self.cpu = self.io
+        else:
+            self.cpu = ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(), initializer=_init_worker)
+        self._inflight = {}
+        self.started = time.time()
+        self.requests = 0
+        self.coalesced = 0
+
+    def close(self):
+        self.cpu.shutdown(cancel_futures=True)
+        self.io.shutdown(cancel_futures=True)
+
+    async def _once(self, key, load):
+        """Menjalankan load() sekali untuk semua pemanggil bersamaan dengan kunci yang sama"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(load())
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+            metrics.count('service_coalesced')
+        # shield: pemanggil yang terputus tidak membatalkan task milik pemanggil lain
+        return await asyncio.shield(task)
+
+    async def _cached(self, cache, key, compute):
+        value = cache.get(key)
+        if value is not MISSING:
+            return value
+
+        async def load():
+            value = await compute()
+            cache.set(key, value)
+            return value
+
+        return await self._once((cache.name, key), load)
+
+    def _run(self, executor, fn, *args):
+        return asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+    async def frame(self, ticker, period='ytd', interval='1d'):
+        """Bar OHLCV (DataFrame) dari cache atau sumber data"""
+        async def compute():
+            df = await self._run(self.io, self.source.fetch, ticker, period, interval)
+            if df is None or df.empty:
+                raise ValueError(f"Unable to retrieve stock data for {ticker}")
+            return df
+        return await self._cached(self.bars, (ticker, period, interval), compute)
+
+    async def fundamental(self, ticker):
+        """Ringkasan fundamental (dict) dari cache atau FundamentalFetcher"""
+        async def compute():
+            from core.fundamental import get_fundamental_data
+
+            return await self._run(self.io, get_fundamental_data, ticker, self.fetcher)
+        return await self._cached(self.fundamentals, ticker, compute)
+
+    async def analysis(self, ticker, period='ytd', interval='1d', fundamental=False):
+        """Hasil analyze_all sebagai bytes JSON"""
+        async def compute():
+            df = await self.frame(ticker, period, interval)
+            result, collected = await self._run(self.cpu, metrics.traced, _analyze, ticker, df)
+            metrics.merge(collected)
+            if fundamental:
+                try:
+                    result['Fundamental'] = await self.fundamental(ticker)
+                except Exception as e:
+                    result['Fundamental'] = {'Symbol': ticker, 'error': f"{type(e).__name__}: {e}"}
+            return _encode(result)
+        return await self._cached(self.results, (ticker, period, interval, fundamental), compute)
+
+    async def screen(self, tickers, period='ytd', interval='1d', where=None, sort=None, ascending=False, limit=None):
+        """Screener atas ticker yang diminta (bar diambil dari cache)"""
+        frames = await asyncio.gather(*(self.frame(t, period, interval) for t in tickers), return_exceptions=True)
+        frames = {t: df for t, df in zip(tickers, frames) if not isinstance(df, Exception)}
+        if not frames:
+            # Error data (bukan query): dilaporkan sebagai 404 seperti ticker tunggal
+            raise ValueError(f"Unable to retrieve stock data for {', '.join(tickers)}")
+        return await self._run(self.cpu, _screen, frames, where, sort, ascending, limit)
+
+    def stats(self):
+        return {
+            'uptime': time.time() - self.started,
+            'requests': self.requests,
+            'coalesced': self.coalesced,
+            'inflight': len(self._inflight),
+            'caches': {cache.name: cache.stats() for cache in (self.bars, self.results, self.fundamentals)},
+        }
+
+
+def _flag(query, name):
+    return query.get(name, ['0'])[-1].lower() in ('1', 'true', 'yes')
+
+
+def _integer(query, name):
+    """Parameter bilangan bulat >= 0 (bawaan 0); nilai tidak valid -> 400"""
+    value = query.get(name, ['0'])[-1]
+    try:
+        number = int(value)
+    except ValueError:
+        number = -1
+    if number < 0:
+        raise HTTPError(400, f"Parameter '{name}' must be a non-negative integer, got {value!r}")
+    return number
+
+
+async def route(service, method, target):
+    """Mengembalikan (status, body) untuk satu request"""
+    if method not in ('GET', 'HEAD'):
+        raise HTTPError(405, f"Method {method} not allowed")
+    url = urlsplit(target)
+    query = parse_qs(url.query)
+    parts = [unquote(p) for p in url.path.strip('/').split('/') if p]
+    period = query.get('period', ['ytd'])[-1]
+    interval = query.get('interval', ['1d'])[-1]
+
+    if parts == ['health']:
+        return 200, b'{"status":"ok"}'
+    if parts == ['stats']:
+        return 200, _encode(service.stats())
+    if len(parts) == 2 and parts[0] == 'analysis':
+        return 200, await service.analysis(parts[1], period, interval, _flag(query, 'fundamental'))
+    if len(parts) == 2 and parts[0] == 'fundamental':
+        return 200, _encode(await service.fundamental(parts[1]))
+    if len(parts) == 2 and parts[0] == 'bars':
+        df = await service.frame(parts[1], period, interval)
+        limit = _integer(query, 'limit')
+        df = df.tail(limit) if limit else df
+        return 200, df.reset_index(names='Date').to_json(orient='records', date_format='iso').encode()
+    if parts == ['screen']:
+        from core.expressions import validate
+        from core.screener import COLUMNS
+
+        tickers = [t for t in ','.join(query.get('tickers', [])).split(',') if t]
+        if not tickers:
+            raise HTTPError(400, "Parameter 'tickers' is required")
+        limit = _integer(query, 'limit') or None
+        where, sort = query.get('where', [None])[-1], query.get('sort', [None])[-1]
+        # Diperiksa sebelum data diambil: where tidak pernah sampai ke DataFrame.query bila tidak valid
+        if where is not None:
+            try:
+                validate(where, COLUMNS)
+            except ValueError as e:
+                raise HTTPError(400, str(e)) from None
+        if sort is not None and sort not in COLUMNS:
+            raise HTTPError(400, f"Unknown sort column: {sort!r}")
+        return 200, await service.screen(tickers, period, interval, where, sort, _flag(query, 'ascending'), limit)
+    raise HTTPError(404, f"No route for {url.path}")
+
+
+async def _respond(service, method, target):
+    service.requests += 1
+    with metrics.span('service_request', method=method) as span:
+        try:
+            status, body = await route(service, method, target)
+        except HTTPError as e:
+            status, body = e.status, _encode({'error': str(e)})
+        except (ValueError, KeyError, FileNotFoundError) as e:
+            # Ticker atau data tidak ada; parameter tidak valid sudah menjadi HTTPError(400)
+            status, body = 404, _encode({'error': f"{type(e).__name__}: {e}"})
+        except Exception as e:
+            status, body = 500, _encode({'error': f"{type(e).__name__}: {e}"})
+        span.set(status=status, bytes=len(body))
+    return status, body
+
+
+async def handle(service, reader, writer):
+    """Satu koneksi HTTP/1.1 (keep-alive, tanpa body request)"""
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                method, target, version = line.decode('latin-1').split()
+            except ValueError:
+                break
+            headers = {}
+            while True:
+                header = await reader.readline()
+                if header in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = header.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            if int(headers.get('content-length') or 0):
+                await reader.readexactly(int(headers['content-length']))
+
+            status, body = await _respond(service, method, target)
+            keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+            head = (
+                f"HTTP/1.1 {status} {STATUS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+            ).encode()
+            writer.write(head if method == 'HEAD' else head + body)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def serve(service, host='127.0.0.1', port=8765, warm=(), period='ytd', interval='1d'):
+    """Menjalankan server sampai dihentikan; `warm` dianalisis lebih dulu di latar belakang"""
+    server = await asyncio.start_server(lambda r, w: handle(service, r, w), host, port)
+    print(f" Serving on http://{host}:{port}", file=sys.stderr)
+    warmup = [asyncio.ensure_future(service.analysis(t, period, interval)) for t in warm]
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        for task in warmup:
+            task.cancel()
+
+
+def data_source(args):
+    """Sumber data dari opsi CLI: sintetis, file lokal, panel, atau Yahoo (dengan cache disk)"""
+    if args.synthetic:
+        from bench.synthetic import SyntheticSource
+
+        return SyntheticSource(args.synthetic)
+    if args.data:
+        from core.data import FileSource
+
+        return FileSource(args.data)
+    if args.panel:
+        from core.panel import PanelSource
+
+        return PanelSource(args.panel)
+
+    from core.data import BarCache, CachedSource, YahooSource
+
+    return CachedSource(YahooSource(), BarCache(), offline=args.offline)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m service.server", description="Layanan analisis HTTP/JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="proses analisis (0 = di thread)")
+    parser.add_argument("--offline", action="store_true", help="hanya pakai cache lokal (bar dan fundamental)")
+    parser.add_argument("--data", metavar="DIR", help="sumber data file lokal (FileSource)")
+    parser.add_argument("--panel", metavar="DIR", help="sumber data PanelStore")
+    parser.add_argument("--synthetic", type=int, nargs="?", const=500, metavar="BARS",
+                        help="sumber data sintetis (tanpa jaringan) untuk uji lokal")
+    parser.add_argument("--bar-ttl", type=float, default=300, help="umur bar dan hasil di memori (detik)")
+    parser.add_argument("--cache-size", type=int, default=1024, help="entri maksimum per cache (LRU)")
+    parser.add_argument("--warm", default="", help="ticker yang dianalisis saat start, dipisah koma")
+    args = parser.parse_args(argv)
+
+    from core.fundamental import FundamentalFetcher
+
+    service = AnalysisService(
+        data_source(args),
+        fetcher=FundamentalFetcher(offline=args.offline or bool(args.synthetic)),
+        max_workers=args.workers,
+        bar_ttl=args.bar_ttl,
+        max_entries=args.cache_size,
+    )
+    try:
+        asyncio.run(serve(service, args.host, args.port, [t for t in args.warm.split(',') if t]))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
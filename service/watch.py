@@ -0,0 +1,45 @@
+import argparse
+import asyncio
+import sys
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m service.watch", description="Watchlist dan alert dari feed bar")
+    parser.add_argument("rules", help="file JSON berisi daftar aturan {name, when, where, cooldown, message}")
+    parser.add_argument("--replay", metavar="PATH", required=True, help="file rekaman bar (CSV/JSON/Parquet)")
+    parser.add_argument("--delay", type=float, default=0.0, help="jeda antar waktu bar saat replay (detik)")
+    parser.add_argument("--panel", metavar="DIR", help="hangatkan state dari PanelStore sebelum feed")
+    parser.add_argument("--min-bars", type=int, default=50, help="bar minimum per ticker sebelum alert dipicu")
+    parser.add_argument("--jsonl", metavar="PATH", help="tulis alert ke file JSON lines")
+    parser.add_argument("--quiet", action="store_true", help="tanpa output teks per alert")
+    parser.add_argument("--window", action="append", default=[], metavar="KEY=N", help="ganti jendela indikator")
+    args = parser.parse_args(argv)
+
+    from core.alerts import PrintSink, ReplayFeed, WatchlistEngine, load_rules
+    from core.metrics import JsonLinesSink
+    from main import windows
+
+    sinks = [] if args.quiet else [PrintSink()]
+    if args.jsonl:
+        sinks.append(JsonLinesSink(args.jsonl))
+    engine = WatchlistEngine(load_rules(args.rules), sinks, windows=windows(args), min_bars=args.min_bars)
+
+    if args.panel:
+        from core.panel import PanelStore
+
+        store = PanelStore(args.panel)
+        engine.warm({ticker: store.frame(ticker) for ticker in store.tickers})
+
+    try:
+        stats = asyncio.run(engine.run(ReplayFeed(args.replay, delay=args.delay)))
+    except KeyboardInterrupt:
+        stats = engine.stats
+    finally:
+        engine.close()
+    print(f" {stats['bars']} bars, {len(engine.analyzers)} tickers, {stats['alerts']} alerts, "
+          f"{stats['stale']} stale bars skipped", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+import pytest
+
+from core.alerts import Rule, _predicate
+
+DUNDER = "().__class__.__base__.__subclasses__()[0].__init__.__globals__['sys'].modules['os'].getpid() > 0"
+
+
+@pytest.mark.parametrize('expression', [
+    DUNDER,
+    "ticker.__class__ is not None",
+    "trend[0] == 'U'",
+    "macd_signal.startswith('Bullish')",
+    "(lambda: 1)() == 1",
+    "[x for x in (1,)] == [1]",
+    "__import__('os') is None",
+    "9 ** 9 ** 9 > 0",
+])
+def test_rule_rejects_escapes(expression):
+    with pytest.raises(ValueError):
+        _predicate(expression)
+
+
+def test_rule_rejects_unknown_field():
+    with pytest.raises(ValueError, match="Unknown field"):
+        Rule('bad', "open_interest > 0")
+
+
+def test_rule_evaluates_allowed_syntax():
+    values = {'rsi': 25.0, 'macd_signal': "Bullish (MACD > Signal)", 'trend': "Uptrend", 'atr_pct': -3.2}
+    assert _predicate("rsi < 30 and 'Bullish' in macd_signal")(values)
+    assert _predicate("abs(atr_pct) > 3 and trend in ('Uptrend', 'Sideways')")(values)
+    assert not _predicate("max(rsi, 40) < 30 or not trend == 'Uptrend'")(values)
@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+from bench.synthetic import MemorySource, synthetic_universe
+from core.batch import analyze_many, run_chunks
+
+
+def _square(chunk, offset):
+    if 'boom' in chunk:
+        raise RuntimeError("boom")
+    if 'exit' in chunk:
+        os._exit(1)
+    return [x * x + offset for x in chunk]
+
+
+def _failed(chunk, e):
+    return [type(e).__name__] * len(chunk)
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_run_chunks_isolates_failed_chunk(max_workers):
+    out = run_chunks(_square, [[1, 2], ['boom'], [3]], (1,), max_workers, _failed)
+    assert out == [[2, 5], ['RuntimeError'], [10]]
+
+
+def test_run_chunks_survives_dead_worker():
+    out = run_chunks(_square, [['exit']], (0,), 2, _failed)
+    assert out == [['BrokenProcessPool']]
+
+
+def test_run_chunks_without_failed_raises():
+    with pytest.raises(RuntimeError):
+        run_chunks(_square, [['boom']], (0,), 1)
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_analyze_many_marks_bad_tickers(max_workers):
+    frames = synthetic_universe(3, 300)
+    frames['BAD'] = frames['SYN0000'].iloc[:0]
+    results = analyze_many(list(frames), source=MemorySource(frames), max_workers=max_workers, chunksize=2)
+    assert list(results) == list(frames)
+    assert 'error' in results['BAD'] and all('error' not in results[t] for t in frames if t != 'BAD')
+
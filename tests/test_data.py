@@ -0,0 +1,101 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench.synthetic import synthetic_ohlcv
+from core.data import BarCache, CachedSource, DataSource, FileSource
+
+
+class Recording(DataSource):
+    """FileSource yang mencatat setiap fetch (start) yang sampai ke sumber"""
+
+    def __init__(self, root):
+        self.inner = FileSource(root)
+        self.calls = []
+
+    def fetch(self, ticker, period='ytd', interval='1d', start=None):
+        self.calls.append(start)
+        return self.inner.fetch(ticker, period=period, interval=interval, start=start)
+
+
+@pytest.fixture
+def history():
+    return synthetic_ohlcv(300, seed=3)
+
+
+def write_fixture(root, df, ticker='TEST'):
+    os.makedirs(root, exist_ok=True)
+    df.to_parquet(os.path.join(root, f"{ticker}_1d.parquet"))
+
+
+def test_cache_miss_fetches_and_stores(tmp_path, history):
+    write_fixture(tmp_path / 'files', history)
+    source = Recording(tmp_path / 'files')
+    cached = CachedSource(source, BarCache(tmp_path / 'cache'))
+    df = cached.fetch('TEST', period='max')
+    pd.testing.assert_frame_equal(df, history, check_freq=False)
+    assert source.calls == [None]
+    stored, meta = BarCache(tmp_path / 'cache').load('TEST', '1d')
+    pd.testing.assert_frame_equal(stored, history, check_freq=False)
+    assert meta['start'] is None
+    assert not [name for name in os.listdir(tmp_path / 'cache' / '1d') if name.endswith('.tmp')]
+
+
+def test_incremental_merge_fetches_from_last_bar(tmp_path, history):
+    write_fixture(tmp_path / 'files', history.iloc[:250])
+    source = Recording(tmp_path / 'files')
+    cached = CachedSource(source, BarCache(tmp_path / 'cache'))
+    cached.fetch('TEST', period='max')
+
+    write_fixture(tmp_path / 'files', history)
+    df = cached.fetch('TEST', period='max')
+    assert source.calls[1] == history.index[249]
+    pd.testing.assert_frame_equal(df, history, check_freq=False)
+
+
+def test_overlapping_last_bar_is_replaced(tmp_path, history):
+    partial = history.iloc[:250].copy()
+    partial.iloc[-1, partial.columns.get_loc('Close')] = 1.0  # bar terakhir belum lengkap
+    write_fixture(tmp_path / 'files', partial)
+    cached = CachedSource(Recording(tmp_path / 'files'), BarCache(tmp_path / 'cache'))
+    assert cached.fetch('TEST', period='max')['Close'].iloc[-1] == 1.0
+
+    write_fixture(tmp_path / 'files', history.iloc[:260])
+    df = cached.fetch('TEST', period='max')
+    assert df.index.is_unique and len(df) == 260
+    assert df['Close'].iloc[249] == history['Close'].iloc[249]
+
+
+def test_max_age_serves_cache_without_fetching(tmp_path, history):
+    write_fixture(tmp_path / 'files', history)
+    source = Recording(tmp_path / 'files')
+    cached = CachedSource(source, BarCache(tmp_path / 'cache'), max_age=3600)
+    cached.fetch('TEST', period='max')
+    cached.fetch('TEST', period='max')
+    assert len(source.calls) == 1
+
+
+def test_offline_miss_and_hit(tmp_path, history):
+    offline = CachedSource(Recording(tmp_path / 'files'), BarCache(tmp_path / 'cache'), offline=True)
+    with pytest.raises(ValueError):
+        offline.fetch('TEST', period='max')
+    BarCache(tmp_path / 'cache').store('TEST', '1d', history, {'start': None, 'fetched': 0})
+    assert len(offline.fetch('TEST', period='max')) == len(history)
+    assert offline.source.calls == []
+
+
+def test_file_source_period_is_relative_to_last_bar(tmp_path, history):
+    write_fixture(tmp_path, history)
+    df = FileSource(tmp_path).fetch('TEST', period='1mo')
+    last = history.index[-1].tz_localize(None).normalize()
+    assert df.index[0].tz_localize(None) >= last - pd.DateOffset(months=1)
+    assert np.array_equal(df['Close'].to_numpy(), history['Close'].to_numpy()[-len(df):])
+    with pytest.raises(FileNotFoundError):
+        FileSource(tmp_path).fetch('MISSING')
+
+
+def test_data_source_is_abstract():
+    with pytest.raises(TypeError):
+        DataSource()
@@ -0,0 +1,76 @@
+import math
+
+import pandas as pd
+import pytest
+
+from bench.synthetic import MemorySource, synthetic_fundamental_payloads, synthetic_universe
+from core import signals
+from core.batch import analyze_many
+from core.fundamental import summarize
+from core.records import FundamentalRecord, TechnicalRecord
+from report.export import CATEGORIES, export, to_frame
+
+
+@pytest.fixture(scope='module')
+def results():
+    frames = synthetic_universe(3, 300)
+    frames['BAD'] = frames['SYN0000'].iloc[:0]
+    return analyze_many(list(frames), source=MemorySource(frames), max_workers=1, with_frames=True)
+
+
+def test_technical_record_from_result(results):
+    result = results['SYN0001'][0]
+    record = TechnicalRecord.from_result(result)
+    assert record.ticker == 'SYN0001'
+    assert record.price == result['Current Price'] and record.trend == result['Trend']
+    assert (record.entry_low, record.entry_high) == tuple(result['Entry Zone'])
+    assert record.fib_618 == result['Fibonacci Levels']['61.8%']
+    assert record.trend_confirmed == (result['Indicators Summary']['Trend Confirmation'] == "Confirmed")
+    # Key levels diratakan ke tiga kolom, sisanya NaN
+    levels = result['Key Support Levels'][:3]
+    padded = [record.support1, record.support2, record.support3]
+    assert padded[:len(levels)] == levels and all(math.isnan(v) for v in padded[len(levels):])
+
+
+def test_fundamental_record_from_summary():
+    summary = summarize(synthetic_fundamental_payloads())
+    record = FundamentalRecord.from_summary(summary)
+    assert record.symbol == 'SYN.JK' and record.roe == 0.24 and record.market_cap == 3.1e13
+    empty = FundamentalRecord.from_summary({'Beta': None})
+    assert empty.company is None and math.isnan(empty.beta) and math.isnan(empty.market_cap)
+
+
+def test_to_frame_skips_errors_and_uses_categories(results):
+    frame = to_frame(results)
+    assert list(frame['ticker']) == ['SYN0000', 'SYN0001', 'SYN0002']
+    assert 'roe' not in frame
+    for name, labels in CATEGORIES.items():
+        assert list(frame[name].cat.categories) == list(labels)
+    assert frame['trend'].isin(signals.TREND_LABELS).all()
+
+
+def test_to_frame_with_fundamentals(results):
+    summary = summarize(synthetic_fundamental_payloads())
+    with_fundamental = {
+        'SYN0000': {**results['SYN0000'][0], 'Fundamental': summary},
+        'SYN0001': {**results['SYN0001'][0], 'Fundamental': {'Symbol': 'SYN0001', 'error': 'ValueError: x'}},
+    }
+    frame = to_frame(with_fundamental)
+    assert frame['roe'].iloc[0] == 0.24 and math.isnan(frame['roe'].iloc[1])
+
+
+@pytest.mark.parametrize('fmt', ['json', 'csv', 'parquet'])
+def test_export_round_trip(tmp_path, results, fmt):
+    if fmt == 'parquet':
+        pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'out' / f'universe.{fmt}')
+    frame = export(results, path)
+    loaded = pd.read_json(path) if fmt == 'json' else pd.read_csv(path) if fmt == 'csv' else pd.read_parquet(path)
+    assert list(loaded.columns) == list(frame.columns)
+    assert list(loaded['ticker']) == list(frame['ticker'])
+    pd.testing.assert_series_equal(loaded['stop_loss'], frame['stop_loss'], check_exact=False, rtol=1e-9)
+
+
+def test_export_rejects_unknown_format(tmp_path, results):
+    with pytest.raises(ValueError):
+        export(results, str(tmp_path / 'universe.xlsx'))
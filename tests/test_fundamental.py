@@ -0,0 +1,115 @@
+import pytest
+
+from bench.synthetic import synthetic_fundamental_payloads
+from core import fundamental
+from core.fundamental import DAY, MINUTE, FundamentalCache, FundamentalFetcher, get_fundamental_data_many
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Fetcher(FundamentalFetcher):
+    """FundamentalFetcher tanpa jaringan: payload sintetis, field di `failing` gagal"""
+
+    def __init__(self, root, **kwargs):
+        super().__init__(cache=FundamentalCache(str(root)), **kwargs)
+        self.payloads = {**synthetic_fundamental_payloads(), 'quote': {'currentPrice': 28000.0}}
+        self.calls = []
+        self.failing = set()
+
+    def _fetch_field(self, ticker, field):
+        self.calls.append(field)
+        if field in self.failing:
+            raise ConnectionError(f"{field} unavailable")
+        return self.payloads[field]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(fundamental.time, 'time', clock)
+    return clock
+
+
+def test_fetch_then_cache_hit(tmp_path, clock):
+    fetcher = Fetcher(tmp_path)
+    assert fetcher.fetch('SYN.JK')['quote'] == {'currentPrice': 28000.0}
+    assert sorted(fetcher.calls) == sorted(fundamental.FIELDS)
+    fetcher.calls.clear()
+    clock.now += 10 * MINUTE
+    fetcher.fetch('SYN.JK')
+    assert fetcher.calls == []
+
+
+def test_only_expired_fields_refetched(tmp_path, clock):
+    fetcher = Fetcher(tmp_path)
+    fetcher.fetch('SYN.JK')
+    fetcher.calls.clear()
+    clock.now += 20 * MINUTE
+    fetcher.fetch('SYN.JK')
+    assert fetcher.calls == ['quote']
+    fetcher.calls.clear()
+    clock.now += DAY
+    fetcher.fetch('SYN.JK')
+    assert sorted(fetcher.calls) == ['info', 'quote']
+
+
+def test_ttl_override(tmp_path, clock):
+    fetcher = Fetcher(tmp_path, ttl={'quote': 0})
+    fetcher.fetch('SYN.JK')
+    fetcher.calls.clear()
+    fetcher.fetch('SYN.JK')
+    assert fetcher.calls == ['quote']
+
+
+def test_failed_refresh_keeps_cached_payload(tmp_path, clock):
+    fetcher = Fetcher(tmp_path)
+    fetcher.fetch('SYN.JK')
+    clock.now += 8 * DAY
+    fetcher.failing = {'info', 'financials', 'balance_sheet', 'quote'}
+    payloads = fetcher.fetch('SYN.JK')
+    assert payloads['info'] == fetcher.payloads['info']
+    # Gagal tidak memperbarui waktu pengambilan: berikutnya dicoba lagi
+    fetcher.calls.clear()
+    fetcher.fetch('SYN.JK')
+    assert len(fetcher.calls) == 4
+
+
+def test_missing_required_field_is_error(tmp_path, clock):
+    fetcher = Fetcher(tmp_path)
+    fetcher.failing = {'financials'}
+    with pytest.raises(ConnectionError):
+        fetcher.fetch('SYN.JK')
+
+
+def test_missing_optional_field(tmp_path, clock):
+    # quote opsional: nilainya sudah tercakup di info
+    fetcher = Fetcher(tmp_path)
+    fetcher.failing = {'quote'}
+    assert set(fetcher.fetch('SYN.JK')) == {'info', 'financials', 'balance_sheet'}
+
+
+def test_offline(tmp_path, clock):
+    with pytest.raises(ValueError):
+        Fetcher(tmp_path, offline=True).fetch('SYN.JK')
+    Fetcher(tmp_path).fetch('SYN.JK')
+    clock.now += 30 * DAY
+    offline = Fetcher(tmp_path, offline=True)
+    assert offline.fetch('SYN.JK')['info']['symbol'] == 'SYN.JK'
+    assert offline.calls == []
+
+
+def test_get_fundamental_data_many(tmp_path, clock):
+    fetcher = Fetcher(tmp_path)
+    fetcher.failing = {'balance_sheet'}
+    results = get_fundamental_data_many(['SYN.JK'], fetcher=fetcher)
+    assert results['SYN.JK']['error'].startswith('ConnectionError')
+    fetcher.failing = set()
+    results = get_fundamental_data_many(['SYN.JK', 'SYN.JK'], fetcher=fetcher)
+    assert list(results) == ['SYN.JK']
+    assert results['SYN.JK']['Current Price'] == 28000.0
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench.synthetic import synthetic_ohlcv
+from core.data import DataSource
+from core.fx import FxRates
+
+
+class RateSource(DataSource):
+    """Kurs tetap per ticker pasangan (mis. 'USDIDR=X'); mencatat setiap fetch"""
+
+    def __init__(self, rates):
+        self.rates = rates
+        self.calls = []
+
+    def fetch(self, ticker, period='ytd', interval='1d', start=None):
+        self.calls.append(ticker)
+        if ticker not in self.rates:
+            raise KeyError(ticker)
+        return pd.DataFrame({'Close': self.rates[ticker]})
+
+
+def _series(values, start='2024-01-01'):
+    return pd.Series(values, index=pd.date_range(start, periods=len(values), freq='D', tz='Asia/Jakarta'))
+
+
+@pytest.fixture
+def source():
+    return RateSource({
+        'USDIDR=X': _series([15000.0, 15500.0, 16000.0, 16200.0]),
+        # USDSGD mulai sehari kemudian: kurs silang memakai USDIDR terakhir pada tanggal itu
+        'USDSGD=X': _series([1.30, 1.35, 1.40], start='2024-01-02'),
+    })
+
+
+def test_direct_rates_by_date(source):
+    fx = FxRates(source)
+    dates = pd.to_datetime(['2023-12-31', '2024-01-01', '2024-01-03', '2024-01-10'])
+    np.testing.assert_array_equal(fx.rates('USD', 'IDR', dates), [np.nan, 15000.0, 16000.0, 16200.0])
+    assert fx.rates('USD', 'IDR') == 16200.0
+
+
+def test_inverse_pair(source):
+    fx = FxRates(source)
+    assert fx.rates('IDR', 'USD') == pytest.approx(1 / 16200.0)
+    # Pasangan berbasis USD dicoba lebih dulu; USDIDR yang sudah di memori dipakai untuk arah mana pun
+    assert source.calls == ['USDIDR=X']
+    assert fx.rates('usd', 'idr') == 16200.0
+    assert source.calls == ['USDIDR=X']
+
+
+def test_cross_rate_via_usd(source):
+    fx = FxRates(source)
+    rates = fx.rates('IDR', 'SGD', pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-04']))
+    np.testing.assert_allclose(rates, [np.nan, 1.30 / 15500.0, 1.40 / 16200.0])
+
+
+def test_same_currency_and_unknown_pair(source):
+    fx = FxRates(source)
+    assert fx.rates('IDR', 'IDR') == 1.0
+    np.testing.assert_array_equal(fx.convert(np.array([1.0, 2.0]), 'IDR', 'IDR'), [1.0, 2.0])
+    with pytest.raises(KeyError):
+        fx.rates('USD', 'JPY')
+
+
+def test_memory_cache_expires(source):
+    fx = FxRates(source, max_age=0)
+    fx.rates('USD', 'IDR')
+    fx.rates('USD', 'IDR')
+    assert source.calls == ['USDIDR=X', 'USDIDR=X']
+
+
+def test_last_bar_of_day_wins():
+    index = pd.to_datetime(['2024-01-01 09:00', '2024-01-01 15:00', '2024-01-02 09:00'])
+    fx = FxRates(RateSource({'USDIDR=X': pd.Series([15000.0, 15100.0, 15200.0], index=index)}))
+    np.testing.assert_array_equal(fx.rates('USD', 'IDR', pd.to_datetime(['2024-01-01 10:00'])), [15100.0])
+
+
+def test_convert_frame_and_series(source):
+    fx = FxRates(source)
+    df = synthetic_ohlcv(3, start='2024-01-02', freq='D')
+    out = fx.convert_frame(df, 'IDR', 'USD')
+    rate = np.array([1 / 15500.0, 1 / 16000.0, 1 / 16200.0])
+    for column in ('Open', 'High', 'Low', 'Close'):
+        np.testing.assert_allclose(out[column], df[column] * rate)
+    pd.testing.assert_series_equal(out['Volume'], df['Volume'])
+    np.testing.assert_allclose(fx.convert(df['Close'], 'IDR', 'USD'), df['Close'] * rate)
+    assert fx.convert(32400.0, 'IDR', 'USD') == pytest.approx(2.0)
+
+
+def test_convert_fundamental(source):
+    fx = FxRates(source)
+    summary = {'Market Cap': 1.62e13, 'Current Price': None, 'Trailing P/E': 8.0, 'Company': "Synthetic Tbk"}
+    out = fx.convert_fundamental(summary, 'IDR', 'USD')
+    assert out == {'Market Cap': pytest.approx(1e9), 'Current Price': None, 'Trailing P/E': 8.0,
+                   'Company': "Synthetic Tbk"}
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ta.momentum import RSIIndicator, StochasticOscillator
+from ta.trend import MACD, IchimokuIndicator, SMAIndicator
+from ta.volatility import AverageTrueRange, BollingerBands
+from ta.volume import OnBalanceVolumeIndicator, VolumeWeightedAveragePrice
+
+from bench.synthetic import synthetic_ohlcv
+from core.kernel import COLUMNS, IndicatorKernel
+
+
+def _reference(df):
+    """Kolom indikator seperti yang dihitung StockAnalyzer dengan `ta` sebelum kernel NumPy"""
+    high, low, close, volume = df['High'], df['Low'], df['Close'], df['Volume']
+    rsi = RSIIndicator(close, window=14).rsi()
+    macd = MACD(close, window_slow=26, window_fast=12, window_sign=9)
+    stoch = StochasticOscillator(high=high, low=low, close=close, window=14, smooth_window=3)
+    bb = BollingerBands(close=close, window=20, window_dev=2)
+    obv = OnBalanceVolumeIndicator(close=close, volume=volume).on_balance_volume()
+    ichimoku = IchimokuIndicator(high=high, low=low, window1=9, window2=26, window3=52)
+    return {
+        'MA20': SMAIndicator(close, window=20).sma_indicator(),
+        'MA50': SMAIndicator(close, window=50).sma_indicator(),
+        'MA200': close.rolling(window=200, min_periods=1).mean(),
+        'RSI': rsi,
+        'RSI_MA': SMAIndicator(rsi, window=9).sma_indicator(),
+        'MACD': macd.macd(),
+        'MACD_signal': macd.macd_signal(),
+        'MACD_hist': macd.macd_diff(),
+        'Stoch_%K': stoch.stoch(),
+        'Stoch_%D': stoch.stoch_signal(),
+        'BB_upper': bb.bollinger_hband(),
+        'BB_middle': bb.bollinger_mavg(),
+        'BB_lower': bb.bollinger_lband(),
+        'ATR': AverageTrueRange(high=high, low=low, close=close, window=14).average_true_range(),
+        'VWAP': VolumeWeightedAveragePrice(high=high, low=low, close=close, volume=volume,
+                                           window=20).volume_weighted_average_price(),
+        'OBV': obv,
+        'OBV_MA': SMAIndicator(obv, window=20).sma_indicator(),
+        'Tenkan_sen': ichimoku.ichimoku_conversion_line(),
+        'Kijun_sen': ichimoku.ichimoku_base_line(),
+        'Senkou_span_a': ichimoku.ichimoku_a(),
+        'Senkou_span_b': ichimoku.ichimoku_b(),
+    }
+
+
+@pytest.fixture(scope='module')
+def frames():
+    return [synthetic_ohlcv(bars, seed=seed) for seed, bars in ((0, 600), (1, 1500), (2, 60))]
+
+
+def test_reference_covers_columns(frames):
+    assert set(_reference(frames[0])) == set(COLUMNS)
+
+
+@pytest.mark.parametrize('name', list(COLUMNS))
+def test_kernel_matches_ta(frames, name):
+    for df in frames:
+        expected = _reference(df)[name].to_numpy(dtype=np.float64)
+        actual = IndicatorKernel(df).column(name)
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9 * np.nanmax(np.abs(expected)),
+                                   err_msg=name)
+
+
+@pytest.mark.parametrize('name', list(COLUMNS))
+def test_kernel_2d_matches_1d(frames, name):
+    # Ticker lebih pendek diisi NaN di awal; kolom 2-D harus sama dengan deret 1-D-nya
+    short, long = frames[0], frames[1]
+    arrays = {}
+    for column in ('Open', 'High', 'Low', 'Close', 'Volume'):
+        padded = pd.Series(short[column].to_numpy(), index=long.index[-len(short):]).reindex(long.index)
+        arrays[column] = np.column_stack([long[column].to_numpy(), padded.to_numpy()])
+    panel = IndicatorKernel.from_arrays(arrays).column(name)
+    np.testing.assert_allclose(panel[:, 0], IndicatorKernel(long).column(name), rtol=1e-9, atol=1e-6)
+    tail = panel[-len(short):, 1]
+    expected = IndicatorKernel(short).column(name)
+    if name in ('OBV', 'OBV_MA'):
+        # Kumulatif: bar pertama ticker pendek tidak punya close sebelumnya di panel
+        tail, expected = tail - tail[~np.isnan(tail)][0], expected - expected[~np.isnan(expected)][0]
+    np.testing.assert_allclose(tail, expected, rtol=1e-9, atol=1e-6)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from bench.synthetic import synthetic_ohlcv
+from core.levels import find_levels
+from core.signals import consolidation_zones
+
+
+def _reference_zones(high, low, close, window, threshold):
+    """Pemindaian per jendela dengan loop Python; jendela berurutan digabung"""
+    zones = []
+    for end in range(window - 1, len(close)):
+        lo, hi = low[end - window + 1:end + 1].min(), high[end - window + 1:end + 1].max()
+        if hi - lo < threshold * close[end]:
+            if zones and zones[-1]['end'] == end - 1:
+                zone = zones[-1]
+                zone.update(end=end, low=min(zone['low'], lo), high=max(zone['high'], hi))
+            else:
+                zones.append({'start': end - window + 1, 'end': end, 'low': lo, 'high': hi})
+    for zone in zones:
+        zone['mean'] = close[zone['start']:zone['end'] + 1].mean()
+    return zones
+
+
+def _with_base(bars=600, at=300, length=30, seed=0):
+    """OHLCV sintetis dengan satu zona sempit sepanjang `length` bar mulai bar `at`"""
+    df = synthetic_ohlcv(bars, seed=seed)
+    level = df['Close'].iloc[at]
+    rng = np.random.default_rng(seed)
+    close = level * (1 + rng.uniform(-0.002, 0.002, length))
+    df.iloc[at:at + length, df.columns.get_indexer(['Open', 'High', 'Low', 'Close'])] = np.column_stack(
+        [close, close * 1.002, close * 0.998, close])
+    return df, level
+
+
+@pytest.mark.parametrize('volatility', [0.005, 0.01])
+@pytest.mark.parametrize('window', [3, 5])
+def test_consolidation_zones_match_loop(volatility, window):
+    df = synthetic_ohlcv(800, seed=1, volatility=volatility)
+    high, low, close = (df[c].to_numpy() for c in ('High', 'Low', 'Close'))
+    zones = consolidation_zones(high, low, close, window, 0.015)
+    expected = _reference_zones(high, low, close, window, 0.015)
+    assert len(expected) > 1
+    for key in ('start', 'end', 'low', 'high', 'mean'):
+        np.testing.assert_allclose(zones[key], [zone[key] for zone in expected], rtol=1e-12, err_msg=key)
+
+
+def test_consolidation_zones_empty():
+    df = synthetic_ohlcv(200, seed=2, volatility=0.05)
+    zones = consolidation_zones(df['High'], df['Low'], df['Close'], 5, 0.001)
+    assert all(len(values) == 0 for values in zones.values())
+
+
+def test_find_levels_includes_consolidation_base():
+    df, level = _with_base()
+    table = find_levels(df)
+    assert (table['touches'] == table['highs'] + table['lows'] + table['bases']).all()
+    base = table[table['bases'] > 0]
+    assert len(base) == 1
+    assert base['low'].iloc[0] <= level * 1.01 and base['high'].iloc[0] >= level * 0.99
+
+
+def test_find_levels_without_consolidation():
+    df, _ = _with_base()
+    table = find_levels(df, consolidation=None)
+    assert (table['bases'] == 0).all()
+    assert (table['touches'] == table['highs'] + table['lows']).all()
@@ -0,0 +1,82 @@
+import pytest
+
+from bench.synthetic import MemorySource, synthetic_universe
+from core import metrics
+from core.batch import analyze_many, run_chunks
+
+
+@pytest.fixture
+def prom(tmp_path):
+    sink = metrics.PrometheusSink(str(tmp_path / 'analin.prom'))
+    metrics.enable(sink)
+    yield sink
+    metrics.disable()
+
+
+def _read(sink):
+    sink.flush()
+    with open(sink.path) as f:
+        return f.read().splitlines()
+
+
+def _value(lines, series):
+    return float(next(line.rsplit(' ', 1)[1] for line in lines if line.startswith(series + ' ')))
+
+
+def _work(chunk):
+    with metrics.span('work', kind='test'):
+        metrics.count('items', len(chunk))
+    return sum(chunk)
+
+
+def test_spans_exported_as_summary(prom):
+    for _ in range(3):
+        with metrics.span('fetch', ticker='BBCA.JK', source='yahoo'):
+            pass
+    metrics.count('cache', result='hit')
+    lines = _read(prom)
+    assert '# TYPE analin_cache_total counter' in lines
+    assert '# TYPE analin_fetch_seconds summary' in lines
+    assert '# TYPE analin_fetch_cpu_seconds summary' in lines
+    # Label ticker dibuang; count = jumlah span
+    assert _value(lines, 'analin_fetch_seconds_count{source="yahoo"}') == 3
+    assert _value(lines, 'analin_fetch_cpu_seconds_count{source="yahoo"}') == 3
+    assert _value(lines, 'analin_cache_total{result="hit"}') == 1
+    assert not any('counter' in line for line in lines if 'seconds' in line)
+
+
+def test_summary_series_are_grouped(prom):
+    for kind in ('a', 'b'):
+        with metrics.span('node', kind=kind):
+            pass
+    names = [line.split('{')[0] for line in _read(prom) if not line.startswith('#')]
+    # Seri satu metrik tidak boleh diselingi metrik lain
+    families = [name.rsplit('_', 1)[0] for name in names]
+    runs = [family for i, family in enumerate(families) if i == 0 or families[i - 1] != family]
+    assert len(runs) == len(set(runs)) == 2
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_worker_aggregates_reach_parent(prom, max_workers):
+    # Agregat proses utama sebelum fork tidak boleh dihitung ulang oleh worker
+    metrics.count('items', 100)
+    assert run_chunks(_work, [[1, 2], [3], [4, 5, 6]], max_workers=max_workers) == [3, 3, 15]
+    lines = _read(prom)
+    assert _value(lines, 'analin_items_total') == 106
+    assert _value(lines, 'analin_work_seconds_count{kind="test"}') == 3
+
+
+def test_analyze_many_spans_from_workers(prom):
+    frames = synthetic_universe(4, 300)
+    analyze_many(list(frames), source=MemorySource(frames), max_workers=2, chunksize=1)
+    lines = _read(prom)
+    assert _value(lines, 'analin_analyze_chunk_seconds_count{size="1"}') == 4
+
+
+def test_collector_sink_does_not_write(tmp_path):
+    sink = metrics.PrometheusSink(None)
+    sink.emit({'type': 'counter', 'name': 'x', 'labels': {}, 'value': 2})
+    sink.flush()
+    assert sink.drain() == ({('x', ()): 2}, {})
+    assert sink.drain() == ({}, {})
+    sink.close()
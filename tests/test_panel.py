@@ -0,0 +1,108 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench.synthetic import MemorySource, synthetic_universe
+from core.batch import analyze_many, analyze_panel
+from core.panel import FIELDS, PanelSource, PanelStore, closes
+
+
+@pytest.fixture
+def frames():
+    # Ticker dengan panjang berbeda: SYN0002 mulai belakangan, sehingga panel punya bar kosong
+    frames = synthetic_universe(3, 400)
+    frames['SYN0002'] = frames['SYN0002'].iloc[150:]
+    return frames
+
+
+def _assert_frame(actual, expected):
+    # Panel menyimpan timestamp dalam ns; resolusi indeks asal bisa berbeda (mis. us)
+    pd.testing.assert_frame_equal(actual, expected[list(FIELDS)], check_freq=False, check_index_type=False)
+
+
+def test_create_reopen_round_trip(tmp_path, frames):
+    PanelStore.create(str(tmp_path), frames)
+    store = PanelStore(str(tmp_path))
+    assert store.tickers == list(frames) and len(store) == 400 and store.interval == '1d'
+    assert str(store.calendar.tz) == 'Asia/Jakarta'
+    for ticker, df in frames.items():
+        _assert_frame(store.frame(ticker), df)
+    assert store.mask.sum() == sum(len(df) for df in frames.values())
+    with pytest.raises(PermissionError):
+        store.append(frames)
+
+
+def test_frame_is_view(tmp_path, frames):
+    store = PanelStore.create(str(tmp_path), frames)
+    close = store.frame('SYN0000')['Close'].to_numpy()
+    assert np.shares_memory(close, store.field('Close'))
+
+
+def test_float32_dtype(tmp_path, frames):
+    PanelStore.create(str(tmp_path), frames, dtype='float32')
+    store = PanelStore(str(tmp_path))
+    assert store.field('Close').dtype == np.float32
+    with open(tmp_path / 'meta.json') as f:
+        assert json.load(f)['dtype'] == 'float32'
+    df = store.frame('SYN0001')
+    expected = frames['SYN0001'][list(FIELDS)].astype(np.float32)
+    _assert_frame(df, expected)
+
+
+def test_append_sessions_tickers_and_resize(tmp_path, frames):
+    head = {ticker: df.iloc[:-50] for ticker, df in frames.items()}
+    store = PanelStore.create(str(tmp_path), head)
+    capacity = store.capacity
+    # Bar terakhir lama ditimpa (bar belum lengkap), sesi baru dan ticker baru ditambahkan
+    tail = {ticker: df.iloc[-51:] for ticker, df in frames.items()}
+    extra = synthetic_universe(4, 400)['SYN0003']
+    store.append({**tail, 'SYN0003': extra})
+    assert store.capacity > capacity
+
+    reader = PanelStore(str(tmp_path))
+    assert reader.tickers == [*frames, 'SYN0003'] and len(reader) == 400
+    for ticker, df in {**frames, 'SYN0003': extra}.items():
+        _assert_frame(reader.frame(ticker), df)
+
+
+def test_append_overwrites_last_bar(tmp_path, frames):
+    store = PanelStore.create(str(tmp_path), frames)
+    last = frames['SYN0000'].iloc[-1:].copy()
+    last['Close'] = 1.0
+    store.append({'SYN0000': last})
+    assert len(store) == 400
+    assert store.frame('SYN0000')['Close'].iloc[-1] == 1.0
+
+
+def test_append_rejects_older_bars(tmp_path, frames):
+    store = PanelStore.create(str(tmp_path), {t: df.iloc[200:] for t, df in frames.items()})
+    with pytest.raises(ValueError):
+        store.append({'SYN0000': frames['SYN0000'].iloc[:10]})
+
+
+def test_closes_masks_missing_bars(tmp_path, frames):
+    store = PanelStore.create(str(tmp_path), frames)
+    close = closes(store)
+    assert close['SYN0002'].isna().sum() == 150
+    pd.testing.assert_frame_equal(close, closes(frames), check_freq=False, check_names=False,
+                                  check_index_type=False)
+
+
+def test_panel_source(tmp_path, frames):
+    source = PanelSource(PanelStore.create(str(tmp_path), frames))
+    df = source.fetch('SYN0000', period='3mo')
+    start = frames['SYN0000'].index[-1] - pd.DateOffset(months=3)
+    _assert_frame(df, frames['SYN0000'][frames['SYN0000'].index >= start])
+    with pytest.raises(ValueError):
+        source.fetch('SYN0000', interval='1wk')
+
+
+def test_analyze_panel_matches_analyze_many(tmp_path, frames):
+    PanelStore.create(str(tmp_path), frames)
+    panel = analyze_panel(str(tmp_path), max_workers=1)
+    batch = analyze_many(list(frames), period='max', source=MemorySource(frames), max_workers=1)
+    assert panel.keys() == batch.keys()
+    for ticker in frames:
+        assert json.dumps(panel[ticker], default=str) == json.dumps(batch[ticker], default=str)
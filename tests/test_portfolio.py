@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from bench.synthetic import synthetic_universe
+from core.panel import PanelStore
+from core.portfolio import RollingCovariance, mean_correlation, returns, rolling_beta, rolling_matrices
+
+
+@pytest.fixture(scope='module')
+def frames():
+    # Ticker yang listing belakangan dan yang disuspensi di tengah riwayat
+    frames = synthetic_universe(6, 400)
+    frames['SYN0001'] = frames['SYN0001'].iloc[50:]
+    frames['SYN0002'] = frames['SYN0002'].drop(frames['SYN0002'].index[100:130])
+    return frames
+
+
+@pytest.fixture(scope='module')
+def daily(frames):
+    return returns(frames)
+
+
+def test_returns(frames, daily):
+    close = frames['SYN0000']['Close']
+    np.testing.assert_allclose(daily['SYN0000'].iloc[1:], close.pct_change().iloc[1:].to_numpy())
+    assert daily['SYN0001'].iloc[:51].isna().all()
+    # Return setelah suspensi NaN: close sehari sebelumnya tidak ada
+    assert np.isnan(daily['SYN0002'].iloc[130])
+
+
+def test_returns_from_panel(tmp_path, frames, daily):
+    panel = returns(PanelStore.create(str(tmp_path), frames))
+    np.testing.assert_allclose(panel.to_numpy(), daily.to_numpy(), equal_nan=True)
+
+
+@pytest.mark.parametrize('kind', ['corr', 'cov'])
+def test_rolling_matrices_match_pandas(daily, kind):
+    expected = getattr(daily.rolling(60, min_periods=30), kind)()
+    dates = []
+    for date, matrix in rolling_matrices(daily, window=60, step=7, kind=kind, min_periods=30):
+        np.testing.assert_allclose(matrix.to_numpy(), expected.loc[date].to_numpy(), atol=1e-12, equal_nan=True,
+                                   err_msg=str(date))
+        dates.append(date)
+    assert dates[-1] == daily.index[-1]
+    assert (np.diff(daily.index.get_indexer(dates)) == 7).all()
+
+
+def test_incremental_updates_match_pandas(daily):
+    # Update per baris melewati beberapa hitung ulang penuh (tiap `window` baris)
+    engine = RollingCovariance(daily.columns, 40)
+    expected = daily.rolling(40).corr()
+    for i, row in enumerate(daily.to_numpy()):
+        engine.update(row)
+        if i % 37 == 0 or i == len(daily) - 1:
+            np.testing.assert_allclose(engine.correlation(), expected.loc[daily.index[i]].to_numpy(), atol=1e-10,
+                                       equal_nan=True, err_msg=str(i))
+    with pytest.raises(ValueError):
+        engine.update(np.zeros(3))
+
+
+def test_rolling_matrices_rejects_kind(daily):
+    with pytest.raises(ValueError):
+        next(rolling_matrices(daily, kind='beta'))
+
+
+def test_rolling_beta_matches_pandas(daily):
+    market = daily.mean(axis=1)
+    beta, corr = rolling_beta(daily, window=60, min_periods=30)
+    for ticker in daily.columns:
+        both = daily[ticker].notna() & market.notna()
+        x, m = daily[ticker].where(both), market.where(both)
+        expected_beta = x.rolling(60, min_periods=30).cov(m) / m.rolling(60, min_periods=30).var()
+        np.testing.assert_allclose(beta[ticker], expected_beta, rtol=1e-9, atol=1e-12, equal_nan=True,
+                                   err_msg=ticker)
+        np.testing.assert_allclose(corr[ticker], x.rolling(60, min_periods=30).corr(m), rtol=1e-9, atol=1e-12,
+                                   equal_nan=True, err_msg=ticker)
+
+
+def test_rolling_beta_against_index(daily):
+    # Ticker terhadap dirinya sendiri: beta dan korelasi 1
+    beta, corr = rolling_beta(daily, market=daily['SYN0003'], window=60)
+    np.testing.assert_allclose(beta['SYN0003'].iloc[60:], 1.0)
+    np.testing.assert_allclose(corr['SYN0003'].iloc[60:], 1.0)
+    assert beta['SYN0003'].iloc[:59].isna().all()
+
+
+def test_mean_correlation():
+    matrix = np.array([[1.0, 0.2, np.nan], [0.2, 1.0, 0.6], [np.nan, 0.6, 1.0]])
+    assert mean_correlation(matrix) == pytest.approx(0.4)
+    assert np.isnan(mean_correlation(np.eye(2)[:1, :1]))
@@ -0,0 +1,49 @@
+import os
+
+import numpy as np
+import pytest
+
+from bench.synthetic import synthetic_universe
+from core.kernel import IndicatorKernel
+from core.screener import COLUMNS, Screener
+
+PAYLOAD = "rsi.__class__.__init__.__globals__['sys'].modules['os'].system('touch {path}') == 0"
+
+
+@pytest.fixture(scope='module')
+def frames():
+    return synthetic_universe(8, 400)
+
+
+def test_table_matches_kernel(frames):
+    table = Screener.from_frames(frames).table()
+    for ticker, df in frames.items():
+        kernel = IndicatorKernel(df)
+        assert table.loc[ticker, 'price'] == df['Close'].iloc[-1]
+        assert np.isclose(table.loc[ticker, 'rsi'], kernel.column('RSI')[-1])
+        assert np.isclose(table.loc[ticker, 'atr'], kernel.column('ATR')[-1])
+
+
+def test_screen_filters_sorts_and_limits(frames):
+    screener = Screener.from_frames(frames)
+    table = screener.table()
+    out = screener.screen("rsi < 60 and trend in ['Uptrend', 'Strong Uptrend']", sort='atr_pct', limit=3)
+    expected = table[(table['rsi'] < 60) & table['trend'].isin(['Uptrend', 'Strong Uptrend'])]
+    assert list(out.index) == list(expected.sort_values('atr_pct', ascending=False).index[:3])
+
+
+def test_screen_rejects_code_before_running_it(frames, tmp_path):
+    path = tmp_path / 'pwned'
+    with pytest.raises(ValueError):
+        Screener.from_frames(frames).screen(PAYLOAD.format(path=path))
+    assert not os.path.exists(path)
+
+
+@pytest.mark.parametrize('where', ["abs(rsi) < 60", "rsi[0] < 60", "open_interest > 0", "rsi <"])
+def test_screen_rejects_invalid_expressions(frames, where):
+    with pytest.raises(ValueError):
+        Screener.from_frames(frames).screen(where)
+
+
+def test_columns_constant_matches_table(frames):
+    assert tuple(Screener.from_frames(frames).table().columns) == COLUMNS
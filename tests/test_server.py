@@ -0,0 +1,54 @@
+import asyncio
+import json
+from urllib.parse import quote
+
+import pytest
+
+from bench.synthetic import SyntheticSource
+from core.data import DataSource
+from service.server import AnalysisService, _respond
+
+PAYLOAD = "rsi.__class__.__init__.__globals__['sys'].modules['os'].system('touch {path}') == 0"
+
+
+class FailingSource(DataSource):
+    def fetch(self, ticker, period='ytd', interval='1d', start=None):
+        raise ConnectionError("upstream down")
+
+
+def request(source, target):
+    async def run():
+        service = AnalysisService(source, max_workers=0)
+        try:
+            status, body = await _respond(service, 'GET', target)
+        finally:
+            service.close()
+        return status, json.loads(body)
+    return asyncio.run(run())
+
+
+def test_screen_rejects_code_before_fetching(tmp_path):
+    path = tmp_path / 'pwned'
+    status, body = request(SyntheticSource(300), '/screen?tickers=AAA&where=' + quote(PAYLOAD.format(path=path)))
+    assert status == 400 and 'Unsupported' in body['error']
+    assert not path.exists()
+
+
+@pytest.mark.parametrize('target', [
+    '/screen?tickers=AAA&where=' + quote('rsi <'),
+    '/screen?tickers=AAA&sort=nope',
+    '/screen?tickers=AAA&limit=x',
+    '/bars/AAA?limit=-1',
+])
+def test_bad_query_is_400(target):
+    assert request(SyntheticSource(300), target)[0] == 400
+
+
+def test_screen_data_errors_are_not_query_errors():
+    status, body = request(FailingSource(), '/screen?tickers=AAA,BBB&where=' + quote('rsi < 60'))
+    assert status == 404 and 'Unable to retrieve' in body['error']
+
+
+def test_screen_returns_rows():
+    status, body = request(SyntheticSource(300), '/screen?tickers=AAA,BBB&sort=rsi&limit=1')
+    assert status == 200 and len(body) == 1 and body[0]['ticker'] in ('AAA', 'BBB')
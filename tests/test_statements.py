@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench.synthetic import synthetic_statement_payloads
+from core.statements import StatementStore, as_of, cross_section, ratios, statement_table, valuation
+
+
+def _table(rows):
+    """Tabel laporan kuartalan dari baris (ticker, period_end, net_income, equity, revenue)"""
+    table = pd.DataFrame(rows, columns=['ticker', 'period_end', 'net_income', 'equity', 'revenue'])
+    table['period_end'] = pd.to_datetime(table['period_end'])
+    table.insert(1, 'frequency', 'Q')
+    for column in ('gross_profit', 'operating_income', 'total_assets', 'total_debt', 'current_assets',
+                   'current_liabilities', 'shares', 'operating_cash_flow', 'free_cash_flow'):
+        table[column] = np.nan
+    return table
+
+
+@pytest.fixture
+def quarters():
+    ends = ['2023-03-31', '2023-06-30', '2023-09-30', '2023-12-31', '2024-03-31', '2024-06-30']
+    rows = [('AAA', end, 10.0 * (i + 1), 100.0 + i, 50.0 + i) for i, end in enumerate(ends)]
+    # BBB melewatkan kuartal 2023-06-30: TTM yang mencakup celah tidak dihitung
+    rows += [('BBB', end, 5.0, 80.0, 20.0) for end in ends if end != '2023-06-30']
+    return _table(rows)
+
+
+def test_statement_table_from_payloads():
+    payloads = synthetic_statement_payloads(quarters=8, years=4)
+    table = statement_table({'SYN.JK': payloads})
+    assert len(table) == 12 and set(table['frequency']) == {'A', 'Q'}
+    row = table[(table['frequency'] == 'Q')].iloc[-1]
+    assert row['period_end'] == pd.Timestamp('2024-12-31')
+    assert row['net_income'] == payloads['quarterly_financials'].loc['Net Income'].iloc[0]
+    assert row['shares'] == 1.2e9
+
+
+def test_quarterly_ratios_use_ttm(quarters):
+    out = ratios(quarters).set_index(['ticker', 'period_end'])
+    aaa = out.loc['AAA']
+    # Kuartal keempat: TTM = 10 + 20 + 30 + 40, ekuitas kuartal itu
+    assert aaa['roe'].iloc[:3].isna().all()
+    assert aaa['roe'].iloc[3] == pytest.approx(100.0 / 103.0)
+    assert aaa['roe'].iloc[5] == pytest.approx((30 + 40 + 50 + 60) / 105.0)
+    # Pertumbuhan year-on-year dari kuartal yang sama tahun sebelumnya
+    assert aaa['revenue_growth'].iloc[4] == pytest.approx(54.0 / 50.0 - 1)
+    assert aaa['earnings_growth'].iloc[5] == pytest.approx((60.0 - 20.0) / 20.0)
+    bbb = out.loc['BBB']
+    assert bbb['roe'].iloc[:4].isna().all()
+    assert bbb['roe'].iloc[4] == pytest.approx(20.0 / 80.0)
+    assert (aaa['available'] - aaa.index == pd.Timedelta(days=60)).all()
+
+
+def test_annual_ratios():
+    table = statement_table({'SYN.JK': synthetic_statement_payloads()})
+    annual = table[table['frequency'] == 'A'].reset_index(drop=True)
+    out = ratios(table, frequency='A', lag=0)
+    np.testing.assert_allclose(out['roe'], annual['net_income'] / annual['equity'])
+    np.testing.assert_allclose(out['revenue_growth'].iloc[1:], annual['revenue'].pct_change().iloc[1:])
+    assert (out['available'] == out['period_end']).all()
+
+
+def _as_of_loop(table, column, calendar, tickers):
+    """Referensi: per tanggal dan ticker, baris available <= tanggal dengan (available, period_end) terbesar"""
+    out = pd.DataFrame(np.nan, index=calendar, columns=tickers)
+    for date in calendar:
+        for ticker in tickers:
+            rows = table[(table['ticker'] == ticker) & (table['available'] <= date)]
+            if len(rows):
+                out.loc[date, ticker] = rows.sort_values(['available', 'period_end'])[column].iloc[-1]
+    return out
+
+
+def test_as_of_picks_latest_available_period(quarters):
+    table = ratios(quarters)
+    calendar = pd.date_range('2023-01-01', '2025-01-01', freq='7D')
+    expected = _as_of_loop(table, 'roe', calendar, ['AAA', 'BBB', 'CCC'])
+    actual = as_of(table, ('roe',), calendar, ['AAA', 'BBB', 'CCC'])['roe']
+    pd.testing.assert_frame_equal(actual, expected, check_freq=False)
+    assert actual['CCC'].isna().all()
+
+
+def test_as_of_respects_publication_lag(quarters):
+    # Laporan 2023-12-31 baru tersedia 2024-02-29 (lag 60 hari); sebelumnya masih kuartal 2023-09-30
+    table = quarters.assign(available=quarters['period_end'] + pd.Timedelta(days=60))
+    dates = pd.to_datetime(['2023-05-29', '2023-05-30', '2024-02-28', '2024-02-29'])
+    values = as_of(table, ('net_income',), dates)['net_income']
+    np.testing.assert_array_equal(values['AAA'], [np.nan, 10.0, 30.0, 40.0])
+    np.testing.assert_array_equal(values['BBB'], [np.nan, 5.0, 5.0, 5.0])
+
+
+def test_as_of_same_available_prefers_later_period():
+    table = _table([('AAA', '2024-03-31', 1.0, 1.0, 1.0), ('AAA', '2023-12-31', 2.0, 1.0, 1.0)])
+    table['available'] = pd.Timestamp('2024-05-01')
+    values = as_of(table, ('net_income',), pd.to_datetime(['2024-04-30', '2024-05-01']))['net_income']
+    assert np.isnan(values['AAA'].iloc[0]) and values['AAA'].iloc[1] == 1.0
+
+
+def test_valuation_and_cross_section(quarters):
+    table = ratios(quarters)
+    table['eps'] = np.where(table['ticker'] == 'AAA', 2.0, -1.0)
+    table['bvps'] = 10.0
+    calendar = pd.date_range('2024-06-01', periods=3, freq='D')
+    close = pd.DataFrame({'AAA': [20.0, 22.0, 24.0], 'BBB': [5.0, 5.0, 5.0]}, index=calendar)
+    out = valuation(table, close)
+    np.testing.assert_allclose(out['pe']['AAA'], [10.0, 11.0, 12.0])
+    assert out['pe']['BBB'].isna().all()
+    np.testing.assert_allclose(out['pbv']['BBB'], 0.5)
+
+    latest = cross_section(table, date='2024-06-01')
+    assert latest.loc['AAA', 'period_end'] == pd.Timestamp('2024-03-31')
+
+
+def test_statement_store_merge_keeps_history(tmp_path, quarters):
+    store = StatementStore(str(tmp_path))
+    store.merge(quarters.iloc[:4])
+    restated = quarters.iloc[3:].copy()
+    restated.loc[restated.index[0], 'net_income'] = 99.0
+    merged = store.merge(restated)
+    assert len(merged) == len(quarters)
+    assert merged.set_index(['ticker', 'period_end']).loc[('AAA', pd.Timestamp('2023-12-31')), 'net_income'] == 99.0
+    assert len(StatementStore(str(tmp_path)).load()) == len(quarters)
@@ -0,0 +1,68 @@
+import math
+
+import numpy as np
+import pytest
+
+from bench.synthetic import synthetic_ohlcv
+from core.kernel import COLUMNS, IndicatorKernel
+from core.stream import StreamingAnalyzer
+from core.technical import StockAnalyzer
+
+WINDOWS = {'rsi': 9, 'ma_fast': 15, 'bb': 25, 'macd_fast': 8}
+
+
+def _assert_close(actual, expected, path='result'):
+    """Perbandingan rekursif dict/list/tuple; float sama hingga galat pembulatan"""
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys(), path
+        for key in expected:
+            _assert_close(actual[key], expected[key], f"{path}[{key!r}]")
+    elif isinstance(expected, (list, tuple)):
+        assert len(actual) == len(expected), path
+        for i, (a, e) in enumerate(zip(actual, expected)):
+            _assert_close(a, e, f"{path}[{i}]")
+    elif isinstance(expected, (float, np.floating)):
+        both_nan = actual != actual and expected != expected
+        assert both_nan or math.isclose(actual, expected, rel_tol=1e-9, abs_tol=1e-9), f"{path}: {actual} != {expected}"
+    else:
+        assert actual == expected, path
+
+
+def _batch(df, windows=None):
+    return StockAnalyzer('SYN', df=df.copy(), windows=windows).analyze_all()[0]
+
+
+@pytest.mark.parametrize('windows', [None, WINDOWS])
+@pytest.mark.parametrize('bars', [60, 400])
+def test_replay_matches_batch(bars, windows):
+    df = synthetic_ohlcv(bars, seed=bars)
+    stream = StreamingAnalyzer('SYN', windows)
+    expected = IndicatorKernel(df, stream.windows)
+    columns = {name: expected.column(name) for name in COLUMNS}
+    for i, bar in enumerate(df.to_dict('records')):
+        result = stream.update(bar)
+        # Indikator tiap bar sama dengan kolom kernel di posisi yang sama
+        for name in COLUMNS:
+            _assert_close(stream.last[name], float(columns[name][i]), f"{name}@{i}")
+    _assert_close(result, _batch(df, windows))
+
+
+@pytest.mark.parametrize('windows', [None, WINDOWS])
+def test_from_frame_matches_batch(windows):
+    df = synthetic_ohlcv(500, seed=3)
+    stream = StreamingAnalyzer.from_frame('SYN', df.iloc[:300], windows)
+    _assert_close(stream.result, _batch(df.iloc[:300], windows))
+    for end, bar in enumerate(df.iloc[300:].to_dict('records'), 301):
+        result = stream.update(bar)
+        if end % 50 == 0 or end == len(df):
+            _assert_close(result, _batch(df.iloc[:end], windows))
+
+
+def test_from_frame_matches_replay():
+    df = synthetic_ohlcv(300, seed=4)
+    replay = StreamingAnalyzer('SYN')
+    for bar in df.to_dict('records'):
+        replay.update(bar)
+    warm = StreamingAnalyzer.from_frame('SYN', df)
+    _assert_close(warm.last, replay.last, 'last')
+    assert warm.bars == replay.bars == len(df)
@@ -0,0 +1,26 @@
+import pytest
+
+from bench.synthetic import synthetic_universe
+from core.kernel import resolve_windows
+from core.sweep import grid_combinations, sweep
+
+
+def test_sweep_in_process_matches_pool():
+    frames = synthetic_universe(6, 400)
+    grid = {'ma_fast': [10, 20], 'rsi': [9, 14]}
+    local = sweep(frames, grid, max_workers=1, chunksize=2)
+    pooled = sweep(frames, grid, max_workers=2, chunksize=2)
+    assert local.equals(pooled) and local.attrs['errors'] == {}
+    assert len(local) == 4 and local['tickers'].max() <= 6
+
+
+@pytest.mark.parametrize('windows', [{'rsi': 0}, {'ma_fast': -5}, {'atr': 2.5}, {'bb_std': 0}, {'nope': 3}])
+def test_invalid_windows_are_rejected(windows):
+    with pytest.raises(ValueError):
+        resolve_windows(windows)
+
+
+def test_grid_rejects_invalid_window_values():
+    with pytest.raises(ValueError):
+        grid_combinations({'rsi': [9, 0]})
+    assert grid_combinations({'rsi': [14, 9], 'bb_std': [2.0]}) == [{'rsi': 9, 'bb_std': 2.0}, {'rsi': 14, 'bb_std': 2.0}]
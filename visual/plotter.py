@@ -1,28 +1,32 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import mplfinance as mpf
-import yfinance as yf
 
-from curl_cffi import requests
+# Overlay panel harga: (kolom, opsi make_addplot)
+OVERLAYS = [
+    ('MA20', dict(color='blue', width=1.5, label='MA20')),
+    ('MA50', dict(color='green', width=1.5, label='MA50')),
+    ('MA200', dict(color='red', width=1.5, label='MA200')),
+    ('VWAP', dict(color='cyan', width=1.5, label='VWAP')),
+    ('BB_upper', dict(color='gray', linestyle='--', width=1, alpha=0.8, label='BB Upper')),
+    ('BB_lower', dict(color='gray', linestyle='--', width=1, alpha=0.8, label='BB Lower')),
+    ('Tenkan_sen', dict(color='orange', width=1.5, label='Tenkan Sen')),
+    ('Kijun_sen', dict(color='purple', width=1.5, label='Kijun Sen')),
+    ('Senkou_span_a', dict(color='lime', linestyle=':', width=1.5, alpha=0.7, label='Senkou A')),
+    ('Senkou_span_b', dict(color='pink', linestyle=':', width=1.5, alpha=0.7, label='Senkou B')),
+]
 
-session = requests.Session(impersonate="chrome")
 
-def plot_technical_chart(df, ticker):
+def chart_style():
     mc = mpf.make_marketcolors(up='g', down='r', edge='inherit', wick='inherit', volume='in')
-    s = mpf.make_mpf_style(marketcolors=mc, gridstyle=':', y_on_right=True)  # Changed y_on_right to True
+    return mpf.make_mpf_style(marketcolors=mc, gridstyle=':', y_on_right=True)  # Changed y_on_right to True
 
-    ap = [
-        mpf.make_addplot(df['MA20'], color='blue', width=1.5, panel=0, label='MA20'),
-        mpf.make_addplot(df['MA50'], color='green', width=1.5, panel=0, label='MA50'),
-        mpf.make_addplot(df['MA200'], color='red', width=1.5, panel=0, label='MA200'),
-        mpf.make_addplot(df['VWAP'], color='cyan', width=1.5, panel=0, label='VWAP'),
-        mpf.make_addplot(df['BB_upper'], color='gray', linestyle='--', width=1, alpha=0.8, panel=0, label='BB Upper'),
-        mpf.make_addplot(df['BB_lower'], color='gray', linestyle='--', width=1, alpha=0.8, panel=0, label='BB Lower'),
-        mpf.make_addplot(df['Tenkan_sen'], color='orange', width=1.5, panel=0, label='Tenkan Sen'),
-        mpf.make_addplot(df['Kijun_sen'], color='purple', width=1.5, panel=0, label='Kijun Sen'),
-        mpf.make_addplot(df['Senkou_span_a'], color='lime', linestyle=':', width=1.5, alpha=0.7, panel=0, label='Senkou A'),
-        mpf.make_addplot(df['Senkou_span_b'], color='pink', linestyle=':', width=1.5, alpha=0.7, panel=0, label='Senkou B'),
-    ]
+
+def plot_technical_chart(df, ticker, title=None):
+    """title: nama perusahaan untuk judul chart; tanpa itu dipakai ticker"""
+    s = chart_style()
+
+    ap = [mpf.make_addplot(df[column], panel=0, **options) for column, options in OVERLAYS]
 
     fig, axlist = mpf.plot(
         df,
@@ -30,7 +34,7 @@ def plot_technical_chart(df, ticker):
         style=s,
         addplot=ap,
         volume=True,
-        title=f"\n{yf.Ticker(ticker, session=session).info['longName']} – Technical Analysis",
+        title=f"\n{title if title and title != 'N/A' else ticker} – Technical Analysis",
         ylabel="Price",
         ylabel_lower="Volume",
         figsize=(16, 10),
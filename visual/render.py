@@ -0,0 +1,177 @@
+import os
+
+import numpy as np
+import pandas as pd
+import matplotlib
+import matplotlib.pyplot as plt
+import mplfinance as mpf
+
+from matplotlib.collections import PolyCollection
+
+from core import metrics
+from visual.plotter import OVERLAYS, chart_style
+
+OHLCV = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+_canvas = {}
+
+
+def lttb_buckets(y, edges, before, after):
+    """Memilih satu indeks per bucket dengan kriteria LTTB.
+
+    edges adalah batas bucket (len = bucket + 1). Titik yang dipilih adalah
+    yang membentuk segitiga terbesar dengan titik terpilih sebelumnya dan
+    rata-rata bucket berikutnya; `before`/`after` adalah jangkar (x, y) di
+    luar rentang.
+    """
+    starts, ends = edges[:-1], edges[1:]
+    counts = ends - starts
+    cumsum = np.concatenate([[0.0], np.cumsum(y)])
+    mean_x = (starts + ends - 1) / 2
+    mean_y = (cumsum[ends] - cumsum[starts]) / counts
+
+    picks = np.empty(len(starts), dtype=np.int64)
+    ax, ay = before
+    for i in range(len(starts)):
+        cx, cy = (mean_x[i + 1], mean_y[i + 1]) if i + 1 < len(starts) else after
+        x = np.arange(starts[i], ends[i])
+        area = np.abs((ax - cx) * (y[starts[i]:ends[i]] - ay) - (ax - x) * (cy - ay))
+        picks[i] = starts[i] + int(np.argmax(area))
+        ax, ay = picks[i], y[picks[i]]
+    return picks
+
+
+def downsample(df, candles=250, max_bars=600):
+    """Memperkecil deret panjang untuk chart.
+
+    `candles` bar terakhir dipertahankan apa adanya. Riwayat sebelumnya
+    dibagi ke (max_bars - candles) bucket menjadi bar OHLC agregat; kolom
+    indikator mengambil nilai pada titik pilihan LTTB di atas Close, sehingga
+    puncak dan lembah garis tetap terlihat.
+    """
+    n = len(df)
+    if n <= max_bars:
+        return df
+    candles = min(candles, max_bars - 1)
+    head, tail = df.iloc[:n - candles], df.iloc[n - candles:]
+    edges = np.linspace(0, len(head), max_bars - candles + 1).round().astype(np.int64)
+    starts = edges[:-1]
+
+    close = head['Close'].to_numpy(dtype=np.float64)
+    picks = lttb_buckets(close, edges, (0, close[0]), (len(head), tail['Close'].iloc[0]))
+
+    bars = head.iloc[picks].copy()
+    bars['Open'] = head['Open'].to_numpy()[starts]
+    bars['High'] = np.maximum.reduceat(head['High'].to_numpy(), starts)
+    bars['Low'] = np.minimum.reduceat(head['Low'].to_numpy(), starts)
+    bars['Close'] = close[edges[1:] - 1]
+    # Rata-rata per bar agar skala volume sebanding dengan candle harian
+    bars['Volume'] = np.add.reduceat(head['Volume'].to_numpy(), starts) / np.diff(edges)
+    return pd.concat([bars, tail])
+
+
+def _figure(figsize):
+    """Figure dan axes yang dipakai ulang per proses (lepas dari pyplot)"""
+    if figsize not in _canvas:
+        fig = mpf.figure(style=chart_style(), figsize=figsize)
+        plt.close(fig)
+        ax = fig.add_axes([0.05, 0.3, 0.88, 0.62])
+        ax_vol = fig.add_axes([0.05, 0.08, 0.88, 0.2], sharex=ax)
+        _canvas[figsize] = (fig, ax, ax_vol)
+    return _canvas[figsize]
+
+
+def _volume(ax, data):
+    """Volume sebagai satu PolyCollection (jauh lebih cepat dari bar per patch)"""
+    x = np.arange(len(data), dtype=np.float64)
+    volume = data['Volume'].to_numpy(dtype=np.float64)
+    up = data['Close'].to_numpy() >= data['Open'].to_numpy()
+    verts = np.stack([
+        np.column_stack([x - 0.3, np.zeros_like(x)]),
+        np.column_stack([x - 0.3, volume]),
+        np.column_stack([x + 0.3, volume]),
+        np.column_stack([x + 0.3, np.zeros_like(x)]),
+    ], axis=1)
+    ax.add_collection(PolyCollection(verts, facecolors=np.where(up, 'g', 'r'), linewidths=0))
+    ax.set_ylim(0, np.nanmax(volume) * 1.05 if len(volume) else 1)
+    ax.set_ylabel("Volume")
+
+
+def render_chart(df, path, ticker='', title=None, candles=250, max_bars=600, figsize=(16, 10), dpi=100):
+    """Merender chart teknikal ke file (PNG/SVG menurut ekstensi path) tanpa GUI"""
+    with metrics.span('render', ticker=ticker, fmt=os.path.splitext(path)[1].lstrip('.').lower()) as span:
+        data = downsample(df, candles, max_bars)
+        span.set(bars=len(df), drawn=len(data))
+        fig, ax, ax_vol = _figure(tuple(figsize))
+        ax.clear()
+        ax_vol.clear()
+
+        ap = [mpf.make_addplot(data[column], ax=ax, **options) for column, options in OVERLAYS if column in data]
+        mpf.plot(data[OHLCV], type='candle', ax=ax, addplot=ap, datetime_format='%d %b %Y', xrotation=0,
+                 warn_too_much_data=len(data) + 1)
+
+        x = np.arange(len(data))
+        if 'Senkou_span_a' in data and 'Senkou_span_b' in data:
+            span_a, span_b = data['Senkou_span_a'].to_numpy(), data['Senkou_span_b'].to_numpy()
+            ax.fill_between(x, span_a, span_b, where=span_a >= span_b, facecolor='lightgreen', alpha=0.3, interpolate=True)
+            ax.fill_between(x, span_a, span_b, where=span_a < span_b, facecolor='lightcoral', alpha=0.3, interpolate=True)
+
+        _volume(ax_vol, data)
+        ax.tick_params(labelbottom=False)
+
+        last_close = data['Close'].iloc[-1]
+        ax.axhline(y=last_close, color='black', linestyle='--', linewidth=1)
+        ax.annotate(f'{last_close:.2f}', xy=(1, last_close), xycoords=('axes fraction', 'data'),
+                    xytext=(-4, 0), textcoords='offset points', va='center', ha='right', fontsize=8,
+                    bbox=dict(boxstyle="round,pad=0.2", edgecolor='gray', facecolor='white', alpha=0.8))
+
+        handles, labels = ax.get_legend_handles_labels()
+        if handles:
+            ax.legend(handles=handles, loc='upper left', frameon=True, framealpha=0.9,
+                      facecolor='white', edgecolor='gray', fontsize=8, ncol=3)
+        ax.set_ylabel("Price")
+        ax.set_title(f"{title if title and title != 'N/A' else ticker} – Technical Analysis")
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Kompresi PNG ringan: encode zlib level bawaan mendominasi waktu simpan
+        options = {'pil_kwargs': {'compress_level': 1}} if path.lower().endswith('.png') else {}
+        fig.savefig(path, dpi=dpi, **options)
+        return path
+
+
+def _init_worker():
+    matplotlib.use('Agg')
+
+
+def _failed(chunk, e):
+    return [(ticker, {'error': f"{type(e).__name__}: {e}"}) for ticker, _, _ in chunk]
+
+
+def _render_chunk(items, out_dir, fmt, kwargs):
+    out = []
+    for ticker, df, title in items:
+        try:
+            path = os.path.join(out_dir, f"{ticker}.{fmt}")
+            out.append((ticker, render_chart(df, path, ticker=ticker, title=title, **kwargs)))
+        except Exception as e:
+            out.append((ticker, {'error': f"{type(e).__name__}: {e}"}))
+    return out
+
+
+def render_many(frames, out_dir='charts', fmt='png', titles=None, max_workers=None, chunksize=8, **kwargs):
+    """Merender chart banyak ticker ke out_dir di process pool (backend Agg).
+
+    frames adalah mapping ticker -> DataFrame hasil analyze_all (berisi
+    kolom indikator). Mengembalikan ticker -> path, atau {'error': ...}
+    untuk ticker yang gagal. max_workers=1 merender di proses yang sama.
+    """
+    from core.batch import run_chunks
+
+    titles = titles or {}
+    items = [(ticker, df, titles.get(ticker)) for ticker, df in frames.items()]
+    chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+    results = {}
+    for chunk_result in run_chunks(_render_chunk, chunks, (out_dir, fmt, kwargs), max_workers, _failed,
+                                   initializer=_init_worker):
+        results.update(chunk_result)
+    return results